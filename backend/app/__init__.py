@@ -0,0 +1,4 @@
+import time
+
+# When the first app module started importing, for the startup timing (see app.core.startup)
+IMPORT_STARTED = time.perf_counter()
@@ -1,4 +1,9 @@
-from fastapi import Depends, HTTPException, status
+import math
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Literal
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import ValidationError
@@ -6,8 +11,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app import models, schemas
+from app.core import profiling, tracing
 from app.core.config import settings
 from app.db.session import get_db
+from app.services.rate_limit import RATE_LIMIT_DECISIONS, Limit, RateLimitBackend, get_rate_limiter
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token")
 
@@ -16,19 +23,21 @@ optional_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/log
 
 
 async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)) -> models.User:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        token_data = schemas.TokenPayload(**payload)
-    except (JWTError, ValidationError) as e:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        ) from e
-    result = await db.execute(select(models.User).where(models.User.id == int(token_data.sub)))
-    user = result.scalars().first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    with profiling.segment("auth"), tracing.span("get_current_user"):
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            token_data = schemas.TokenPayload(**payload)
+        except (JWTError, ValidationError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            ) from e
+        result = await db.execute(select(models.User).where(models.User.id == int(token_data.sub)))
+        user = result.scalars().first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        tracing.set_attribute("enduser.id", user.id)
+        return user
 
 
 def get_current_active_user(
@@ -53,3 +62,62 @@ def get_current_seller(
     if current_user.role not in ("seller", "admin"):
         raise HTTPException(status_code=403, detail="Not enough privileges. Seller role required.")
     return current_user
+
+
+def _limiter(name: str) -> Callable[[str, RateLimitBackend], Awaitable[None]]:
+    limit = Limit.parse(getattr(settings, f"RATE_LIMIT_{name.upper()}"))
+
+    async def enforce(key: str, limiter: RateLimitBackend) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        retry_after = await limiter.hit(f"{name}:{key}", limit)
+        RATE_LIMIT_DECISIONS.labels(name, "limited" if retry_after else "allowed").inc()
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please retry later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    return enforce
+
+
+def rate_limit(name: str, per: Literal["ip", "user"] = "ip") -> Callable:
+    """
+    Dependency enforcing the RATE_LIMIT_<NAME> setting, per client IP or per
+    authenticated user. Raises 429 with Retry-After when the bucket is empty.
+    """
+    enforce = _limiter(name)
+
+    if per == "user":
+
+        async def limit_user(
+            current_user: models.User = Depends(get_current_active_user),
+            limiter: RateLimitBackend = Depends(get_rate_limiter),
+        ) -> None:
+            await enforce(f"user:{current_user.id}", limiter)
+
+        return limit_user
+
+    async def limit_ip(request: Request, limiter: RateLimitBackend = Depends(get_rate_limiter)) -> None:
+        await enforce(f"ip:{request.client.host if request.client else 'unknown'}", limiter)
+
+    return limit_ip
+
+
+def deferred_rate_limit(name: str) -> Callable:
+    """
+    Like `rate_limit(name, per="user")`, for endpoints that only know from the
+    request body whether the limit applies: the dependency returns a callable
+    that takes a token from the user's bucket when awaited. It shares the
+    bucket with `rate_limit(name, per="user")`.
+    """
+    enforce = _limiter(name)
+
+    def limit_user(
+        current_user: models.User = Depends(get_current_active_user),
+        limiter: RateLimitBackend = Depends(get_rate_limiter),
+    ) -> Callable[[], Awaitable[None]]:
+        return partial(enforce, f"user:{current_user.id}", limiter)
+
+    return limit_user
@@ -7,16 +7,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app import schemas
-from app.api.deps import get_current_user, optional_oauth2
+from app.api.deps import get_current_user, optional_oauth2, rate_limit
 from app.core import security
 from app.core.config import settings
+from app.core.profiling import ProfiledRoute
 from app.db.session import get_db
 from app.models import user as user_model
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
-@router.post("/login/access-token", response_model=schemas.Token)
+@router.post("/login/access-token", response_model=schemas.Token, dependencies=[Depends(rate_limit("login"))])
 async def login_access_token(
     db: AsyncSession = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
@@ -40,7 +41,7 @@ async def login_access_token(
     }
 
 
-@router.post("/register", response_model=schemas.User)
+@router.post("/register", response_model=schemas.User, dependencies=[Depends(rate_limit("register"))])
 async def register(
     *,
     db: AsyncSession = Depends(get_db),
@@ -1,25 +1,46 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app import models, schemas
 from app.api import deps
+from app.core.profiling import ProfiledRoute
+from app.db.replicas import get_read_db
 from app.db.session import get_db
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
-@router.get("/", response_model=list[schemas.Category])
+@router.get("/", response_model=list[schemas.Category] | schemas.CategoryFacets)
 async def list_categories(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    with_counts: bool = False,
 ) -> Any:
     """
     List all categories. Public endpoint.
+    With `with_counts`, returns the categories with their number of live listings,
+    plus the overall total, read from the incrementally maintained counts.
     """
-    result = await db.execute(select(models.Category))
-    return result.scalars().all()
+    if not with_counts:
+        result = await db.execute(select(models.Category))
+        return result.scalars().all()
+
+    result = await db.execute(
+        select(models.Category, func.coalesce(models.CategoryCount.count, 0))
+        .outerjoin(models.CategoryCount, models.CategoryCount.category_id == models.Category.id)
+        .order_by(models.Category.id)
+    )
+    items = [
+        schemas.CategoryWithCount(
+            id=category.id, name=category.name, description=category.description, listing_count=count
+        )
+        for category, count in result.all()
+    ]
+    total = await db.scalar(select(func.coalesce(func.sum(models.CategoryCount.count), 0)))
+    return schemas.CategoryFacets(items=items, total=total)
 
 
 @router.post("/", response_model=schemas.Category)
@@ -6,9 +6,11 @@ from sqlalchemy.future import select
 
 from app import models, schemas
 from app.api import deps
+from app.core.profiling import ProfiledRoute
+from app.core.responses import PydanticJSONResponse
 from app.db.session import get_db
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/", response_model=list[schemas.FraudLog])
@@ -16,18 +18,41 @@ async def list_fraud_logs(
     skip: int = 0,
     limit: int = 100,
     suspicious_only: bool = False,
+    before_id: int | None = None,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_admin),
 ) -> Any:
     """
-    List fraud logs. Admin only.
+    List fraud logs, newest first. Admin only.
+    Pass the last id of a page as `before_id` to get the next one without an OFFSET scan.
     """
     query = select(models.FraudLog)
     if suspicious_only:
         query = query.where(models.FraudLog.is_suspicious == True)
+    if before_id is not None:
+        query = query.where(models.FraudLog.id < before_id)
     query = query.order_by(models.FraudLog.id.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    return PydanticJSONResponse.validate(list[schemas.FraudLog], result.scalars().all())
+
+
+@router.get("/daily", response_model=list[schemas.FraudLogDaily])
+async def list_fraud_log_daily(
+    seller_id: int | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    List the daily per-seller aggregates of compacted OK checks, newest day first. Admin only.
+    """
+    query = select(models.FraudLogDaily)
+    if seller_id is not None:
+        query = query.where(models.FraudLogDaily.seller_id == seller_id)
+    query = query.order_by(models.FraudLogDaily.day.desc(), models.FraudLogDaily.seller_id).offset(skip).limit(limit)
+    result = await db.execute(query)
+    return PydanticJSONResponse.validate(list[schemas.FraudLogDaily], result.scalars().all())
 
 
 @router.put("/{log_id}/resolve", response_model=schemas.FraudLog)
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Response, UploadFile
+from fastapi.responses import FileResponse, RedirectResponse
+
+from app import models, schemas
+from app.api import deps
+from app.core.config import settings
+from app.core.profiling import ProfiledRoute
+from app.services.blob_store import BlobStore, get_blob_store, is_valid_key
+from app.services.images import MEDIA_TYPES, image_ref, sniff_extension
+from app.services.thumbnails import VARIANTS, ensure_variant, schedule_variants
+
+router = APIRouter(route_class=ProfiledRoute)
+
+# Keys are content hashes, so a given URL always serves the same bytes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.post("/", response_model=schemas.ImageUpload)
+async def upload_image(
+    *,
+    file: UploadFile = File(...),
+    store: BlobStore = Depends(get_blob_store),
+    current_user: models.User = Depends(deps.get_current_seller),
+) -> Any:
+    """
+    Upload an article image (JPEG, PNG, GIF or WebP). Seller or admin role required.
+    Returns a reference to store in the article's `image_url` list.
+    Identical files are stored once.
+    """
+    if file.size is not None and file.size > settings.IMAGE_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Image exceeds {settings.IMAGE_MAX_BYTES} bytes")
+    extension = sniff_extension(await file.read(16))
+    if extension is None:
+        raise HTTPException(status_code=415, detail="Unsupported image format")
+    await file.seek(0)
+
+    key = await asyncio.to_thread(store.put, file.file, extension)
+    schedule_variants(store, key)
+    # What was stored: the declared size is missing for chunked uploads
+    return {"key": key, "url": image_ref(key), "size": file.file.tell()}
+
+
+async def _serve(key: str, store: BlobStore, if_none_match: str | None) -> Response:
+    etag = f'"{key.partition(".")[0]}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    media_type = MEDIA_TYPES.get(key.rpartition(".")[2], "application/octet-stream")
+    path = store.local_path(key)
+    if path is not None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    return Response(await asyncio.to_thread(store.read, key), media_type=media_type, headers=headers)
+
+
+@router.get("/{key}")
+async def get_image(
+    key: str,
+    if_none_match: str | None = Header(default=None),
+    store: BlobStore = Depends(get_blob_store),
+) -> Any:
+    """
+    Serve a stored image. Public endpoint, cacheable forever.
+    """
+    if not is_valid_key(key) or not await asyncio.to_thread(store.exists, key):
+        raise HTTPException(status_code=404, detail="Image not found")
+    return await _serve(key, store, if_none_match)
+
+
+@router.get("/{key}/{variant}")
+async def get_image_variant(
+    key: str,
+    variant: str,
+    if_none_match: str | None = Header(default=None),
+    store: BlobStore = Depends(get_blob_store),
+) -> Any:
+    """
+    Serve a resized WebP variant of a stored image (`thumb` or `medium`),
+    rendering it on first request. Public endpoint, cacheable forever.
+    Falls back to the original when it cannot be resized.
+    """
+    if variant not in VARIANTS or not is_valid_key(key) or not await asyncio.to_thread(store.exists, key):
+        raise HTTPException(status_code=404, detail="Image not found")
+    variant_key = await ensure_variant(store, key, variant)
+    if variant_key is None:
+        return RedirectResponse(image_ref(key))
+    return await _serve(variant_key, store, if_none_match)
@@ -1,42 +1,153 @@
-from typing import Any
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app import models, schemas
 from app.api import deps
+from app.core.config import settings
+from app.core.profiling import ProfiledRoute
+from app.core.responses import PydanticJSONResponse
+from app.db.replicas import get_read_db, get_read_session_factory, is_recent_writer
 from app.db.session import get_db
+from app.services.blob_store import BlobStore, get_blob_store
+from app.services.catalog_cache import catalog_cache
+from app.services.category_counts import adjust_counts, is_listed
 from app.services.fraud import check_price_change
+from app.services.images import externalize_images
+from app.services.single_flight import SingleFlight
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
+# Length of the description prefix sent with article summaries
+EXCERPT_LENGTH = 200
+# Maximum number of ids in one batch lookup
+BATCH_LOOKUP_MAX = 100
 
-@router.get("/", response_model=schemas.PaginatedArticles)
+# Concurrent identical catalog page requests share one execution
+catalog_flights = SingleFlight("catalog")
+
+# Catalog sort orders, each ending on the id so that pages never overlap; ids grow
+# with time, hence "newest". They match the partial indexes on live articles.
+CATALOG_SORTS = {
+    None: (models.Article.id,),
+    "price": (models.Article.price, models.Article.id),
+    "-price": (models.Article.price.desc(), models.Article.id.desc()),
+    "newest": (models.Article.id.desc(),),
+}
+
+
+async def _article_summaries(db: AsyncSession, query, expand_seller: bool) -> list[schemas.ArticleSummary]:
+    """
+    Run an article query as a summary projection: only the listed columns and a
+    description prefix are fetched, and seller names are loaded in one extra query if asked for.
+    """
+    Article = models.Article
+    query = query.with_only_columns(
+        Article.id,
+        Article.title,
+        Article.price,
+        Article.shipping_cost,
+        Article.category_id,
+        Article.seller_id,
+        Article.is_sold,
+        Article.image_url,
+        func.substr(Article.description, 1, EXCERPT_LENGTH).label("excerpt"),
+        maintain_column_froms=True,
+    )
+    rows = (await db.execute(query)).mappings().all()
+    sellers = {}
+    if expand_seller and rows:
+        User = models.User
+        result = await db.execute(
+            select(User.id, User.full_name).where(User.id.in_({row["seller_id"] for row in rows}))
+        )
+        sellers = {seller["id"]: seller for seller in result.mappings()}
+    return [schemas.ArticleSummary.model_validate({**row, "seller": sellers.get(row["seller_id"])}) for row in rows]
+
+
+async def _externalize_images(image_url: str | None, store: BlobStore) -> str | None:
+    """Move inline data-URL images sent by older clients into the blob store."""
+    try:
+        return await asyncio.to_thread(externalize_images, image_url, store)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/", response_model=schemas.PaginatedArticles | schemas.PaginatedArticleSummaries)
 async def list_articles(
     skip: int = 0,
     limit: int = 100,
     category_id: int = None,
     search: str = None,
-    db: AsyncSession = Depends(get_db),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    sort: Literal["price", "-price", "newest"] | None = None,
+    fields: Literal["full", "summary"] = "full",
+    expand: Literal["seller"] | None = None,
+    sessions: Callable[[], AsyncSession] = Depends(get_read_session_factory),
+    recent_writer: bool = Depends(is_recent_writer),
 ) -> Any:
     """
     Browse the catalog. Public endpoint — no authentication required.
-    Only returns approved articles. Supports category and text search filtering.
+    Only returns approved articles. Supports category, text search and price range
+    filtering, sorted by `sort` (ascending `price`, descending `-price`, or `newest`).
+    With `fields=summary`, returns compact entries for listing grids
+    (`expand=seller` adds the seller).
+    Pages are served from the in-process catalog cache when possible, and
+    concurrent requests for the same uncached page share one set of queries;
+    users who just wrote get a page rendered for them from the primary instead,
+    as shared pages may come from a lagging replica.
     """
-    query = select(models.Article).where(models.Article.is_approved == True, models.Article.is_sold == False)
-    if category_id:
-        query = query.where(models.Article.category_id == category_id)
-    if search:
-        search_filter = f"%{search}%"
-        query = query.where(models.Article.title.ilike(search_filter) | models.Article.description.ilike(search_filter))
-
-    total = await db.scalar(select(func.count()).select_from(query.subquery()))
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    items = result.scalars().all()
-    return {"items": items, "total": total}
+    # Search is case-insensitive and category 0 means no filter: same page, same key
+    category_id = category_id or None
+    search = search.lower() if search else None
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price cannot be greater than max_price.")
+    cache_key = (category_id, search, min_price, max_price, sort, skip, limit, fields, expand)
+    cached = None if recent_writer else catalog_cache.get(cache_key)
+    if cached is not None:
+        return PydanticJSONResponse(cached)
+
+    async def render() -> bytes:
+        query = select(models.Article).where(models.Article.is_approved == True, models.Article.is_sold == False)
+        if category_id:
+            query = query.where(models.Article.category_id == category_id)
+        if search:
+            search_filter = f"%{search}%"
+            query = query.where(
+                models.Article.title.ilike(search_filter) | models.Article.description.ilike(search_filter)
+            )
+        if min_price is not None:
+            query = query.where(models.Article.price >= min_price)
+        if max_price is not None:
+            query = query.where(models.Article.price <= max_price)
+
+        # Its own session: the requests sharing this flight each have theirs, and the
+        # first of them may finish (and close it) before the others
+        async with sessions() as db:
+            total = await db.scalar(select(func.count()).select_from(query.subquery()))
+            query = query.order_by(*CATALOG_SORTS[sort])
+            if fields == "summary":
+                items = await _article_summaries(db, query.offset(skip).limit(limit), expand_seller=expand == "seller")
+                page = schemas.PaginatedArticleSummaries(items=items, total=total)
+            else:
+                result = await db.execute(query.offset(skip).limit(limit))
+                items = result.scalars().all()
+                page = schemas.PaginatedArticles.model_validate({"items": items, "total": total}, from_attributes=True)
+        # Cache the rendered page, so hits skip serialization too
+        body = PydanticJSONResponse(page).body
+        catalog_cache.set(cache_key, body)
+        return body
+
+    if recent_writer:
+        return PydanticJSONResponse(await render())
+    return PydanticJSONResponse(await catalog_flights.do(cache_key, render))
 
 
 @router.get("/admin/all", response_model=schemas.PaginatedArticles)
@@ -54,31 +165,116 @@ async def list_all_articles(
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
     items = result.scalars().all()
-    return {"items": items, "total": total}
+    return PydanticJSONResponse.validate(schemas.PaginatedArticles, {"items": items, "total": total})
+
+
+@router.get("/admin/pending", response_model=schemas.ModerationQueue)
+async def list_pending_articles(
+    after_id: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    Moderation queue: articles awaiting approval, oldest first. Admin only.
+    Uses keyset pagination — pass the returned `next_cursor` as `after_id`
+    to fetch the next page.
+    """
+    limit = max(1, min(limit, settings.MODERATION_BATCH_MAX))
+    query = (
+        select(models.Article)
+        .where(models.Article.is_approved == False, models.Article.id > after_id)
+        .order_by(models.Article.id)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    items = result.scalars().all()
+    next_cursor = items[-1].id if len(items) == limit else None
+    return PydanticJSONResponse.validate(schemas.ModerationQueue, {"items": items, "next_cursor": next_cursor})
 
 
-@router.get("/mine", response_model=schemas.PaginatedArticles)
+@router.post("/admin/moderate", response_model=schemas.ArticleBulkModerationResult)
+async def moderate_articles(
+    *,
+    db: AsyncSession = Depends(get_db),
+    moderation_in: schemas.ArticleBulkModeration,
+    current_user: models.User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    Approve or reject a batch of pending articles in a single statement. Admin only.
+    Rejected articles are deleted. Articles that are not pending are ignored.
+    """
+    article_ids = set(moderation_in.article_ids)
+    if len(article_ids) > settings.MODERATION_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many articles in one batch (max {settings.MODERATION_BATCH_MAX}).",
+        )
+
+    pending = models.Article.id.in_(article_ids) & (models.Article.is_approved == False)
+    if moderation_in.action == "approve":
+        stmt = update(models.Article).where(pending).values(is_approved=True)
+    else:
+        stmt = delete(models.Article).where(pending)
+    stmt = stmt.returning(models.Article.id, models.Article.category_id, models.Article.is_sold).execution_options(
+        synchronize_session=False
+    )
+    rows = (await db.execute(stmt)).all()
+    if moderation_in.action == "approve":
+        await adjust_counts(db, Counter(row.category_id for row in rows if not row.is_sold))
+    await db.commit()
+
+    # Rejected articles were never listed, so only approvals change catalog pages
+    if moderation_in.action == "approve" and rows:
+        catalog_cache.invalidate({row.category_id for row in rows})
+
+    moderated_ids = sorted(row.id for row in rows)
+    return {"action": moderation_in.action, "article_ids": moderated_ids, "count": len(moderated_ids)}
+
+
+@router.get("/mine", response_model=schemas.PaginatedArticles | schemas.PaginatedArticleSummaries)
 async def list_my_articles(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
+    fields: Literal["full", "summary"] = "full",
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     List current user's own articles (including unapproved).
+    With `fields=summary`, returns compact entries for listing grids.
     """
     query = select(models.Article).where(models.Article.seller_id == current_user.id)
     total = await db.scalar(select(func.count()).select_from(query.subquery()))
     query = query.offset(skip).limit(limit)
+    if fields == "summary":
+        items = await _article_summaries(db, query, expand_seller=False)
+        return PydanticJSONResponse(schemas.PaginatedArticleSummaries(items=items, total=total))
     result = await db.execute(query)
     items = result.scalars().all()
-    return {"items": items, "total": total}
+    return PydanticJSONResponse.validate(schemas.PaginatedArticles, {"items": items, "total": total})
+
+
+@router.get("/batch", response_model=list[schemas.ArticleSummary])
+async def get_articles_batch(
+    ids: list[int] = Query(...),
+    db: AsyncSession = Depends(get_read_db),
+) -> Any:
+    """
+    Summaries of several articles in one query, e.g. for the chat inbox. Public endpoint.
+    Pass ids as repeated parameters (`?ids=1&ids=2`); unknown ids are skipped.
+    """
+    ids = set(ids)
+    if len(ids) > BATCH_LOOKUP_MAX:
+        raise HTTPException(status_code=400, detail=f"Too many ids (max {BATCH_LOOKUP_MAX}).")
+    query = select(models.Article).where(models.Article.id.in_(ids)).order_by(models.Article.id)
+    return PydanticJSONResponse(await _article_summaries(db, query, expand_seller=False))
 
 
 @router.get("/{article_id}", response_model=schemas.Article)
 async def get_article(
     article_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """
     Get article detail. Public endpoint.
@@ -95,6 +291,7 @@ async def create_article(
     *,
     db: AsyncSession = Depends(get_db),
     article_in: schemas.ArticleCreate,
+    store: BlobStore = Depends(get_blob_store),
     current_user: models.User = Depends(deps.get_current_seller),
 ) -> Any:
     """
@@ -106,7 +303,7 @@ async def create_article(
         description=article_in.description,
         price=article_in.price,
         shipping_cost=article_in.shipping_cost,
-        image_url=article_in.image_url,
+        image_url=await _externalize_images(article_in.image_url, store),
         category_id=article_in.category_id,
         seller_id=current_user.id,
         is_approved=False,
@@ -123,10 +320,13 @@ async def update_article(
     article_id: int,
     db: AsyncSession = Depends(get_db),
     article_in: schemas.ArticleUpdate,
+    store: BlobStore = Depends(get_blob_store),
     current_user: models.User = Depends(deps.get_current_active_user),
+    limit_price_update: Callable[[], Awaitable[None]] = Depends(deps.deferred_rate_limit("price_update")),
 ) -> Any:
     """
     Update an article. Only the seller who owns it or an admin can update.
+    Price changes count against the same limit as the price endpoint.
     """
     result = await db.execute(select(models.Article).where(models.Article.id == article_id))
     article = result.scalars().first()
@@ -136,6 +336,10 @@ async def update_article(
         raise HTTPException(status_code=403, detail="Not allowed to update this article")
 
     update_data = article_in.model_dump(exclude_unset=True)
+    if "price" in update_data:
+        await limit_price_update()
+    if update_data.get("image_url"):
+        update_data["image_url"] = await _externalize_images(update_data["image_url"], store)
 
     # Check for price fraud if price is being updated
     if "price" in update_data and update_data["price"] != article.price:
@@ -152,15 +356,23 @@ async def update_article(
                 detail=f"Price change flagged as suspicious: {fraud_result['reason']}. Contact support.",
             )
 
+    old_category_id = article.category_id
     for field, value in update_data.items():
         setattr(article, field, value)
+    if is_listed(article) and article.category_id != old_category_id:
+        await adjust_counts(db, {old_category_id: -1, article.category_id: 1})
 
     await db.commit()
     await db.refresh(article)
+    catalog_cache.invalidate({old_category_id, article.category_id})
     return article
 
 
-@router.put("/{article_id}/price", response_model=schemas.Article)
+@router.put(
+    "/{article_id}/price",
+    response_model=schemas.Article,
+    dependencies=[Depends(deps.rate_limit("price_update", per="user"))],
+)
 async def update_article_price(
     *,
     article_id: int,
@@ -197,6 +409,7 @@ async def update_article_price(
     article.price = price_update.price
     await db.commit()
     await db.refresh(article)
+    catalog_cache.invalidate({article.category_id})
     return article
 
 
@@ -215,9 +428,12 @@ async def approve_article(
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
+    if not article.is_approved and not article.is_sold:
+        await adjust_counts(db, {article.category_id: 1})
     article.is_approved = True
     await db.commit()
     await db.refresh(article)
+    catalog_cache.invalidate({article.category_id})
     return article
 
 
@@ -238,6 +454,10 @@ async def delete_article(
     if article.seller_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not allowed to delete this article")
 
+    category_id = article.category_id
+    if is_listed(article):
+        await adjust_counts(db, {category_id: -1})
     await db.delete(article)
     await db.commit()
+    catalog_cache.invalidate({category_id})
     return {"detail": "Article deleted"}
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, categories, fraud, items, users
+from app.api.v1.endpoints import auth, categories, fraud, images, items, users
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(items.router, prefix="/articles", tags=["articles"])
+api_router.include_router(images.router, prefix="/images", tags=["images"])
 api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
 api_router.include_router(fraud.router, prefix="/fraud-logs", tags=["fraud"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
@@ -12,11 +12,98 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "app"
     SQLALCHEMY_DATABASE_URI: str | None = None
 
+    # Read replicas, comma-separated URIs (see app.db.replicas)
+    REPLICA_DATABASE_URIS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+
     # Security
     SECRET_KEY: str = "YOUR_SECRET_KEY_HERE_CHANGE_IN_PRODUCTION"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Catalog
+    # Per process, so also how long other workers may serve a page after a write (see app.services.catalog_cache)
+    CATALOG_CACHE_TTL_SECONDS: float = 30.0
+    CATALOG_CACHE_MAX_ENTRIES: int = 1024
+    MODERATION_BATCH_MAX: int = 1000
+    # Live-listing counts are recomputed from articles this often (see app.services.category_counts)
+    CATEGORY_COUNTS_RECONCILE_SECONDS: float = 300.0
+
+    # Fraud log retention (see app.services.fraud_retention)
+    FRAUD_LOG_RETENTION_ENABLED: bool = True
+    # OK checks older than this are compacted into daily per-seller aggregates
+    FRAUD_LOG_OK_RETENTION_DAYS: int = 30
+    # Resolved suspicious logs older than this are deleted; 0 keeps them
+    FRAUD_LOG_RESOLVED_RETENTION_DAYS: int = 365
+    FRAUD_LOG_RETENTION_BATCH_SIZE: int = 1000
+    FRAUD_LOG_RETENTION_INTERVAL_SECONDS: float = 3600.0
+
+    # Images (see app.services.blob_store)
+    BLOB_STORE_BACKEND: str = "local"
+    # Shared by every API replica: docker-compose and k8s/app.yml mount a volume here
+    BLOB_STORE_PATH: str = "blobs"
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    THUMBNAIL_WORKERS: int = 2
+    THUMBNAIL_QUALITY: int = 80
+
+    # Server (see app.serve)
+    SERVER_HOST: str = "0.0.0.0"  # noqa: S104 - served inside a container
+    SERVER_PORT: int = 8000
+    # Measure before raising: tests/benchmarks/test_workers.py showed lower throughput with more workers
+    SERVER_WORKERS: int = 1
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    SERVER_BACKLOG: int = 2048
+    # Longer than the ingress proxy's idle timeout for upstream connections (Traefik: 90s),
+    # so the proxy never reuses a connection the server is closing
+    SERVER_KEEPALIVE_SECONDS: int = 95
+    # Proxies trusted for X-Forwarded-For, so rate limits see client IPs rather than the ingress
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Response compression (see app.core.compression)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    # Brotli quality above ~5 costs far more CPU than it saves bytes on dynamic responses
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Rate limits as "<count>/<second|minute|hour|day>" (see app.services.rate_limit)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_REGISTER: str = "5/minute"
+    RATE_LIMIT_PRICE_UPDATE: str = "30/minute"
+
+    # Health probes (see app.core.health)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MIN_POOL_HEADROOM: int = 1
+
+    # Warm-up before readiness (see app.core.startup)
+    WARMUP_ENABLED: bool = True
+    # Pool connections opened before the first request (the default pool keeps 5)
+    WARMUP_POOL_CONNECTIONS: int = 5
+    # Comma-separated GET paths requested in-process: the catalog's first page and facets, as the home page loads them
+    WARMUP_PATHS: str = "/api/v1/articles/?skip=0&limit=12&fields=summary,/api/v1/categories/?with_counts=true"
+    WARMUP_TIMEOUT_SECONDS: float = 10.0
+
+    # Request profiling (see app.core.profiling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+    # Tracing (see app.core.tracing)
+    TRACING_ENABLED: bool = False
+    # Share of new traces recorded; requests continuing a caller's trace follow its decision
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_SERVICE_NAME: str = "collector-api"
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE: str = "traces/spans.jsonl"
+
     @property
     def database_url(self) -> str:
         if self.SQLALCHEMY_DATABASE_URI:
@@ -0,0 +1,113 @@
+"""
+Liveness and readiness state.
+
+Probes must be cheap, so they never touch the database themselves: a
+background task pings the database every HEALTH_CHECK_INTERVAL_SECONDS and
+records the result along with the connection pool's headroom, and the
+readiness endpoint only reads that snapshot. The service is also not ready
+while it warms up (see app.core.startup).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HealthSnapshot:
+    database: bool = False
+    latency_ms: float | None = None
+    pool_checked_out: int | None = None
+    pool_capacity: int | None = None
+    error: str | None = None
+    checked_at: float | None = None
+
+    @property
+    def pool_headroom(self) -> int | None:
+        if self.pool_capacity is None or self.pool_checked_out is None:
+            return None
+        return self.pool_capacity - self.pool_checked_out
+
+
+def _pool_usage(engine: AsyncEngine) -> tuple[int | None, int | None]:
+    """(checked out, capacity) of a queue pool; (None, None) for unbounded pools."""
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    if size is None or max_overflow < 0:
+        return None, None
+    return pool.checkedout(), size() + max_overflow
+
+
+class HealthMonitor:
+    def __init__(self, engine: AsyncEngine, interval: float, timeout: float):
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.snapshot = HealthSnapshot()
+        # Set by app.core.startup.WarmUp until the pool and caches are primed
+        self.warming_up = False
+        self._task: asyncio.Task | None = None
+
+    async def check_once(self) -> HealthSnapshot:
+        start = time.perf_counter()
+        snapshot = HealthSnapshot()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            snapshot.database = True
+            snapshot.latency_ms = round((time.perf_counter() - start) * 1000, 3)
+        except Exception as e:
+            snapshot.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        snapshot.pool_checked_out, snapshot.pool_capacity = _pool_usage(self.engine)
+        snapshot.checked_at = time.time()
+        if snapshot.database != self.snapshot.database:
+            logger.log(logging.INFO if snapshot.database else logging.WARNING, "Database health: %s", snapshot)
+        self.snapshot = snapshot
+        return snapshot
+
+    def readiness(self) -> tuple[bool, dict]:
+        snapshot = self.snapshot
+        reasons = ["warming up"] if self.warming_up else []
+        if snapshot.checked_at is None:
+            reasons.append("no database check yet")
+        elif time.time() - snapshot.checked_at > 3 * self.interval:
+            reasons.append("database check is stale")
+        elif not snapshot.database:
+            reasons.append("database unreachable")
+        headroom = snapshot.pool_headroom
+        if headroom is not None and headroom < settings.HEALTH_MIN_POOL_HEADROOM:
+            reasons.append("connection pool exhausted")
+        body = {"status": "ok" if not reasons else "unavailable", **asdict(snapshot), "pool_headroom": headroom}
+        if reasons:
+            body["reasons"] = reasons
+        return not reasons, body
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_once()
+
+    async def start(self) -> None:
+        """Run a first check, so the service is ready as soon as startup completes, then keep checking."""
+        await self.check_once()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
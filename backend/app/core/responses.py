@@ -0,0 +1,37 @@
+"""
+JSON responses rendered by pydantic-core.
+
+Returning `PydanticJSONResponse` from an endpoint bypasses FastAPI's response
+handling: the content is not validated against `response_model` again (keep
+declaring it for the OpenAPI schema), and is serialized by pydantic-core
+straight to bytes instead of going through `jsonable_encoder` + `json.dumps`,
+which older FastAPI versions do and which dominates CPU time on large pages.
+Already-rendered bytes are sent as is, so cached pages are serialized once.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+class PydanticJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return pydantic_core.to_json(content)
+
+    @classmethod
+    def validate(cls, type_: Any, value: Any, **kwargs: Any) -> "PydanticJSONResponse":
+        """Validate `value` (e.g. ORM objects) as `type_`, then render it."""
+        adapter = _adapter(type_)
+        return cls(adapter.dump_json(adapter.validate_python(value, from_attributes=True)), **kwargs)
@@ -4,6 +4,7 @@ from typing import Any
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core import tracing
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -21,8 +22,10 @@ def create_access_token(subject: str | Any, expires_delta: timedelta | None = No
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with tracing.span("bcrypt.verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with tracing.span("bcrypt.hash"):
+        return pwd_context.hash(password)
@@ -0,0 +1,120 @@
+"""
+Startup timing and warm-up.
+
+New pods should take traffic quickly and serve their first requests as fast
+as the others. Each startup phase (importing the app, building it, the
+lifespan steps) is timed with `startup_phase`, exported as
+`startup_phase_seconds{phase}` and logged. `startup_ready_seconds` is the
+time from the first import to readiness.
+
+Once the lifespan has started, `WarmUp` runs in the background while the
+readiness probe reports "warming up":
+- it opens WARMUP_POOL_CONNECTIONS pool connections at once, so the first
+  requests do not pay for connecting;
+- it requests WARMUP_PATHS in-process, which compiles and prepares their
+  statements and fills the catalog cache for the pages every visitor loads.
+Warm-up failures are logged and never block readiness for longer than
+WARMUP_TIMEOUT_SECONDS.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import AsyncExitStack, contextmanager
+
+from prometheus_client import Gauge
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp
+
+from app import IMPORT_STARTED
+from app.core.health import HealthMonitor
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PHASE_SECONDS = Gauge("startup_phase_seconds", "Duration of each startup phase of this process", ["phase"])
+STARTUP_READY_SECONDS = Gauge("startup_ready_seconds", "Time from the first import of the app to readiness")
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    STARTUP_PHASE_SECONDS.labels(phase).set(seconds)
+    logger.info("Startup phase %s took %.3fs", phase, seconds)
+
+
+def mark_ready() -> None:
+    seconds = time.perf_counter() - IMPORT_STARTED
+    STARTUP_READY_SECONDS.set(seconds)
+    logger.info("Ready %.3fs after import", seconds)
+
+
+@contextmanager
+def startup_phase(phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - start)
+
+
+class WarmUp:
+    def __init__(
+        self,
+        app: ASGIApp,
+        engine: AsyncEngine,
+        health: HealthMonitor,
+        connections: int,
+        paths: list[str],
+        timeout: float,
+    ):
+        self.app = app
+        self.engine = engine
+        self.health = health
+        self.connections = connections
+        self.paths = paths
+        self.timeout = timeout
+        self._task: asyncio.Task | None = None
+
+    async def open_connections(self) -> None:
+        async with AsyncExitStack() as stack:
+            # Held together, so the pool really opens that many
+            connections = [await stack.enter_async_context(self.engine.connect()) for _ in range(self.connections)]
+            await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+
+    async def request_paths(self) -> None:
+        # Only needed once the app is up; importing it lazily keeps it off the startup path
+        import httpx
+
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warm-up") as client:
+            for path in self.paths:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    logger.warning("Warm-up request %s returned %d", path, response.status_code)
+
+    async def run(self) -> None:
+        try:
+            with startup_phase("warm_up"):
+                async with asyncio.timeout(self.timeout):
+                    await self.open_connections()
+                    await self.request_paths()
+        except Exception:
+            logger.exception("Warm-up failed, serving cold")
+        finally:
+            self.health.warming_up = False
+            mark_ready()
+
+    async def start(self) -> None:
+        """Warm up in the background; the readiness probe fails until it is done."""
+        if self._task is None:
+            self.health.warming_up = True
+            self._task = asyncio.create_task(self.run(), name="warm-up")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,48 +1,137 @@
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
+from sqlalchemy import Index, text
+from sqlalchemy.schema import CreateIndex
+
+from app import IMPORT_STARTED
 
 # Import models to ensure they are registered with Base.metadata
 from app.api.v1.router import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.db.session import Base, engine
+from app.core.health import HealthMonitor
+from app.core.profiling import ProfilingMiddleware
+from app.core.startup import WarmUp, mark_ready, record_phase, startup_phase
+from app.core.tracing import TracingMiddleware
+from app.db.replicas import ReadYourWritesMiddleware, replica_set
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.models import Article, FraudLog
+from app.services.category_counts import CategoryCountReconciler
+from app.services.fraud_retention import FraudLogRetention
 
 logger = logging.getLogger(__name__)
 
+record_phase("import", time.perf_counter() - IMPORT_STARTED)
+_app_started = time.perf_counter()
+
+health_monitor = HealthMonitor(
+    engine,
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_DB_TIMEOUT_SECONDS,
+)
+category_counts = CategoryCountReconciler(AsyncSessionLocal, interval=settings.CATEGORY_COUNTS_RECONCILE_SECONDS)
+fraud_log_retention = FraudLogRetention(
+    AsyncSessionLocal,
+    ok_days=settings.FRAUD_LOG_OK_RETENTION_DAYS,
+    resolved_days=settings.FRAUD_LOG_RESOLVED_RETENTION_DAYS,
+    batch_size=settings.FRAUD_LOG_RETENTION_BATCH_SIZE,
+    interval=settings.FRAUD_LOG_RETENTION_INTERVAL_SECONDS,
+)
+
+# (table, column) -> statement adding the column to databases created before it
+_MIGRATIONS = {
+    ("messages", "file_url"): "ALTER TABLE messages ADD COLUMN IF NOT EXISTS file_url TEXT;",
+    ("articles", "is_sold"): "ALTER TABLE articles ADD COLUMN IF NOT EXISTS is_sold BOOLEAN DEFAULT FALSE;",
+}
+
+
+async def _create_indexes(indexes: list[Index]) -> None:
+    """
+    Create the indexes missing from existing tables (create_all only indexes new tables).
+    On Postgres they are built CONCURRENTLY, outside a transaction, so the table stays
+    writable while a new index builds on a live database.
+    """
+    if engine.dialect.name != "postgresql":
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+        return
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for index in indexes:
+            # An interrupted concurrent build leaves an invalid index behind, which IF NOT EXISTS would keep
+            invalid = await conn.scalar(
+                text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": index.name}
+            )
+            if invalid:
+                await conn.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"')
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+            await conn.exec_driver_sql(ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Retry DB connection up to 10 times (handles Docker startup ordering)
-    for attempt in range(10):
-        try:
-            async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
-            logger.info("Database tables created successfully.")
-            break
-        except Exception as e:
-            logger.warning(f"DB connection attempt {attempt + 1}/10 failed: {e}")
-            if attempt < 9:
-                await asyncio.sleep(2)
-            else:
-                raise
+    with startup_phase("create_all"):
+        for attempt in range(10):
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                logger.info("Database tables created successfully.")
+                break
+            except Exception as e:
+                logger.warning(f"DB connection attempt {attempt + 1}/10 failed: {e}")
+                if attempt < 9:
+                    await asyncio.sleep(2)
+                else:
+                    raise
 
     # Run lightweight migrations for new columns on existing tables
     # (create_all only creates new tables, it won't ALTER existing ones)
-    from sqlalchemy import text
+    from sqlalchemy import inspect
 
-    async with engine.begin() as conn:
-        try:
-            await conn.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS file_url TEXT;"))
-            await conn.execute(text("ALTER TABLE articles ADD COLUMN IF NOT EXISTS is_sold BOOLEAN DEFAULT FALSE;"))
-            logger.info("Migration: file_url and is_sold columns ensured.")
-        except Exception as e:
-            logger.warning(f"Migration warning (non-fatal): {e}")
+    with startup_phase("migrations"):
+        async with engine.begin() as conn:
+            try:
+                # ALTER TABLE locks the table even when the column exists, so new pods only run it when needed
+                missing = await conn.run_sync(
+                    lambda sync_conn: [
+                        (table, column)
+                        for table, column in _MIGRATIONS
+                        if column not in {c["name"] for c in inspect(sync_conn).get_columns(table)}
+                    ]
+                )
+                for table, column in missing:
+                    await conn.execute(text(_MIGRATIONS[table, column]))
+                logger.info("Migration: file_url and is_sold columns ensured.")
+            except Exception as e:
+                logger.warning(f"Migration warning (non-fatal): {e}")
 
+        await _create_indexes([*Article.__table__.indexes, *FraudLog.__table__.indexes])
+
+    with startup_phase("background_tasks"):
+        await health_monitor.start()
+        await replica_set.start()
+        await category_counts.start()
+        if settings.FRAUD_LOG_RETENTION_ENABLED:
+            await fraud_log_retention.start()
+    if settings.WARMUP_ENABLED:
+        await warm_up.start()
+    else:
+        mark_ready()
     yield
+    await warm_up.stop()
+    await fraud_log_retention.stop()
+    await category_counts.stop()
+    await replica_set.stop()
+    await health_monitor.stop()
 
 
 app = FastAPI(
@@ -50,6 +139,33 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
 )
+warm_up = WarmUp(
+    app,
+    engine,
+    health_monitor,
+    connections=settings.WARMUP_POOL_CONNECTIONS,
+    paths=[path.strip() for path in settings.WARMUP_PATHS.split(",") if path.strip()],
+    timeout=settings.WARMUP_TIMEOUT_SECONDS,
+)
+
+
+@app.get("/health/live", include_in_schema=False)
+async def liveness():
+    """Liveness probe: the process is serving requests. No I/O."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready", include_in_schema=False)
+async def readiness():
+    """Readiness probe: warm-up done, last background database check and pool headroom."""
+    ready, body = health_monitor.readiness()
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+# Innermost, so profiles only cover the application itself
+app.add_middleware(ProfilingMiddleware)
+
+app.add_middleware(ReadYourWritesMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -64,6 +180,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Instrumentator().instrument(app).expose(app)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Outermost, so server spans cover the whole request, compression included
+app.add_middleware(TracingMiddleware)
+
+# Probes would otherwise dominate the request metrics
+Instrumentator(excluded_handlers=["/metrics", "/health/.*"]).instrument(app).expose(app)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+record_phase("app", time.perf_counter() - _app_started)
@@ -1,7 +1,7 @@
-from .category import Category
+from .category import Category, CategoryCount
 from .chat import Conversation, Message
-from .fraud_log import FraudLog
+from .fraud_log import FraudLog, FraudLogDaily
 from .item import Article
 from .user import User
 
-__all__ = ["Article", "Category", "Conversation", "FraudLog", "Message", "User"]
+__all__ = ["Article", "Category", "CategoryCount", "Conversation", "FraudLog", "FraudLogDaily", "Message", "User"]
@@ -9,3 +9,13 @@ class Category(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)
     description = Column(String, nullable=True)
+
+
+class CategoryCount(Base):
+    """Live listings (approved, unsold) per category, see app.services.category_counts."""
+
+    __tablename__ = "category_counts"
+
+    # Category id, or 0 for articles without a category; not a foreign key for that reason
+    category_id = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -14,6 +14,12 @@ class Conversation(Base):
     buyer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Inbox state, maintained by the chat service (see its read_state)
+    last_message_at = Column(DateTime, default=datetime.utcnow)
+    buyer_unread = Column(Integer, nullable=False, default=0, server_default="0")
+    seller_unread = Column(Integer, nullable=False, default=0, server_default="0")
+    buyer_last_read_id = Column(Integer, nullable=True)
+    seller_last_read_id = Column(Integer, nullable=True)
 
     article = relationship("Article")
     buyer = relationship("User", foreign_keys=[buyer_id])
@@ -21,6 +27,10 @@ class Conversation(Base):
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
 
 
+Index("ix_conversations_buyer_activity", Conversation.buyer_id, Conversation.last_message_at)
+Index("ix_conversations_seller_activity", Conversation.seller_id, Conversation.last_message_at)
+
+
 class Message(Base):
     __tablename__ = "messages"
 
@@ -29,6 +39,11 @@ class Message(Base):
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
     file_url = Column(Text, nullable=True)
+    # Streamed attachments are owned by the chat service (see its attachment store)
+    attachment_key = Column(String(32), nullable=True, index=True)
+    attachment_name = Column(String, nullable=True)
+    attachment_type = Column(String, nullable=True)
+    attachment_size = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     conversation = relationship("Conversation", back_populates="messages")
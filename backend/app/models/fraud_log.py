@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.db.session import Base
@@ -17,3 +17,22 @@ class FraudLog(Base):
     is_suspicious = Column(Boolean, default=False, nullable=False)
     resolved = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# The admin review queue (`suspicious_only`), newest first, without the OK rows
+_suspicious = FraudLog.is_suspicious == True
+Index("ix_fraud_logs_suspicious_id", FraudLog.id, postgresql_where=_suspicious, sqlite_where=_suspicious)
+# OK checks due for compaction; it only holds the rows not compacted yet
+_ok = FraudLog.is_suspicious == False
+Index("ix_fraud_logs_ok_created_at", FraudLog.created_at, postgresql_where=_ok, sqlite_where=_ok)
+
+
+class FraudLogDaily(Base):
+    """OK price checks compacted per seller and day (see app.services.fraud_retention)."""
+
+    __tablename__ = "fraud_log_daily"
+
+    day = Column(Date, primary_key=True)
+    seller_id = Column(Integer, primary_key=True)
+    checks = Column(Integer, nullable=False, default=0)
+    max_change_pct = Column(Float, nullable=False, default=0.0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Float, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -21,3 +21,18 @@ class Article(Base):
 
     category = relationship("Category", backref="articles")
     seller = relationship("User", backref="articles", lazy="selectin")
+
+
+# Catalog orderings (see CATALOG_SORTS), over listed articles only; the predicate is the
+# catalog filter itself so the planner can match it. "newest" without a category walks the primary key.
+_listed = (Article.is_approved == True) & (Article.is_sold == False)
+Index("ix_articles_listed_price", Article.price, Article.id, postgresql_where=_listed, sqlite_where=_listed)
+Index(
+    "ix_articles_listed_category_price",
+    Article.category_id,
+    Article.price,
+    Article.id,
+    postgresql_where=_listed,
+    sqlite_where=_listed,
+)
+Index("ix_articles_listed_category_id", Article.category_id, Article.id, postgresql_where=_listed, sqlite_where=_listed)
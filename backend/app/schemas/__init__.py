@@ -1,23 +1,47 @@
-from .category import Category, CategoryCreate
+from .category import Category, CategoryCreate, CategoryFacets, CategoryWithCount
 from .chat import Conversation, ConversationCreate, Message, MessageCreate, PaymentSimulation
-from .fraud_log import FraudLog
-from .item import Article, ArticleCreate, ArticleInDB, ArticlePriceUpdate, ArticleUpdate, PaginatedArticles
+from .fraud_log import FraudLog, FraudLogDaily
+from .image import ImageUpload
+from .item import (
+    Article,
+    ArticleBulkModeration,
+    ArticleBulkModerationResult,
+    ArticleCreate,
+    ArticleImage,
+    ArticleInDB,
+    ArticlePriceUpdate,
+    ArticleSummary,
+    ArticleUpdate,
+    ModerationQueue,
+    PaginatedArticles,
+    PaginatedArticleSummaries,
+)
 from .token import Token, TokenPayload
 from .user import User, UserCreate, UserInDB, UserUpdate
 
 __all__ = [
     "Article",
+    "ArticleBulkModeration",
+    "ArticleBulkModerationResult",
     "ArticleCreate",
+    "ArticleImage",
     "ArticleInDB",
     "ArticlePriceUpdate",
+    "ArticleSummary",
     "ArticleUpdate",
     "Category",
     "CategoryCreate",
+    "CategoryFacets",
+    "CategoryWithCount",
     "Conversation",
     "ConversationCreate",
     "FraudLog",
+    "FraudLogDaily",
+    "ImageUpload",
     "Message",
     "MessageCreate",
+    "ModerationQueue",
+    "PaginatedArticleSummaries",
     "PaginatedArticles",
     "PaymentSimulation",
     "Token",
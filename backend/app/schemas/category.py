@@ -15,3 +15,14 @@ class Category(CategoryBase):
 
     class Config:
         from_attributes = True
+
+
+class CategoryWithCount(Category):
+    # Approved, unsold articles in the category
+    listing_count: int = 0
+
+
+class CategoryFacets(BaseModel):
+    items: list[CategoryWithCount]
+    # Live listings across all categories, including articles without one
+    total: int
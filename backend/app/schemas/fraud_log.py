@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -20,3 +20,13 @@ class FraudLog(FraudLogBase):
 
     class Config:
         from_attributes = True
+
+
+class FraudLogDaily(BaseModel):
+    day: date
+    seller_id: int
+    checks: int
+    max_change_pct: float
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class ImageUpload(BaseModel):
+    key: str
+    url: str
+    size: int
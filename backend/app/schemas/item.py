@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field, computed_field
+
+from app.services.images import parse_image_list, variant_urls
 
 from .user import User
 
@@ -35,14 +39,78 @@ class ArticleInDBBase(ArticleBase):
         from_attributes = True
 
 
+class ArticleImage(BaseModel):
+    url: str
+    variants: dict[str, str] = {}
+
+
 class Article(ArticleInDBBase):
     seller: User | None = None
 
+    @computed_field
+    @property
+    def images(self) -> list[ArticleImage]:
+        """`image_url` entries with the URLs of their resized variants (e.g. `thumb` for grids)."""
+        return [ArticleImage(url=ref, variants=variant_urls(ref)) for ref in parse_image_list(self.image_url)]
+
 
 class ArticleInDB(ArticleInDBBase):
     pass
 
 
+class SellerSummary(BaseModel):
+    id: int
+    full_name: str | None = None
+
+
+class ArticleSummary(BaseModel):
+    """Compact catalog entry: only what a listing grid needs. `seller` is only set when expanded."""
+
+    id: int
+    title: str
+    price: float
+    shipping_cost: float | None = 0.0
+    category_id: int | None = None
+    seller_id: int
+    is_sold: bool = False
+    excerpt: str | None = None
+    image_url: str | None = Field(default=None, exclude=True)
+    seller: SellerSummary | None = None
+
+    @computed_field
+    @property
+    def image(self) -> str | None:
+        images = parse_image_list(self.image_url)
+        return images[0] if images else None
+
+    @computed_field
+    @property
+    def thumbnail(self) -> str | None:
+        image = self.image
+        return variant_urls(image).get("thumb", image) if image else None
+
+
 class PaginatedArticles(BaseModel):
     items: list[Article]
     total: int
+
+
+class PaginatedArticleSummaries(BaseModel):
+    items: list[ArticleSummary]
+    total: int
+
+
+class ModerationQueue(BaseModel):
+    items: list[Article]
+    next_cursor: int | None = None
+
+
+class ArticleBulkModeration(BaseModel):
+    article_ids: list[int] = Field(min_length=1)
+    action: Literal["approve", "reject"]
+
+
+class ArticleBulkModerationResult(BaseModel):
+    action: str
+    article_ids: list[int]
+    count: int
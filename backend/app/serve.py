@@ -0,0 +1,76 @@
+"""
+Production entry point: `python -m app.serve`.
+
+Runs the API under uvicorn with SERVER_WORKERS processes, so a pod can use
+more than one core. uvloop and httptools are used when installed (they are
+part of uvicorn[standard]). Keep-alive and the listen backlog come from
+settings too.
+
+Every worker is a separate process with its own database pool, catalog
+cache and health monitor: size POSTGRES max_connections for
+workers x pool size x replicas. With several workers, Prometheus metrics are
+aggregated across them through a shared multiprocess directory.
+"""
+
+import importlib.util
+import logging
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _pick(setting: str, preferred: str, module: str) -> str:
+    """Resolve "auto" to the fast implementation when its module is installed."""
+    if setting != "auto":
+        return setting
+    return preferred if importlib.util.find_spec(module) else "auto"
+
+
+def _prepare_metrics_dir() -> None:
+    """Point prometheus_client at an empty directory shared by the workers."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        # Stale files from a previous run would be summed into the new metrics
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    else:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    workers = max(settings.SERVER_WORKERS, 1)
+    if workers > 1 or "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        _prepare_metrics_dir()
+    loop = _pick(settings.SERVER_LOOP, "uvloop", "uvloop")
+    http = _pick(settings.SERVER_HTTP, "httptools", "httptools")
+    logger.info(
+        "Starting %d worker(s) on %s:%d (loop=%s, http=%s)",
+        workers,
+        settings.SERVER_HOST,
+        settings.SERVER_PORT,
+        loop,
+        http,
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    main()
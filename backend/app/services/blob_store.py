@@ -0,0 +1,126 @@
+"""
+Content-addressed blob storage.
+
+Blobs are keyed by the SHA-256 of their content plus an extension, so uploading
+the same file twice stores it once and a key never changes meaning — which is
+what lets the image endpoint serve blobs as immutable.
+
+The filesystem backend is the default; other backends (e.g. an S3-compatible
+store) implement `BlobStore` and are registered with `register_backend`, then
+selected with the BLOB_STORE_BACKEND setting.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.config import settings
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,5}$")
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(KEY_PATTERN.match(key))
+
+
+class BlobStore(ABC):
+    @abstractmethod
+    def put(self, source: BinaryIO, extension: str) -> str:
+        """Store the content of `source` and return its key. Existing content is not rewritten."""
+
+    @abstractmethod
+    def put_at(self, key: str, data: bytes) -> None:
+        """Store derived content (e.g. a thumbnail) under a key computed from its source."""
+
+    @abstractmethod
+    def read(self, key: str) -> bytes | None:
+        """Return the blob content, or None if there is no such blob."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    def local_path(self, key: str) -> Path | None:
+        """Filesystem path of the blob, for backends that can serve it directly."""
+        return None
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under `root`, sharded by the first two hex digits of the hash."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        if not is_valid_key(key):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return self.root / key[:2] / key
+
+    def put(self, source: BinaryIO, extension: str) -> str:
+        digest = hashlib.sha256()
+
+        def chunks():
+            while chunk := source.read(_CHUNK_SIZE):
+                digest.update(chunk)
+                yield chunk
+
+        # The key is only known once everything is hashed, hence the temp file
+        return self._write(chunks(), lambda: f"{digest.hexdigest()}.{extension}")
+
+    def put_at(self, key: str, data: bytes) -> None:
+        self._write(iter([data]), lambda: key)
+
+    def _write(self, chunks: Iterator[bytes], key_for: Callable[[], str]) -> str:
+        """Spool to a temp file in the store, then rename into place so readers never see partial blobs."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+            key = key_for()
+            path = self._path(key)
+            if path.exists():
+                return key
+            path.parent.mkdir(exist_ok=True)
+            os.replace(tmp_name, path)
+            return key
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def read(self, key: str) -> bytes | None:
+        path = self.local_path(key)
+        return path.read_bytes() if path else None
+
+    def exists(self, key: str) -> bool:
+        return is_valid_key(key) and self._path(key).is_file()
+
+    def local_path(self, key: str) -> Path | None:
+        return self._path(key) if self.exists(key) else None
+
+
+_BACKENDS: dict[str, Callable[[], BlobStore]] = {
+    "local": lambda: LocalBlobStore(settings.BLOB_STORE_PATH),
+}
+
+
+def register_backend(name: str, factory: Callable[[], BlobStore]) -> None:
+    _BACKENDS[name] = factory
+
+
+@lru_cache
+def get_blob_store() -> BlobStore:
+    """The configured blob store. Also usable as a FastAPI dependency."""
+    try:
+        factory = _BACKENDS[settings.BLOB_STORE_BACKEND]
+    except KeyError:
+        raise RuntimeError(f"Unknown BLOB_STORE_BACKEND: {settings.BLOB_STORE_BACKEND!r}") from None
+    return factory()
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+from app.core.config import settings
+
+
+class CatalogCache:
+    """
+    In-process TTL cache for public catalog pages, holding at most `max_entries`
+    (least recently used pages are evicted first).
+    Entries are keyed by the normalized query; the first key element is the
+    category filter so that writes can invalidate only the affected pages.
+
+    Invalidation only reaches the cache of the process that handled the write:
+    the other SERVER_WORKERS processes and pods, and every process when the chat
+    service sells an article at checkout, keep serving their cached pages until
+    they expire. CATALOG_CACHE_TTL_SECONDS bounds that staleness; a sold article
+    still listed cannot be bought twice, as checkout re-checks `is_sold`.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: tuple) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        for expired in [k for k, (expires_at, _) in self._entries.items() if expires_at < now]:
+            del self._entries[expired]
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, category_ids: Iterable[Hashable] | None = None) -> None:
+        """
+        Drop cached pages. With `category_ids`, only the pages filtered on one of
+        those categories are dropped, plus the unfiltered pages which list every category.
+        """
+        if category_ids is None:
+            self._entries.clear()
+            return
+        affected = set(category_ids) | {None}
+        for key in [k for k in self._entries if k[0] in affected]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+catalog_cache = CatalogCache(
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS, max_entries=settings.CATALOG_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,131 @@
+"""
+Live-listing counts per category, for the catalog facets.
+
+A listing is live while its article is approved and not sold. Every write
+that changes whether or where an article is listed (approval, sale, deletion,
+category change) adjusts the `category_counts` row of the category in the
+same transaction, with a relative `count = count + delta` upsert so concurrent
+writers neither lose updates nor race to create the row. Articles without a category are counted under
+UNCATEGORIZED; the overall count is the sum of all rows.
+
+`CategoryCountReconciler` recomputes the rows from `articles` at startup and
+every CATEGORY_COUNTS_RECONCILE_SECONDS, which repairs any drift (listings
+that predate the table, racing approvals of one article, manual SQL).
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+
+from prometheus_client import Counter
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Article, Category, CategoryCount
+
+logger = logging.getLogger(__name__)
+
+UNCATEGORIZED = 0
+
+CATEGORY_COUNT_CORRECTIONS = Counter("category_count_corrections_total", "Category count rows fixed by the reconciler")
+
+_LIVE = (Article.is_approved == True) & (Article.is_sold == False)
+_LIVE_KEY = func.coalesce(Article.category_id, UNCATEGORIZED)
+
+# INSERT ... ON CONFLICT, per dialect
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def is_listed(article: Article) -> bool:
+    return bool(article.is_approved) and not article.is_sold
+
+
+async def adjust_counts(db: AsyncSession, deltas: Mapping[int | None, int]) -> None:
+    """Add `deltas` (category id -> change in live listings) to the counts. The caller commits."""
+    for category_id, delta in deltas.items():
+        if not delta:
+            continue
+        key = category_id or UNCATEGORIZED
+        # The first listing of a category since the last reconciliation creates its row
+        upsert = _UPSERTS[db.bind.dialect.name](CategoryCount).values(category_id=key, count=max(delta, 0))
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[CategoryCount.category_id], set_={"count": CategoryCount.count + delta}
+            )
+        )
+
+
+async def reconcile_counts(db: AsyncSession) -> int:
+    """Recompute every count from `articles` and commit. Returns the number of rows fixed."""
+    live = (
+        select(func.count()).select_from(Article).where(_LIVE, _LIVE_KEY == CategoryCount.category_id).scalar_subquery()
+    )
+    # A single statement, so concurrent adjustments land either before or after it
+    fixed = await db.execute(
+        update(CategoryCount)
+        .where(CategoryCount.count != live)
+        .values(count=live)
+        .execution_options(synchronize_session=False)
+    )
+    missing = (
+        await db.execute(
+            select(_LIVE_KEY, func.count())
+            .where(_LIVE, _LIVE_KEY.not_in(select(CategoryCount.category_id)))
+            .group_by(_LIVE_KEY)
+        )
+    ).all()
+    # Empty categories get a row too, so their first listing is an update rather than a racing insert
+    empty = (
+        await db.scalars(
+            select(Category.id).where(
+                Category.id.not_in(select(CategoryCount.category_id)), Category.id.not_in([key for key, _ in missing])
+            )
+        )
+    ).all()
+    rows = [{"category_id": key, "count": count} for key, count in missing] + [
+        {"category_id": key, "count": 0} for key in empty
+    ]
+    if rows:
+        await db.execute(insert(CategoryCount), rows)
+    await db.commit()
+    return fixed.rowcount + len(missing)
+
+
+class CategoryCountReconciler:
+    def __init__(self, session_factory: Callable[[], AsyncSession], interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def reconcile_once(self) -> int:
+        try:
+            async with self.session_factory() as db:
+                fixed = await reconcile_counts(db)
+        except Exception:
+            logger.exception("Category count reconciliation failed")
+            return 0
+        if fixed:
+            logger.info("Reconciled %d category counts", fixed)
+            CATEGORY_COUNT_CORRECTIONS.inc(fixed)
+        return fixed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reconcile_once()
+
+    async def start(self) -> None:
+        """Reconcile once, so counts are right as soon as startup completes, then periodically."""
+        await self.reconcile_once()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="category-counts")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -2,6 +2,7 @@ import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import tracing
 from app.models.fraud_log import FraudLog
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,19 @@ async def check_price_change(
     Flags suspicious price changes (e.g., increase > 50%).
     Logs every check to the fraud_logs table.
     """
+    with tracing.span("fraud.check_price_change", **{"article.id": article_id, "seller.id": seller_id}):
+        result = await _check_price_change(article_id, old_price, new_price, seller_id, db)
+        tracing.set_attribute("fraud.suspicious", result["is_suspicious"])
+        return result
+
+
+async def _check_price_change(
+    article_id: int,
+    old_price: float,
+    new_price: float,
+    seller_id: int,
+    db: AsyncSession,
+) -> dict:
     is_suspicious = False
     reason = ""
     change_pct = 0.0
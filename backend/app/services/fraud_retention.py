@@ -0,0 +1,162 @@
+"""
+Fraud log retention.
+
+Every price change writes a `fraud_logs` row, and nearly all of them are OK
+checks nobody reviews. After FRAUD_LOG_OK_RETENTION_DAYS, OK rows are
+compacted into `fraud_log_daily` (checks and largest change per seller and
+day) and deleted. Resolved suspicious rows are deleted after
+FRAUD_LOG_RESOLVED_RETENTION_DAYS (0 keeps them); unresolved ones are kept
+until an admin resolves them.
+
+Both run in batches of FRAUD_LOG_RETENTION_BATCH_SIZE rows, one short
+transaction each, so no lock is held for long. Compaction locks its batch
+with SKIP LOCKED (Postgres), so workers running the job at the same time
+never aggregate a row twice. `FraudLogRetention` runs the job every
+FRAUD_LOG_RETENTION_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+
+from prometheus_client import Counter
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FraudLog, FraudLogDaily
+
+logger = logging.getLogger(__name__)
+
+FRAUD_LOGS_RETIRED = Counter("fraud_logs_retired_total", "Fraud log rows removed by retention", ["action"])
+
+# INSERT ... ON CONFLICT, per dialect
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def compact_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    """Fold one batch of OK rows older than `cutoff` into the daily aggregates, and commit."""
+    rows = (
+        await db.execute(
+            select(FraudLog.id, FraudLog.seller_id, FraudLog.created_at, FraudLog.change_pct)
+            .where(FraudLog.is_suspicious == False, FraudLog.created_at < cutoff)
+            .order_by(FraudLog.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not rows:
+        return 0
+    # (day, seller id) -> [checks, largest change]
+    days: dict[tuple[date, int], list] = defaultdict(lambda: [0, 0.0])
+    for _, seller_id, created_at, change_pct in rows:
+        day = days[created_at.date(), seller_id]
+        day[0] += 1
+        day[1] = max(day[1], change_pct)
+    # One upsert for the batch, so workers compacting the same seller and day add up
+    # instead of racing to create the row
+    upsert = _UPSERTS[db.bind.dialect.name](FraudLogDaily).values(
+        [
+            {"day": day, "seller_id": seller_id, "checks": checks, "max_change_pct": max_change_pct}
+            for (day, seller_id), (checks, max_change_pct) in days.items()
+        ]
+    )
+    await db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[FraudLogDaily.day, FraudLogDaily.seller_id],
+            set_={
+                "checks": FraudLogDaily.checks + upsert.excluded.checks,
+                "max_change_pct": case(
+                    (FraudLogDaily.max_change_pct < upsert.excluded.max_change_pct, upsert.excluded.max_change_pct),
+                    else_=FraudLogDaily.max_change_pct,
+                ),
+            },
+        )
+    )
+    await db.execute(
+        delete(FraudLog).where(FraudLog.id.in_([row.id for row in rows])).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return len(rows)
+
+
+async def purge_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    """Delete one batch of resolved suspicious rows older than `cutoff`, and commit."""
+    ids = (
+        await db.scalars(
+            select(FraudLog.id)
+            .where(FraudLog.is_suspicious == True, FraudLog.resolved == True, FraudLog.created_at < cutoff)
+            .order_by(FraudLog.id)
+            .limit(batch_size)
+        )
+    ).all()
+    if not ids:
+        return 0
+    await db.execute(delete(FraudLog).where(FraudLog.id.in_(ids)).execution_options(synchronize_session=False))
+    await db.commit()
+    return len(ids)
+
+
+class FraudLogRetention:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        ok_days: int,
+        resolved_days: int,
+        batch_size: int,
+        interval: float,
+    ):
+        self.session_factory = session_factory
+        self.ok_days = ok_days
+        self.resolved_days = resolved_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def _drain(self, action: str, batch: Callable, cutoff: datetime) -> int:
+        done = 0
+        try:
+            while True:
+                async with self.session_factory() as db:
+                    count = await batch(db, cutoff, self.batch_size)
+                done += count
+                FRAUD_LOGS_RETIRED.labels(action).inc(count)
+                if count < self.batch_size:
+                    break
+                # Let requests through between batches
+                await asyncio.sleep(0)
+        except Exception:
+            logger.exception("Fraud log %s failed", action)
+        return done
+
+    async def run_once(self) -> tuple[int, int]:
+        """Compact and purge everything due. Returns how many rows were compacted and purged."""
+        now = datetime.now(UTC)
+        compacted = await self._drain("compacted", compact_batch, now - timedelta(days=self.ok_days))
+        purged = 0
+        if self.resolved_days:
+            purged = await self._drain("purged", purge_batch, now - timedelta(days=self.resolved_days))
+        if compacted or purged:
+            logger.info("Fraud log retention: compacted %d rows, purged %d rows", compacted, purged)
+        return compacted, purged
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    async def start(self) -> None:
+        """Run periodically, starting one interval after startup."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="fraud-log-retention")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
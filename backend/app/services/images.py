@@ -0,0 +1,88 @@
+"""
+Article images.
+
+`Article.image_url` holds a JSON list of image references (a single bare
+string is still accepted for older rows). References point at the image
+endpoint, e.g. `/api/v1/images/<sha256>.jpg`; the blobs live in the blob store.
+Inline `data:` URLs sent by older clients are moved to the store on write.
+"""
+
+import base64
+import binascii
+import io
+import json
+
+from app.core.config import settings
+from app.services.blob_store import BlobStore
+from app.services.thumbnails import VARIANTS
+
+# Magic bytes -> (extension, media type). The client's declared type is not trusted.
+_SIGNATURES: list[tuple[bytes, str, str]] = [
+    (b"\xff\xd8\xff", "jpg", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png", "image/png"),
+    (b"GIF87a", "gif", "image/gif"),
+    (b"GIF89a", "gif", "image/gif"),
+]
+
+MEDIA_TYPES = {extension: media_type for _, extension, media_type in _SIGNATURES} | {"webp": "image/webp"}
+
+
+def sniff_extension(header: bytes) -> str | None:
+    """Extension of a supported image format from its first bytes, or None."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    for signature, extension, _ in _SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    return None
+
+
+def image_ref(key: str) -> str:
+    return f"{settings.API_V1_STR}/images/{key}"
+
+
+def variant_urls(ref: str) -> dict[str, str]:
+    """URLs of the resized variants of a stored image; external images have none."""
+    prefix = image_ref("")
+    if not ref.startswith(prefix):
+        return {}
+    return {name: f"{ref}/{name}" for name in VARIANTS}
+
+
+def parse_image_list(image_url: str | None) -> list[str]:
+    if not image_url:
+        return []
+    if image_url.startswith("["):
+        try:
+            return [str(entry) for entry in json.loads(image_url)]
+        except ValueError:
+            pass
+    return [image_url]
+
+
+def store_inline_image(data_url: str, store: BlobStore) -> str:
+    """Decode a base64 `data:` URL into the blob store and return its reference."""
+    header, _, payload = data_url.partition(",")
+    if not header.endswith(";base64"):
+        raise ValueError("Inline images must be base64 data URLs")
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except binascii.Error as e:
+        raise ValueError("Invalid base64 image data") from e
+    if len(data) > settings.IMAGE_MAX_BYTES:
+        raise ValueError(f"Image exceeds {settings.IMAGE_MAX_BYTES} bytes")
+    extension = sniff_extension(data[:16])
+    if extension is None:
+        raise ValueError("Unsupported image format")
+    return image_ref(store.put(io.BytesIO(data), extension))
+
+
+def externalize_images(image_url: str | None, store: BlobStore) -> str | None:
+    """
+    Replace inline data URLs in an `image_url` value with blob store references.
+    Returns the value unchanged when it holds no inline images. Blocking — run it off the event loop.
+    """
+    images = parse_image_list(image_url)
+    if not any(image.startswith("data:") for image in images):
+        return image_url
+    return json.dumps([store_inline_image(image, store) if image.startswith("data:") else image for image in images])
@@ -0,0 +1,93 @@
+"""
+Token-bucket rate limiting.
+
+A limit like "10/minute" is a bucket of 10 tokens refilled at 10 per minute:
+short bursts up to the bucket size pass, sustained traffic is capped at the
+rate. Each request takes one token from the bucket of its key (client IP or
+user, see `deps.rate_limit`); an empty bucket means 429 with Retry-After.
+
+The in-memory backend is the default and keeps buckets per worker process,
+so the effective limit is multiplied by workers x replicas. A shared backend
+(e.g. Redis) implements `RateLimitBackend`, is registered with
+`register_backend`, and is selected with the RATE_LIMIT_BACKEND setting.
+"""
+
+import re
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from prometheus_client import Counter
+
+from app.core.config import settings
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_requests_total", "Requests checked against a rate limit", ["limit", "outcome"]
+)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+
+
+@dataclass(frozen=True)
+class Limit:
+    # Tokens added per second
+    rate: float
+    # Bucket size, i.e. the largest burst allowed
+    burst: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        """Parse "<count>/<second|minute|hour|day>", e.g. "10/minute"."""
+        match = _SPEC.match(spec)
+        if not match or int(match[1]) < 1:
+            raise ValueError(f"Invalid rate limit: {spec!r}")
+        count = int(match[1])
+        return cls(rate=count / _PERIODS[match[2]], burst=count)
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def hit(self, key: str, limit: Limit) -> float:
+        """Take a token from `key`'s bucket. Returns 0 if allowed, else seconds until a token is available."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Buckets in a dict kept in least-recently-used order, capped at `max_keys`."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, last update on the monotonic clock)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def hit(self, key: str, limit: Limit) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        if len(self._buckets) > self.max_keys:
+            # Least recently used first; an idle bucket is as good as full anyway
+            del self._buckets[next(iter(self._buckets))]
+        return 0.0 if allowed else (1 - tokens) / limit.rate
+
+
+_BACKENDS: dict[str, Callable[[], RateLimitBackend]] = {
+    "memory": InMemoryRateLimitBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], RateLimitBackend]) -> None:
+    _BACKENDS[name] = factory
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimitBackend:
+    """The configured rate limit backend. Also usable as a FastAPI dependency."""
+    try:
+        factory = _BACKENDS[settings.RATE_LIMIT_BACKEND]
+    except KeyError:
+        raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND!r}") from None
+    return factory()
@@ -0,0 +1,38 @@
+"""
+In-process request coalescing ("single flight").
+
+Concurrent callers asking for the same key share one execution: the first
+caller runs the work and the others await its result (or its exception).
+The key is forgotten as soon as the work finishes, so this never serves
+stale data; it only collapses bursts of identical work. Results are shared
+between callers, so they must not be mutated (e.g. rendered bytes).
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from prometheus_client import Counter
+
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "single_flight_requests_total", "Calls through a single-flight group", ["group", "outcome"]
+)
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn`, or wait for the identical call already in flight for `key`."""
+        task = self._flights.get(key)
+        if task is None:
+            SINGLE_FLIGHT_REQUESTS.labels(self.name, "executed").inc()
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            SINGLE_FLIGHT_REQUESTS.labels(self.name, "coalesced").inc()
+        # A caller going away (e.g. client disconnect) must not cancel the work for the others
+        return await asyncio.shield(task)
@@ -0,0 +1,105 @@
+"""
+Derived image variants (thumbnails) for stored article images.
+
+Variants are WebP renditions at fixed sizes, rendered in a dedicated thread
+pool so resizing never blocks the event loop. They are generated eagerly right
+after an upload and lazily on first request otherwise (e.g. images migrated
+from inline data). A variant's key is derived from the original key and the
+variant spec, so it is stable and can be cached as immutably as the original.
+An original that cannot be rendered gets an empty marker blob in place of the
+variant, so it is not decoded again on every request.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.services.blob_store import BlobStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Variant:
+    width: int
+    height: int
+    # Crop to fill the box (grid tiles) rather than fit inside it
+    crop: bool = False
+
+
+VARIANTS: dict[str, Variant] = {
+    "thumb": Variant(320, 320, crop=True),
+    "medium": Variant(800, 800),
+}
+
+_pool = ThreadPoolExecutor(max_workers=settings.THUMBNAIL_WORKERS, thread_name_prefix="thumbnails")
+_background: set[asyncio.Task] = set()
+
+
+def variant_key(key: str, name: str) -> str:
+    spec = VARIANTS[name]
+    source = f"{key}:{name}:{spec.width}x{spec.height}:{spec.crop}:{settings.THUMBNAIL_QUALITY}"
+    return f"{hashlib.sha256(source.encode()).hexdigest()}.webp"
+
+
+def _failure_key(target: str) -> str:
+    """Key of the marker stored when the variant `target` cannot be rendered."""
+    return f"{target.rpartition('.')[0]}.fail"
+
+
+def render(data: bytes, spec: Variant) -> bytes:
+    # Pillow is only needed once images are uploaded or resized; importing it lazily keeps it off the startup path
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        size = (spec.width, spec.height)
+        if spec.crop:
+            image = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+        else:
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "WEBP", quality=settings.THUMBNAIL_QUALITY, method=4)
+        return out.getvalue()
+
+
+def _generate(store: BlobStore, key: str, name: str) -> str | None:
+    from PIL import Image
+
+    target = variant_key(key, name)
+    if store.exists(target):
+        return target
+    data = store.read(key)
+    if data is None:
+        return None
+    try:
+        store.put_at(target, render(data, VARIANTS[name]))
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning("Could not render %s variant of %s: %s", name, key, e)
+        # Same original, same failure: remember it
+        store.put_at(_failure_key(target), b"")
+        return None
+    return target
+
+
+async def ensure_variant(store: BlobStore, key: str, name: str) -> str | None:
+    """Key of the variant, rendering it first if needed; None if the original cannot be rendered."""
+    target = variant_key(key, name)
+    if await asyncio.to_thread(store.exists, target):
+        return target
+    if await asyncio.to_thread(store.exists, _failure_key(target)):
+        return None
+    return await asyncio.get_running_loop().run_in_executor(_pool, _generate, store, key, name)
+
+
+def schedule_variants(store: BlobStore, key: str) -> None:
+    """Render every variant of a fresh upload in the background."""
+    for name in VARIANTS:
+        task = asyncio.create_task(ensure_variant(store, key, name))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
@@ -0,0 +1,414 @@
+"""
+Synthetic data generator for load and performance testing.
+
+Unlike `seed.py`, rows are generated in batches and bulk-loaded: COPY on
+Postgres (asyncpg) and executemany everywhere else (e.g. the SQLite test engine).
+Passwords are hashed once and shared by every generated user.
+
+Usage:
+    python scripts/generate_data.py --users 20000 --articles 1000000 \\
+        --conversations 200000 --messages 2000000 --fraud-logs 500000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from bisect import bisect
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from itertools import accumulate
+
+# Add the backend directory to the sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, case, func, select, text, update  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine  # noqa: E402
+
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.session import Base  # noqa: E402
+from app.models import Article, Category, Conversation, FraudLog, Message, User  # noqa: E402
+
+DEFAULT_PASSWORD = "password123"
+
+_ADJECTIVES = ["Vintage", "Rare", "Limited", "Signed", "Original", "Mint", "Boxed", "Retro", "Antique", "Collector"]
+_NOUNS = ["Watch", "Poster", "Figurine", "Vinyl", "Camera", "Sneakers", "Comic", "Coin", "Stamp", "Console", "Lamp"]
+_WORDS = ["great", "condition", "shipping", "original", "box", "price", "still", "available", "thanks", "photo"]
+
+
+@dataclass
+class Volumes:
+    users: int = 1_000
+    categories: int = 12
+    articles: int = 10_000
+    conversations: int = 2_000
+    messages: int = 20_000
+    fraud_logs: int = 5_000
+
+    def __post_init__(self):
+        # Articles, conversations and fraud logs reference users and articles, messages conversations
+        if self.users < 1 or self.articles < 1:
+            raise ValueError("users and articles must be at least 1")
+        if self.messages and self.conversations < 1:
+            raise ValueError("messages need at least 1 conversation")
+        if min(self.categories, self.conversations, self.messages, self.fraud_logs) < 0:
+            raise ValueError("volumes cannot be negative")
+
+
+class _Zipf:
+    """Draw indexes in [0, n) with a Zipf-like long tail: low indexes are the popular ones."""
+
+    def __init__(self, rng: random.Random, n: int, s: float = 1.0):
+        self.rng = rng
+        self.cum_weights = list(accumulate(1 / (i + 1) ** s for i in range(max(n, 1))))
+
+    def __call__(self) -> int:
+        return bisect(self.cum_weights, self.rng.random() * self.cum_weights[-1])
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=words)).capitalize()
+
+
+class _Loader:
+    """Bulk-load tuples into a table using the fastest path the dialect offers."""
+
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+        self.is_postgres = conn.dialect.name == "postgresql"
+
+    async def load(self, table, columns: list[str], rows: list[tuple]) -> None:
+        if not rows:
+            return
+        if self.is_postgres:
+            raw = await self.conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(table.name, records=rows, columns=columns)
+        else:
+            await self.conn.execute(table.insert(), [dict(zip(columns, row, strict=True)) for row in rows])
+
+    async def next_id(self, table) -> int:
+        return (await self.conn.scalar(select(func.coalesce(func.max(table.c.id), 0)))) + 1
+
+    async def reset_sequence(self, table) -> None:
+        # COPY with explicit ids does not advance the serial sequence
+        if self.is_postgres:
+            name = table.name  # trusted: comes from the ORM metadata
+            await self.conn.execute(
+                text(f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), (SELECT MAX(id) FROM {name}))")  # noqa: S608
+            )
+
+
+async def _update_inbox_state(conn: AsyncConnection, first_conversation_id: int) -> None:
+    """
+    Set the inbox columns of the generated conversations from their messages: latest
+    activity, and unread counts as if each participant had read the conversation when
+    they last wrote in it (replying reads it, see the chat service's read state).
+    Set-based, so it needs no index on messages.conversation_id.
+    """
+    conversations, messages = Conversation.__table__, Message.__table__
+    c, m = conversations.alias("c"), messages.alias("m")
+    activity = (
+        select(
+            m.c.conversation_id,
+            func.max(m.c.created_at).label("last_at"),
+            func.max(case((m.c.sender_id == c.c.buyer_id, m.c.created_at))).label("buyer_at"),
+            func.max(case((m.c.sender_id == c.c.seller_id, m.c.created_at))).label("seller_at"),
+        )
+        .join(c, c.c.id == m.c.conversation_id)
+        .where(c.c.id >= first_conversation_id)
+        .group_by(m.c.conversation_id)
+        .cte("activity")
+    )
+
+    def unread(reader_at, writer_id):
+        # The other side's messages since the reader last wrote (or since the conversation started)
+        after = and_(m.c.sender_id == writer_id, m.c.created_at > func.coalesce(reader_at, c.c.created_at))
+        return func.sum(case((after, 1), else_=0))
+
+    state = (
+        select(
+            activity.c.conversation_id,
+            activity.c.last_at,
+            unread(activity.c.buyer_at, c.c.seller_id).label("buyer_unread"),
+            unread(activity.c.seller_at, c.c.buyer_id).label("seller_unread"),
+        )
+        .join(m, m.c.conversation_id == activity.c.conversation_id)
+        .join(c, c.c.id == activity.c.conversation_id)
+        .group_by(activity.c.conversation_id, activity.c.last_at)
+        .subquery()
+    )
+    await conn.execute(
+        update(conversations)
+        .where(conversations.c.id == state.c.conversation_id)
+        .values(last_message_at=state.c.last_at, buyer_unread=state.c.buyer_unread, seller_unread=state.c.seller_unread)
+    )
+
+
+def _batched(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def generate(
+    engine: AsyncEngine,
+    volumes: Volumes,
+    seed: int = 42,
+    batch_size: int = 5_000,
+    password_hash: str | None = None,
+    verbose: bool = False,
+) -> dict[str, int]:
+    """
+    Generate and load synthetic data. Rows are appended to whatever already
+    exists, so the generator can be run several times to grow a dataset.
+    Returns the number of rows inserted per table.
+    """
+    rng = random.Random(seed)  # noqa: S311 — synthetic data, not security sensitive
+    hashed_password = password_hash or get_password_hash(DEFAULT_PASSWORD)
+    now = datetime.now(UTC).replace(tzinfo=None)
+    inserted: dict[str, int] = {}
+
+    def log(msg: str) -> None:
+        if verbose:
+            print(msg)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def load_table(model, columns: list[str], rows: Iterator[tuple], name: str) -> None:
+        start = time.perf_counter()
+        count = 0
+        async with engine.begin() as conn:
+            loader = _Loader(conn)
+            for batch in _batched(rows, batch_size):
+                await loader.load(model.__table__, columns, batch)
+                count += len(batch)
+            await loader.reset_sequence(model.__table__)
+        inserted[name] = count
+        log(f"  - {count} {name} in {time.perf_counter() - start:.1f}s")
+
+    async with engine.connect() as conn:
+        loader = _Loader(conn)
+        first_user_id = await loader.next_id(User.__table__)
+        first_article_id = await loader.next_id(Article.__table__)
+        first_conversation_id = await loader.next_id(Conversation.__table__)
+        next_message_id = await loader.next_id(Message.__table__)
+        next_fraud_log_id = await loader.next_id(FraudLog.__table__)
+        category_ids = list((await conn.scalars(select(Category.id).order_by(Category.id))).all())
+        next_category_id = await loader.next_id(Category.__table__)
+
+    # ─── Categories ───
+    missing = max(volumes.categories - len(category_ids), 0)
+    new_category_ids = list(range(next_category_id, next_category_id + missing))
+    await load_table(
+        Category,
+        ["id", "name", "description"],
+        ((cid, f"Load test category {cid}", "Generated category") for cid in new_category_ids),
+        "categories",
+    )
+    category_ids += new_category_ids
+
+    # ─── Users: ~1% admins, ~20% sellers, the rest buyers ───
+    user_ids = range(first_user_id, first_user_id + volumes.users)
+    roles = {uid: rng.choices(["buyer", "seller", "admin"], weights=[79, 20, 1])[0] for uid in user_ids}
+    sellers = [uid for uid, role in roles.items() if role in ("seller", "admin")] or [first_user_id]
+    buyers = [uid for uid, role in roles.items() if role == "buyer"] or [first_user_id]
+    rng.shuffle(sellers)
+    await load_table(
+        User,
+        ["id", "email", "full_name", "hashed_password", "role", "is_active"],
+        (
+            (uid, f"user{uid}@loadtest.celianhamon.fr", f"User {uid}", hashed_password, roles[uid], True)
+            for uid in user_ids
+        ),
+        "users",
+    )
+
+    # ─── Articles: long-tail sellers and categories, log-normal prices ───
+    article_ids = range(first_article_id, first_article_id + volumes.articles)
+    article_sellers: dict[int, int] = {}
+
+    pick_seller = _Zipf(rng, len(sellers))
+    pick_category = _Zipf(rng, len(category_ids))
+
+    def article_rows() -> Iterator[tuple]:
+        for aid in article_ids:
+            seller_id = sellers[pick_seller()]
+            article_sellers[aid] = seller_id
+            price = round(min(rng.lognormvariate(4.0, 1.0), 50_000), 2)
+            yield (
+                aid,
+                f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)} #{aid}",
+                _sentence(rng, rng.randint(5, 30)),
+                price,
+                round(rng.choice([0.0, 4.99, 8.0, 12.5, 25.0]), 2),
+                None,
+                rng.random() < 0.9,
+                rng.random() < 0.15,
+                category_ids[pick_category()] if category_ids else None,
+                seller_id,
+            )
+
+    await load_table(
+        Article,
+        [
+            "id",
+            "title",
+            "description",
+            "price",
+            "shipping_cost",
+            "image_url",
+            "is_approved",
+            "is_sold",
+            "category_id",
+            "seller_id",
+        ],
+        article_rows(),
+        "articles",
+    )
+
+    # ─── Conversations: popular articles attract most buyers ───
+    conversation_ids = range(first_conversation_id, first_conversation_id + volumes.conversations)
+    conversations: list[tuple[int, int, int, datetime]] = []
+
+    pick_article = _Zipf(rng, volumes.articles, s=0.8)
+
+    def conversation_rows() -> Iterator[tuple]:
+        for cid in conversation_ids:
+            article_id = first_article_id + pick_article()
+            seller_id = article_sellers.get(article_id, sellers[0])
+            created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+            conversations.append((cid, rng.choice(buyers), seller_id, created_at))
+            # Latest activity until messages are loaded (see _update_inbox_state)
+            yield (cid, article_id, conversations[-1][1], seller_id, created_at, created_at)
+
+    if volumes.articles:
+        await load_table(
+            Conversation,
+            ["id", "article_id", "buyer_id", "seller_id", "created_at", "last_message_at"],
+            conversation_rows(),
+            "conversations",
+        )
+
+    # ─── Messages: a few very active conversations, most with a handful of messages ───
+    def message_rows() -> Iterator[tuple]:
+        pick_conversation = _Zipf(rng, len(conversations), s=0.7)
+        for offset in range(volumes.messages):
+            cid, buyer_id, seller_id, created_at = conversations[pick_conversation()]
+            sender_id = buyer_id if rng.random() < 0.55 else seller_id
+            yield (
+                next_message_id + offset,
+                cid,
+                sender_id,
+                _sentence(rng, rng.randint(2, 25)),
+                None,
+                min(created_at + timedelta(seconds=rng.randint(0, 60 * 60 * 24 * 30)), now),
+            )
+
+    if conversations:
+        await load_table(
+            Message,
+            ["id", "conversation_id", "sender_id", "content", "file_url", "created_at"],
+            message_rows(),
+            "messages",
+        )
+        async with engine.begin() as conn:
+            await _update_inbox_state(conn, first_conversation_id)
+
+    # ─── Fraud logs: ~3% suspicious, the rest small "OK" changes ───
+    def fraud_log_rows() -> Iterator[tuple]:
+        for offset in range(volumes.fraud_logs):
+            article_id = first_article_id + rng.randrange(max(volumes.articles, 1))
+            old_price = round(rng.lognormvariate(4.0, 1.0), 2)
+            suspicious = rng.random() < 0.03
+            change = rng.uniform(0.51, 3.0) if suspicious else rng.uniform(-0.5, 0.5)
+            new_price = round(max(old_price * (1 + change), 0.01), 2)
+            change_pct = round(abs(new_price - old_price) / old_price * 100, 2)
+            reason = f"Price changed by {change_pct:.1f}% (from {old_price} to {new_price})" if suspicious else "OK"
+            yield (
+                next_fraud_log_id + offset,
+                article_id,
+                article_sellers.get(article_id, sellers[0]),
+                old_price,
+                new_price,
+                change_pct,
+                reason,
+                suspicious,
+                suspicious and rng.random() < 0.5,
+                (now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))).replace(tzinfo=UTC),
+            )
+
+    await load_table(
+        FraudLog,
+        [
+            "id",
+            "article_id",
+            "seller_id",
+            "old_price",
+            "new_price",
+            "change_pct",
+            "reason",
+            "is_suspicious",
+            "resolved",
+            "created_at",
+        ],
+        fraud_log_rows(),
+        "fraud_logs",
+    )
+
+    return inserted
+
+
+def main() -> None:
+    defaults = Volumes()
+    parser = argparse.ArgumentParser(description="Generate synthetic data for load testing.")
+    parser.add_argument("--database-url", help="Defaults to the application's configured database.")
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--categories", type=int, default=defaults.categories)
+    parser.add_argument("--articles", type=int, default=defaults.articles)
+    parser.add_argument("--conversations", type=int, default=defaults.conversations)
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--fraud-logs", type=int, default=defaults.fraud_logs)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        volumes = Volumes(
+            users=args.users,
+            categories=args.categories,
+            articles=args.articles,
+            conversations=args.conversations,
+            messages=args.messages,
+            fraud_logs=args.fraud_logs,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.database_url:
+        engine = create_async_engine(args.database_url)
+    else:
+        from app.core.config import settings
+
+        engine = create_async_engine(settings.database_url)
+
+    async def run() -> None:
+        start = time.perf_counter()
+        print("Generating synthetic data...")
+        await generate(engine, volumes, seed=args.seed, batch_size=args.batch_size, verbose=True)
+        await engine.dispose()
+        print(f"Done in {time.perf_counter() - start:.1f}s (password for every user: {DEFAULT_PASSWORD})")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Move inline base64 images out of `articles.image_url` into the blob store.
+
+Older clients stored every photo as a data URL inside the JSON list in
+`image_url`. This rewrites those entries into blob store references, in
+id-ordered batches so it can run against a live database and be resumed.
+Entries that cannot be decoded are left in place and counted as failures.
+With --dry-run nothing is written: blob keys are computed but not stored.
+
+Usage:
+    python scripts/migrate_inline_images.py [--dry-run] [--batch-size 200]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+
+# Add the backend directory to the sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_, select, update  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine  # noqa: E402
+
+from app.models import Article  # noqa: E402
+from app.services.blob_store import BlobStore, get_blob_store  # noqa: E402
+from app.services.images import externalize_images, parse_image_list  # noqa: E402
+
+
+class DryRunBlobStore(BlobStore):
+    """Computes the content keys blobs would get, without storing anything."""
+
+    def put(self, source, extension: str) -> str:
+        digest = hashlib.sha256()
+        while chunk := source.read(1024 * 1024):
+            digest.update(chunk)
+        return f"{digest.hexdigest()}.{extension}"
+
+    def put_at(self, key: str, data: bytes) -> None:
+        pass
+
+    def read(self, key: str) -> bytes | None:
+        return None
+
+    def exists(self, key: str) -> bool:
+        return False
+
+
+async def migrate(
+    engine: AsyncEngine,
+    store: BlobStore,
+    batch_size: int = 200,
+    dry_run: bool = False,
+    verbose: bool = False,
+) -> dict[str, int]:
+    """Externalize inline images of every article; returns migration counters."""
+    if dry_run:
+        store = DryRunBlobStore()
+    stats = {"articles": 0, "images": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    has_inline = or_(Article.image_url.like("data:%"), Article.image_url.like('%"data:%'))
+    last_id = 0
+    while True:
+        async with engine.begin() as conn:
+            rows = (
+                await conn.execute(
+                    select(Article.id, Article.image_url)
+                    .where(Article.id > last_id, has_inline)
+                    .order_by(Article.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            for row in rows:
+                try:
+                    new_value = await asyncio.to_thread(externalize_images, row.image_url, store)
+                except ValueError as e:
+                    stats["failed"] += 1
+                    if verbose:
+                        print(f"  article {row.id}: skipped ({e})")
+                    continue
+                stats["articles"] += 1
+                stats["images"] += sum(image.startswith("data:") for image in parse_image_list(row.image_url))
+                stats["bytes_before"] += len(row.image_url)
+                stats["bytes_after"] += len(new_value)
+                if not dry_run:
+                    await conn.execute(update(Article).where(Article.id == row.id).values(image_url=new_value))
+
+        if verbose:
+            print(f"  up to article {last_id}: {stats['articles']} migrated, {stats['failed']} failed")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move inline article images into the blob store.")
+    parser.add_argument("--database-url", help="Defaults to the application's configured database.")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--dry-run", action="store_true", help="Report only: store no blobs, change no rows.")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_async_engine(args.database_url)
+    else:
+        from app.core.config import settings
+
+        engine = create_async_engine(settings.database_url)
+
+    async def run() -> None:
+        start = time.perf_counter()
+        print("Migrating inline images...")
+        stats = await migrate(engine, get_blob_store(), batch_size=args.batch_size, dry_run=args.dry_run, verbose=True)
+        await engine.dispose()
+        saved_mb = (stats["bytes_before"] - stats["bytes_after"]) / 1024 / 1024
+        print(
+            f"Done in {time.perf_counter() - start:.1f}s: {stats['images']} images from {stats['articles']} articles "
+            f"({saved_mb:.1f} MB moved out of the table), {stats['failed']} articles skipped"
+        )
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
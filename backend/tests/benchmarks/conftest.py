@@ -0,0 +1,68 @@
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import Base
+from app.main import app
+from app.models import Article, User
+from app.services.catalog_cache import catalog_cache
+from scripts.generate_data import DEFAULT_PASSWORD, Volumes, generate
+from tests.conftest import engine
+
+
+@pytest.fixture(autouse=True)
+async def _reset_db():
+    """Benchmarks reuse the module-wide seeded database instead of a fresh one per test."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _no_rate_limits(monkeypatch):
+    """Benchmarks hammer single endpoints from one client; measure them, not their rate limits."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_db(pytestconfig) -> dict:
+    """
+    Seed the test engine with a synthetic dataset once per module.
+    Returns a few well-known ids for the benchmarks to target.
+    """
+    scale = pytestconfig.getoption("--benchmark-scale")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await generate(
+        engine,
+        Volumes(
+            users=int(500 * scale),
+            articles=int(5_000 * scale),
+            conversations=int(500 * scale),
+            messages=int(5_000 * scale),
+            fraud_logs=int(2_000 * scale),
+        ),
+    )
+    async with engine.connect() as conn:
+        seller = (await conn.execute(select(User).where(User.role == "seller").limit(1))).first()
+        article_id = await conn.scalar(
+            select(Article.id).where(Article.seller_id == seller.id, Article.is_approved == True).limit(1)
+        )
+    catalog_cache.clear()
+    yield {
+        "seller_email": seller.email,
+        "seller_password": DEFAULT_PASSWORD,
+        "seller_headers": {"Authorization": f"Bearer {create_access_token(seller.id)}"},
+        "article_id": article_id,
+    }
+    catalog_cache.clear()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture()
+async def api_client():
+    """In-process client going through the full ASGI stack (middleware included)."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
@@ -0,0 +1,81 @@
+"""
+Benchmarks for the backend hot paths, driven in-process against a seeded database.
+
+Run with: pytest tests/benchmarks --benchmark [--benchmark-json out.json] [--benchmark-compare baseline.json]
+"""
+
+import pytest
+
+from app.services.catalog_cache import catalog_cache
+
+pytestmark = pytest.mark.benchmark
+
+
+async def test_list_articles_uncached(bench, seeded_db, api_client):
+    async def call():
+        r = await api_client.get("/api/v1/articles/?limit=100")
+        assert r.status_code == 200
+
+    await bench("list_articles[uncached]", call, setup=catalog_cache.clear)
+
+
+@pytest.mark.parametrize("query", ["fields=full", "fields=summary", "fields=summary&expand=seller"])
+async def test_list_articles_projection(bench, seeded_db, api_client, query):
+    """Full vs summary catalog pages: latency and response size."""
+    url = f"/api/v1/articles/?limit=100&{query}"
+    sizes = []
+
+    async def call():
+        r = await api_client.get(url)
+        assert r.status_code == 200
+        sizes.append(len(r.content))
+
+    stats = await bench(f"list_articles[{query}]", call, setup=catalog_cache.clear)
+    stats.response_bytes = sizes[-1]
+
+
+async def test_list_articles_cached(bench, seeded_db, api_client):
+    async def call():
+        r = await api_client.get("/api/v1/articles/?limit=100")
+        assert r.status_code == 200
+
+    await bench("list_articles[cached]", call)
+
+
+async def test_list_articles_search(bench, seeded_db, api_client):
+    async def call():
+        r = await api_client.get("/api/v1/articles/?search=vintage&limit=20")
+        assert r.status_code == 200
+
+    await bench("list_articles[search]", call, setup=catalog_cache.clear)
+
+
+async def test_get_article(bench, seeded_db, api_client):
+    async def call():
+        r = await api_client.get(f"/api/v1/articles/{seeded_db['article_id']}")
+        assert r.status_code == 200
+
+    await bench("get_article", call)
+
+
+async def test_login(bench, seeded_db, api_client, pytestconfig):
+    form = {"username": seeded_db["seller_email"], "password": seeded_db["seller_password"]}
+
+    async def call():
+        r = await api_client.post("/api/v1/auth/login/access-token", data=form)
+        assert r.status_code == 200
+
+    # bcrypt dominates this path, keep the round count reasonable
+    await bench("login", call, rounds=max(pytestconfig.getoption("--benchmark-rounds") // 10, 5), warmup=1)
+
+
+async def test_update_article_price(bench, seeded_db, api_client):
+    url = f"/api/v1/articles/{seeded_db['article_id']}/price"
+    prices = iter([100.0, 110.0] * 10_000)
+
+    async def call():
+        # Alternating prices stay under the fraud threshold but still log a fraud check
+        r = await api_client.put(url, headers=seeded_db["seller_headers"], json={"price": next(prices)})
+        assert r.status_code == 200
+
+    await bench("update_article_price", call)
@@ -0,0 +1,56 @@
+"""
+Bytes on the wire and CPU cost of response compression.
+
+The endpoint benchmarks fetch a cached 100-article page (so the time is mostly
+compression) with each Accept-Encoding; the bytes column is what went over
+the wire. The level benchmarks compress that same page body on its own, to
+pick COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY.
+
+Run with: pytest tests/benchmarks/test_compression.py --benchmark
+"""
+
+import zlib
+
+import brotli
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+URL = "/api/v1/articles/?limit=100"
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip", "br"])
+async def test_list_articles_encoding(bench, seeded_db, api_client, encoding):
+    headers = {"Accept-Encoding": encoding}
+    sizes = []
+
+    async def call():
+        r = await api_client.get(URL, headers=headers)
+        assert r.status_code == 200
+        sizes.append(r.num_bytes_downloaded)
+
+    stats = await bench(f"list_articles[cached,{encoding}]", call)
+    stats.response_bytes = sizes[-1]
+
+
+@pytest.mark.parametrize(
+    ("name", "compress"),
+    [
+        ("gzip-1", lambda data: zlib.compress(data, 1, wbits=31)),
+        ("gzip-6", lambda data: zlib.compress(data, 6, wbits=31)),
+        ("gzip-9", lambda data: zlib.compress(data, 9, wbits=31)),
+        ("br-1", lambda data: brotli.compress(data, quality=1)),
+        ("br-4", lambda data: brotli.compress(data, quality=4)),
+        ("br-6", lambda data: brotli.compress(data, quality=6)),
+        ("br-11", lambda data: brotli.compress(data, quality=11)),
+    ],
+)
+async def test_compression_level(bench, seeded_db, api_client, name, compress):
+    body = (await api_client.get(URL, headers={"Accept-Encoding": "identity"})).content
+
+    async def call():
+        compress(body)
+
+    # Maximum brotli quality takes over 100ms per page
+    stats = await bench(f"compress_page[{name}]", call, rounds=20 if name == "br-11" else None)
+    stats.response_bytes = len(compress(body))
@@ -0,0 +1,65 @@
+"""
+Serialization cost of an article page, per page size, without the database.
+
+- jsonable_encoder: `jsonable_encoder` + `json.dumps`, FastAPI's path for
+  responses without a pydantic fast path (older FastAPI versions, custom response classes)
+- response_model: validating the page against the endpoint's `response_model`, then `dump_json`,
+  FastAPI's path when the endpoint returns a model
+- pydantic_response: `PydanticJSONResponse`, what the list endpoints return
+
+Run with: pytest tests/benchmarks/test_serialization.py --benchmark
+"""
+
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app import models, schemas
+from app.core.responses import PydanticJSONResponse
+
+pytestmark = pytest.mark.benchmark
+
+IMAGE_REF = f'["/api/v1/images/{"ab" * 32}.jpg"]'
+LIST_RESPONSE_MODEL = TypeAdapter(schemas.PaginatedArticles | schemas.PaginatedArticleSummaries)
+
+STRATEGIES = {
+    "jsonable_encoder": lambda page: json.dumps(jsonable_encoder(page)).encode(),
+    "response_model": lambda page: LIST_RESPONSE_MODEL.dump_json(LIST_RESPONSE_MODEL.validate_python(page)),
+    "pydantic_response": lambda page: PydanticJSONResponse(page).body,
+}
+
+
+def _page(size: int) -> schemas.PaginatedArticles:
+    articles = [
+        models.Article(
+            id=i,
+            title=f"Vintage poster #{i}",
+            description="Original print in very good condition. " * 10,
+            price=75.0 + i,
+            shipping_cost=5.0,
+            category_id=1 + i % 10,
+            seller_id=1 + i % 50,
+            is_approved=True,
+            is_sold=False,
+            image_url=IMAGE_REF,
+        )
+        for i in range(size)
+    ]
+    return schemas.PaginatedArticles.model_validate({"items": articles, "total": 10_000}, from_attributes=True)
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+@pytest.mark.parametrize("size", [10, 100, 500])
+async def test_serialize_article_page(bench, size, strategy):
+    page = _page(size)
+    serialize = STRATEGIES[strategy]
+    expected = json.loads(STRATEGIES["jsonable_encoder"](page))
+    assert json.loads(serialize(page)) == expected
+
+    async def call():
+        serialize(page)
+
+    stats = await bench(f"serialize_articles[{strategy},n={size}]", call)
+    stats.response_bytes = len(serialize(page))
@@ -0,0 +1,133 @@
+"""
+Throughput of `list_articles` served by `python -m app.serve` with 1, 2 and 4 workers.
+
+Unlike the in-process benchmarks, this starts real servers on a file-backed
+SQLite copy of the seeded dataset and drives them over HTTP with concurrent
+clients for a fixed duration. ops/s is the measured requests per second; the
+latency columns are per request. The catalog cache is disabled so every
+request renders the page. Results depend on the cores available to the run.
+
+Run with: pytest tests/benchmarks/test_workers.py --benchmark
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from benchmarking.harness import BenchmarkStats
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from scripts.generate_data import Volumes, generate
+
+pytestmark = pytest.mark.benchmark
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+CONCURRENCY = 32
+DURATION_SECONDS = 5.0
+URL = "/api/v1/articles/?limit=100"
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def database_url(tmp_path_factory, pytestconfig) -> str:
+    scale = pytestconfig.getoption("--benchmark-scale")
+    url = f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('workers') / 'bench.db'}"
+    engine = create_async_engine(url)
+    await generate(
+        engine,
+        Volumes(
+            users=int(500 * scale),
+            articles=int(5_000 * scale),
+            conversations=0,
+            messages=0,
+            fraud_logs=0,
+        ),
+    )
+    await engine.dispose()
+    return url
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def _server(database_url: str, workers: int, tmp_path: Path):
+    port = _free_port()
+    env = os.environ | {
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": str(workers),
+        "CATALOG_CACHE_TTL_SECONDS": "0",
+        "PROMETHEUS_MULTIPROC_DIR": str(tmp_path / "metrics"),
+        "BLOB_STORE_PATH": str(tmp_path / "blobs"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    pytest.fail("server did not become ready")
+
+
+async def _load(client: httpx.AsyncClient, duration: float) -> tuple[list[float], float]:
+    """Keep CONCURRENCY requests in flight for `duration`; returns (latencies, elapsed)."""
+    samples: list[float] = []
+    start = time.perf_counter()
+    stop_at = start + duration
+
+    async def user() -> None:
+        while time.perf_counter() < stop_at:
+            sent = time.perf_counter()
+            r = await client.get(URL)
+            assert r.status_code == 200
+            samples.append(time.perf_counter() - sent)
+
+    await asyncio.gather(*(user() for _ in range(CONCURRENCY)))
+    return samples, time.perf_counter() - start
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+async def test_list_articles_workers(benchmark_session, database_url, tmp_path, workers):
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    with _server(database_url, workers, tmp_path) as base_url:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            await _wait_ready(client)
+            # Let every worker open its connections and warm up
+            await _load(client, 1.0)
+            samples, elapsed = await _load(client, DURATION_SECONDS)
+
+    stats = BenchmarkStats.from_samples(f"list_articles[workers={workers}]", samples)
+    stats.ops_per_sec = len(samples) / elapsed
+    benchmark_session.record(stats)
+    regression = benchmark_session.regression(stats)
+    if regression:
+        pytest.fail(regression)
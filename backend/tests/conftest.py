@@ -6,17 +6,20 @@ os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite+aiosqlite:///:memory:"
 
 import pytest  # noqa: E402
 from fastapi.testclient import TestClient  # noqa: E402
-from httpx import AsyncClient  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
 from sqlalchemy.orm import sessionmaker  # noqa: E402
 from sqlalchemy.pool import StaticPool  # noqa: E402
 
 from app.core.security import create_access_token, get_password_hash  # noqa: E402
-from app.db.session import Base, get_db  # noqa: E402
+from app.db.session import Base, get_db, get_session_factory, instrument_engine  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.category import Category  # noqa: E402
 from app.models.item import Article  # noqa: E402
 from app.models.user import User  # noqa: E402
+from app.services.blob_store import LocalBlobStore, get_blob_store  # noqa: E402
+from app.services.catalog_cache import catalog_cache  # noqa: E402
+from app.services.rate_limit import InMemoryRateLimitBackend, get_rate_limiter  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # In-memory SQLite database for tests
@@ -28,6 +31,7 @@ engine = create_async_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
 
 
@@ -37,6 +41,15 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+
+# ---------------------------------------------------------------------------
+# Benchmarks (tests/benchmarks) — skipped unless --benchmark is given. The options,
+# marker and harness fixtures are shared with the other service, see /benchmarking
+# ---------------------------------------------------------------------------
+
+pytest_plugins = ["benchmarking.plugin"]
+
 
 # ---------------------------------------------------------------------------
 # Session / backend fixtures
@@ -51,6 +64,7 @@ def anyio_backend():
 @pytest.fixture(autouse=True)
 async def _reset_db():
     """Create tables before each test and drop them after."""
+    catalog_cache.clear()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -58,6 +72,24 @@ async def _reset_db():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def blob_store(tmp_path) -> LocalBlobStore:
+    """Store uploaded images in a per-test directory."""
+    store = LocalBlobStore(tmp_path / "blobs")
+    app.dependency_overrides[get_blob_store] = lambda: store
+    yield store
+    app.dependency_overrides.pop(get_blob_store, None)
+
+
+@pytest.fixture(autouse=True)
+def rate_limiter() -> InMemoryRateLimitBackend:
+    """Fresh rate limit buckets for every test."""
+    limiter = InMemoryRateLimitBackend()
+    app.dependency_overrides[get_rate_limiter] = lambda: limiter
+    yield limiter
+    app.dependency_overrides.pop(get_rate_limiter, None)
+
+
 @pytest.fixture()
 async def db_session():
     """Provide a transactional async DB session for tests."""
@@ -72,7 +104,7 @@ def client() -> TestClient:
 
 @pytest.fixture()
 async def async_client():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
 
 
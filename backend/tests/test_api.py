@@ -145,3 +145,143 @@ def test_update_article_price_suspicious(client: TestClient, seller_headers: dic
     )
     assert r.status_code == 400
     assert "suspicious" in r.json()["detail"].lower()
+
+
+def test_moderation_queue_keyset_pagination(client: TestClient, seller_headers: dict, admin_headers: dict):
+    """The moderation queue pages through pending articles with a cursor."""
+    for i in range(3):
+        client.post("/api/v1/articles/", headers=seller_headers, json={"title": f"Pending {i}", "price": 10.0})
+
+    r = client.get("/api/v1/articles/admin/pending?limit=2", headers=admin_headers)
+    assert r.status_code == 200
+    first_page = r.json()
+    assert [a["title"] for a in first_page["items"]] == ["Pending 0", "Pending 1"]
+    assert first_page["next_cursor"] is not None
+
+    r = client.get(
+        f"/api/v1/articles/admin/pending?limit=2&after_id={first_page['next_cursor']}", headers=admin_headers
+    )
+    second_page = r.json()
+    assert [a["title"] for a in second_page["items"]] == ["Pending 2"]
+    assert second_page["next_cursor"] is None
+
+
+def test_moderation_queue_admin_only(client: TestClient, seller_headers: dict):
+    """Only admins can see the moderation queue or moderate in bulk."""
+    assert client.get("/api/v1/articles/admin/pending", headers=seller_headers).status_code == 403
+    r = client.post(
+        "/api/v1/articles/admin/moderate",
+        headers=seller_headers,
+        json={"article_ids": [1], "action": "approve"},
+    )
+    assert r.status_code == 403
+
+
+def test_bulk_moderation(client: TestClient, seller_headers: dict, admin_headers: dict):
+    """Bulk approve lists articles in the catalog, bulk reject removes them."""
+    ids = [
+        client.post("/api/v1/articles/", headers=seller_headers, json={"title": f"Bulk {i}", "price": 10.0}).json()[
+            "id"
+        ]
+        for i in range(4)
+    ]
+    # Warm the catalog cache with the empty page
+    assert client.get("/api/v1/articles/").json()["total"] == 0
+
+    r = client.post(
+        "/api/v1/articles/admin/moderate",
+        headers=admin_headers,
+        json={"article_ids": ids[:2], "action": "approve"},
+    )
+    assert r.status_code == 200
+    assert r.json() == {"action": "approve", "article_ids": ids[:2], "count": 2}
+    assert client.get("/api/v1/articles/").json()["total"] == 2
+
+    r = client.post(
+        "/api/v1/articles/admin/moderate",
+        headers=admin_headers,
+        json={"article_ids": ids, "action": "reject"},
+    )
+    # Already-approved articles are not pending and are left alone
+    assert r.json()["article_ids"] == ids[2:]
+    pending = client.get("/api/v1/articles/admin/pending", headers=admin_headers).json()
+    assert pending["items"] == []
+    assert client.get("/api/v1/articles/").json()["total"] == 2
+
+
+def test_catalog_summary_projection(client: TestClient, approved_article: Article, seller_user: User):
+    """`fields=summary` returns compact entries; the seller is only included when expanded."""
+    response = client.get("/api/v1/articles/?fields=summary")
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["title"] == approved_article.title
+    assert item["excerpt"] == approved_article.description
+    assert item["seller"] is None
+    assert "description" not in item and "image_url" not in item
+    assert item["image"] is None and item["thumbnail"] is None
+
+    expanded = client.get("/api/v1/articles/?fields=summary&expand=seller").json()["items"][0]
+    assert expanded["seller"] == {"id": seller_user.id, "full_name": seller_user.full_name}
+
+    # The full view is unchanged and cached separately
+    full = client.get("/api/v1/articles/").json()["items"][0]
+    assert full["description"] == approved_article.description
+    assert full["seller"]["email"] == seller_user.email
+
+
+def test_catalog_price_filter_and_sort(client: TestClient, seller_headers: dict, admin_headers: dict):
+    """Price range and sort order compose with the other filters; ties are broken by id."""
+    category_id = client.post("/api/v1/categories/", headers=admin_headers, json={"name": "Posters"}).json()["id"]
+    prices = [30.0, 10.0, 20.0, 10.0, 50.0]
+    ids = [
+        client.post(
+            "/api/v1/articles/",
+            headers=seller_headers,
+            json={"title": f"Poster {i}", "price": price, "category_id": category_id if i < 4 else None},
+        ).json()["id"]
+        for i, price in enumerate(prices)
+    ]
+    client.post(
+        "/api/v1/articles/admin/moderate", headers=admin_headers, json={"article_ids": ids, "action": "approve"}
+    )
+
+    def listed(**params) -> list[int]:
+        response = client.get("/api/v1/articles/", params=params)
+        assert response.status_code == 200
+        return [item["id"] for item in response.json()["items"]]
+
+    assert listed(sort="price") == [ids[1], ids[3], ids[2], ids[0], ids[4]]
+    assert listed(sort="-price") == [ids[4], ids[0], ids[2], ids[3], ids[1]]
+    assert listed(sort="newest") == ids[::-1]
+    assert listed(sort="price", min_price=15, max_price=40) == [ids[2], ids[0]]
+    assert listed(sort="-price", category_id=category_id, search="poster", max_price=20) == [ids[2], ids[3], ids[1]]
+    # Pages of a sort with ties neither overlap nor skip
+    pages = [listed(sort="price", skip=skip, limit=2) for skip in (0, 2, 4)]
+    assert sum(pages, []) == listed(sort="price")
+    assert listed(fields="summary", sort="price", limit=2) == [ids[1], ids[3]]
+
+    assert client.get("/api/v1/articles/", params={"min_price": 20, "max_price": 10}).status_code == 400
+    assert client.get("/api/v1/articles/", params={"sort": "title"}).status_code == 422
+
+
+def test_my_articles_summary_projection(client: TestClient, seller_headers: dict, article: Article):
+    response = client.get("/api/v1/articles/mine?fields=summary", headers=seller_headers)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["excerpt"] == article.description
+    assert "description" not in response.json()["items"][0]
+
+
+def test_articles_batch_lookup(client: TestClient, seller_headers: dict):
+    """Batch lookup returns summaries for known ids, in one call."""
+    ids = [
+        client.post("/api/v1/articles/", headers=seller_headers, json={"title": title, "price": 10.0}).json()["id"]
+        for title in ("Poster", "Lamp")
+    ]
+    response = client.get(f"/api/v1/articles/batch?ids={ids[1]}&ids={ids[0]}&ids=9999")
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["title"] for item in data] == ["Poster", "Lamp"]
+    assert data[0]["is_sold"] is False
+
+    too_many = "&".join(f"ids={i}" for i in range(101))
+    assert client.get(f"/api/v1/articles/batch?{too_many}").status_code == 400
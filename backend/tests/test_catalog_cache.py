@@ -0,0 +1,36 @@
+"""Tests for the in-process catalog page cache."""
+
+from app.services.catalog_cache import CatalogCache
+
+
+def test_least_recently_used_pages_are_evicted():
+    cache = CatalogCache(ttl_seconds=60, max_entries=2)
+    cache.set((None, 0), "first")
+    cache.set((None, 1), "second")
+    assert cache.get((None, 0)) == "first"
+
+    cache.set((None, 2), "third")
+    assert cache.get((None, 1)) is None
+    assert cache.get((None, 0)) == "first"
+    assert cache.get((None, 2)) == "third"
+
+
+def test_expired_pages_are_swept_on_set(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.services.catalog_cache.time.monotonic", lambda: now)
+    cache = CatalogCache(ttl_seconds=30, max_entries=10)
+    cache.set((1, 0), "stale")
+    cache.set((2, 0), "stale")
+
+    now += 31
+    cache.set((3, 0), "fresh")
+    assert list(cache._entries) == [(3, 0)]
+
+
+def test_invalidation_drops_the_category_and_unfiltered_pages():
+    cache = CatalogCache(ttl_seconds=60, max_entries=10)
+    for key in [(None, 0), (1, 0), (2, 0)]:
+        cache.set(key, "page")
+
+    cache.invalidate({1})
+    assert [cache.get(key) for key in [(None, 0), (1, 0), (2, 0)]] == [None, None, "page"]
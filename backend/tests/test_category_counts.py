@@ -0,0 +1,75 @@
+"""Tests for the incrementally maintained category listing counts."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CategoryCount
+from app.services.category_counts import UNCATEGORIZED, adjust_counts, reconcile_counts
+
+
+def _facets(client: TestClient) -> tuple[dict[str, int], int]:
+    body = client.get("/api/v1/categories/", params={"with_counts": True}).json()
+    return {item["name"]: item["listing_count"] for item in body["items"]}, body["total"]
+
+
+def test_counts_follow_listing_changes(client: TestClient, seller_headers: dict, admin_headers: dict):
+    categories = [
+        client.post("/api/v1/categories/", headers=admin_headers, json={"name": name}).json()["id"]
+        for name in ("Posters", "Books")
+    ]
+    posters, books = categories
+    ids = [
+        client.post(
+            "/api/v1/articles/",
+            headers=seller_headers,
+            json={"title": f"Item {i}", "price": 10.0, "category_id": posters},
+        ).json()["id"]
+        for i in range(3)
+    ]
+    uncategorized = client.post("/api/v1/articles/", headers=seller_headers, json={"title": "Misc", "price": 1.0})
+    # Pending articles are not listed
+    assert _facets(client) == ({"Posters": 0, "Books": 0}, 0)
+
+    client.post(
+        "/api/v1/articles/admin/moderate",
+        headers=admin_headers,
+        json={"action": "approve", "article_ids": [*ids[:2], uncategorized.json()["id"]]},
+    )
+    client.put(f"/api/v1/articles/{ids[2]}/approve", headers=admin_headers)
+    # Approving twice does not count twice
+    client.put(f"/api/v1/articles/{ids[2]}/approve", headers=admin_headers)
+    assert _facets(client) == ({"Posters": 3, "Books": 0}, 4)
+
+    client.put(f"/api/v1/articles/{ids[0]}", headers=seller_headers, json={"category_id": books})
+    client.delete(f"/api/v1/articles/{ids[1]}", headers=seller_headers)
+    assert _facets(client) == ({"Posters": 1, "Books": 1}, 3)
+
+    # Without the flag the response is unchanged
+    assert [category["name"] for category in client.get("/api/v1/categories/").json()] == ["Posters", "Books"]
+
+
+async def test_reconciliation_repairs_drift(
+    client: TestClient, db_session: AsyncSession, seller_headers: dict, admin_headers: dict
+):
+    category_id = client.post("/api/v1/categories/", headers=admin_headers, json={"name": "Posters"}).json()["id"]
+    article = client.post(
+        "/api/v1/articles/", headers=seller_headers, json={"title": "Poster", "price": 10.0, "category_id": category_id}
+    )
+    client.put(f"/api/v1/articles/{article.json()['id']}/approve", headers=admin_headers)
+    await db_session.execute(update(CategoryCount).values(count=7))
+    await db_session.commit()
+    assert _facets(client) == ({"Posters": 7}, 7)
+
+    assert await reconcile_counts(db_session) == 1
+    assert _facets(client) == ({"Posters": 1}, 1)
+    assert await reconcile_counts(db_session) == 0
+
+
+async def test_adjust_counts_creates_missing_rows(db_session: AsyncSession):
+    await adjust_counts(db_session, {5: 2, None: 1, 6: -1})
+    await adjust_counts(db_session, {5: 3, None: -1})
+    await db_session.commit()
+
+    rows = (await db_session.execute(select(CategoryCount.category_id, CategoryCount.count))).all()
+    assert dict(rows) == {5: 5, UNCATEGORIZED: 0, 6: 0}
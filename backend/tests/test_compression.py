@@ -0,0 +1,90 @@
+"""Tests for the response compression middleware."""
+
+import gzip
+import json
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+OPENAPI_URL = "/api/v1/openapi.json"
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(header: str, expected: str | None):
+    assert choose_encoding(header) == expected
+
+
+def test_json_is_compressed_with_preferred_encoding(client: TestClient):
+    identity = client.get(OPENAPI_URL, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    for encoding, decompress in (("br", brotli.decompress), ("gzip", gzip.decompress)):
+        response = client.get(OPENAPI_URL, headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(identity.content) / 3
+        # The test client decodes transparently; check the raw bytes too
+        assert response.json() == identity.json()
+        assert json.loads(decompress(_raw_body(client, encoding))) == identity.json()
+
+
+def _raw_body(client: TestClient, encoding: str) -> bytes:
+    with client.stream("GET", OPENAPI_URL, headers={"Accept-Encoding": encoding}) as response:
+        return b"".join(response.iter_raw())
+
+
+def test_small_responses_and_images_are_not_compressed(client: TestClient, seller_headers: dict):
+    small = client.get("/health/live", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in small.headers
+
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096
+    url = client.post("/api/v1/images/", headers=seller_headers, files={"file": ("a.png", png, "image/png")}).json()[
+        "url"
+    ]
+    image = client.get(url, headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in image.headers
+    assert image.content == png
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk():
+    chunks = [json.dumps({"n": i, "pad": "x" * 2000}).encode() + b"\n" for i in range(5)]
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for chunk in chunks:
+                yield chunk
+
+        return StreamingResponse(body(), media_type="application/x-ndjson; charset=utf-8")
+
+    @app.get("/text")
+    async def text():
+        return StreamingResponse(iter(chunks), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    client = TestClient(app)
+
+    # Not a compressible type
+    assert "content-encoding" not in client.get("/stream", headers={"Accept-Encoding": "gzip"}).headers
+
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == b"".join(chunks)
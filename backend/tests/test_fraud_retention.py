@@ -0,0 +1,79 @@
+"""Tests for fraud log compaction and purging."""
+
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FraudLog
+from app.services.fraud_retention import FraudLogRetention
+from tests.conftest import TestingSessionLocal
+
+
+def _log(days_ago: int, seller_id: int, change_pct: float, suspicious: bool = False, resolved: bool = False) -> dict:
+    return {
+        "article_id": 1,
+        "seller_id": seller_id,
+        "old_price": 100.0,
+        "new_price": 100.0 + change_pct,
+        "change_pct": change_pct,
+        "reason": "flagged" if suspicious else "OK",
+        "is_suspicious": suspicious,
+        "resolved": resolved,
+        "created_at": datetime.now(UTC) - timedelta(days=days_ago, hours=1),
+    }
+
+
+async def test_old_ok_checks_are_compacted_and_resolved_alerts_purged(
+    client: TestClient, db_session: AsyncSession, admin_headers: dict
+):
+    await db_session.execute(
+        insert(FraudLog),
+        [
+            _log(40, seller_id=1, change_pct=5.0),
+            _log(40, seller_id=1, change_pct=20.0),
+            _log(40, seller_id=2, change_pct=1.0),
+            _log(41, seller_id=1, change_pct=3.0),
+            _log(1, seller_id=1, change_pct=2.0),
+            _log(400, seller_id=1, change_pct=80.0, suspicious=True, resolved=True),
+            _log(400, seller_id=1, change_pct=90.0, suspicious=True),
+            _log(40, seller_id=1, change_pct=70.0, suspicious=True, resolved=True),
+        ],
+    )
+    await db_session.commit()
+
+    retention = FraudLogRetention(TestingSessionLocal, ok_days=30, resolved_days=365, batch_size=2, interval=3600)
+    assert await retention.run_once() == (4, 1)
+    assert await retention.run_once() == (0, 0)
+
+    # The recent OK check and every unresolved or recent alert are kept
+    remaining = await db_session.scalars(select(FraudLog.change_pct).order_by(FraudLog.change_pct))
+    assert remaining.all() == [2.0, 70.0, 90.0]
+
+    daily = client.get("/api/v1/fraud-logs/daily", headers=admin_headers).json()
+    today = datetime.now(UTC).date()
+    assert [(row["day"], row["seller_id"], row["checks"], row["max_change_pct"]) for row in daily] == [
+        (str(today - timedelta(days=40)), 1, 2, 20.0),
+        (str(today - timedelta(days=40)), 2, 1, 1.0),
+        (str(today - timedelta(days=41)), 1, 1, 3.0),
+    ]
+    assert len(client.get("/api/v1/fraud-logs/daily", headers=admin_headers, params={"seller_id": 2}).json()) == 1
+
+    # Later compactions add to the existing day
+    await db_session.execute(insert(FraudLog), [_log(40, seller_id=2, change_pct=9.0)])
+    await db_session.commit()
+    assert await retention.run_once() == (1, 0)
+    daily = client.get("/api/v1/fraud-logs/daily", headers=admin_headers, params={"seller_id": 2}).json()
+    assert (daily[0]["checks"], daily[0]["max_change_pct"]) == (2, 9.0)
+    assert await db_session.scalar(select(func.count()).select_from(FraudLog)) == 3
+
+
+async def test_fraud_logs_page_by_id(client: TestClient, db_session: AsyncSession, admin_headers: dict):
+    await db_session.execute(insert(FraudLog), [_log(0, seller_id=1, change_pct=float(i)) for i in range(5)])
+    await db_session.commit()
+    first = client.get("/api/v1/fraud-logs/", headers=admin_headers, params={"limit": 3}).json()
+    rest = client.get(
+        "/api/v1/fraud-logs/", headers=admin_headers, params={"limit": 3, "before_id": first[-1]["id"]}
+    ).json()
+    assert [log["change_pct"] for log in first + rest] == [4.0, 3.0, 2.0, 1.0, 0.0]
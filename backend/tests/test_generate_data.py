@@ -0,0 +1,60 @@
+"""Tests for the synthetic data generator used for load testing."""
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Article, Conversation, FraudLog, Message, User
+from scripts.generate_data import Volumes, generate
+from tests.conftest import _HASHED, engine
+
+
+async def test_generate_loads_requested_volumes(db_session):
+    volumes = Volumes(users=50, categories=3, articles=200, conversations=20, messages=100, fraud_logs=30)
+    inserted = await generate(engine, volumes, batch_size=64, password_hash=_HASHED)
+
+    assert inserted == {
+        "categories": 3,
+        "users": 50,
+        "articles": 200,
+        "conversations": 20,
+        "messages": 100,
+        "fraud_logs": 30,
+    }
+    for model, expected in [(User, 50), (Article, 200), (Conversation, 20), (Message, 100), (FraudLog, 30)]:
+        assert await db_session.scalar(select(func.count()).select_from(model)) == expected
+
+
+async def test_generate_appends_to_existing_data(db_session):
+    volumes = Volumes(users=10, categories=2, articles=10, conversations=2, messages=5, fraud_logs=5)
+    await generate(engine, volumes, password_hash=_HASHED)
+    await generate(engine, volumes, seed=7, password_hash=_HASHED)
+
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 20
+    # Existing categories are reused rather than duplicated
+    assert await db_session.scalar(select(func.count(func.distinct(Article.category_id)))) <= 2
+
+
+async def test_generate_fills_inbox_state(db_session):
+    volumes = Volumes(users=30, categories=2, articles=20, conversations=10, messages=80, fraud_logs=0)
+    await generate(engine, volumes, password_hash=_HASHED)
+
+    messages = (await db_session.execute(select(Message).order_by(Message.created_at))).scalars().all()
+    for conversation in (await db_session.scalars(select(Conversation))).all():
+        own = [m for m in messages if m.conversation_id == conversation.id]
+        assert conversation.last_message_at == (own[-1].created_at if own else conversation.created_at)
+
+        # Each side has read the conversation up to its own last message
+        def unread(reader_id: int, conversation=conversation, own=own) -> int:
+            read_at = max((m.created_at for m in own if m.sender_id == reader_id), default=conversation.created_at)
+            return sum(m.sender_id != reader_id and m.created_at > read_at for m in own)
+
+        assert conversation.buyer_unread == unread(conversation.buyer_id)
+        assert conversation.seller_unread == unread(conversation.seller_id)
+
+
+def test_volumes_that_break_references_are_rejected():
+    for volumes in [{"users": 0}, {"articles": 0}, {"conversations": 0}, {"fraud_logs": -1}]:
+        with pytest.raises(ValueError):
+            Volumes(**volumes)
+    # Nothing references categories, and no messages need no conversations
+    Volumes(categories=0, conversations=0, messages=0)
@@ -0,0 +1,62 @@
+"""Tests for the liveness and readiness probes."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.health import HealthMonitor
+from app.core.startup import WarmUp
+from app.main import app, health_monitor
+from app.services.catalog_cache import catalog_cache
+from tests.conftest import engine
+
+
+def test_liveness(client: TestClient):
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+async def test_readiness_reflects_last_database_check(async_client, monkeypatch):
+    monkeypatch.setattr(health_monitor, "engine", engine)
+    monkeypatch.setattr(health_monitor, "snapshot", type(health_monitor.snapshot)())
+
+    response = await async_client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["no database check yet"]
+
+    await health_monitor.check_once()
+    response = await async_client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["database"] is True
+
+
+async def test_readiness_fails_when_database_is_unreachable(tmp_path):
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.sqlite")
+    monitor = HealthMonitor(unreachable, interval=5.0, timeout=1.0)
+
+    snapshot = await monitor.check_once()
+    ready, body = monitor.readiness()
+    assert not snapshot.database and snapshot.error
+    assert not ready
+    assert body["reasons"] == ["database unreachable"]
+    await unreachable.dispose()
+
+
+async def test_not_ready_until_warmed_up(async_client, monkeypatch):
+    monkeypatch.setattr(health_monitor, "engine", engine)
+    monkeypatch.setattr(health_monitor, "warming_up", False)
+    await health_monitor.check_once()
+    home_page = "/api/v1/articles/?skip=0&limit=12&fields=summary"
+    warm_up = WarmUp(app, engine, health_monitor, connections=2, paths=[home_page, "/missing"], timeout=5.0)
+
+    await warm_up.start()
+    assert health_monitor.readiness()[1]["reasons"] == ["warming up"]
+    await warm_up._task
+
+    # A failing path does not keep the service out of rotation
+    response = await async_client.get("/health/ready")
+    assert response.status_code == 200
+    assert catalog_cache.get((None, None, None, None, None, 0, 12, "summary", None)) is not None
+    metrics = (await async_client.get("/metrics")).text
+    assert 'startup_phase_seconds{phase="warm_up"}' in metrics
+    assert "startup_ready_seconds" in metrics
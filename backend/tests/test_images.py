@@ -0,0 +1,169 @@
+"""Tests for image uploads, the blob store and the inline image migration."""
+
+import base64
+import io
+import json
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.models.item import Article
+from app.models.user import User
+from app.services.thumbnails import variant_key
+from scripts.migrate_inline_images import migrate
+from tests.conftest import engine
+
+# Smallest valid PNG header is enough: only the magic bytes are checked
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+JPEG = b"\xff\xd8\xff\xe0" + b"\x01" * 32
+
+
+def _png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(out, "PNG")
+    return out.getvalue()
+
+
+def _upload(client: TestClient, headers: dict, content: bytes, name: str = "photo.png"):
+    return client.post("/api/v1/images/", headers=headers, files={"file": (name, content, "image/png")})
+
+
+def test_upload_deduplicates_by_content(client: TestClient, seller_headers: dict, blob_store):
+    first = _upload(client, seller_headers, PNG)
+    assert first.status_code == 200
+    data = first.json()
+    assert data["key"].endswith(".png")
+    assert data["url"] == f"/api/v1/images/{data['key']}"
+    assert data["size"] == len(PNG)
+
+    second = _upload(client, seller_headers, PNG, name="copy.png")
+    assert second.json()["key"] == data["key"]
+    assert len(list(blob_store.root.rglob("*.png"))) == 1
+
+
+def test_upload_reports_stored_size_of_chunked_uploads(client: TestClient, seller_headers: dict):
+    def chunks():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.png"\r\n'
+        yield b"Content-Type: image/png\r\n\r\n" + PNG + b"\r\n--b--\r\n"
+
+    response = client.post(
+        "/api/v1/images/",
+        headers={**seller_headers, "Content-Type": "multipart/form-data; boundary=b"},
+        content=chunks(),
+    )
+    assert response.status_code == 200
+    assert response.json()["size"] == len(PNG)
+
+
+def test_upload_rejects_non_images_and_buyers(client: TestClient, seller_headers: dict, buyer_headers: dict):
+    assert _upload(client, seller_headers, b"<svg></svg>").status_code == 415
+    assert _upload(client, buyer_headers, PNG).status_code == 403
+
+
+def test_get_image_is_immutable_and_revalidates(client: TestClient, seller_headers: dict):
+    url = _upload(client, seller_headers, JPEG, name="photo.jpg").json()["url"]
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == JPEG
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+
+    cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    assert client.get("/api/v1/images/" + "0" * 64 + ".png").status_code == 404
+    assert client.get("/api/v1/images/..%2Fsecret").status_code == 404
+
+
+def test_create_article_externalizes_inline_images(client: TestClient, seller_headers: dict):
+    data_url = "data:image/png;base64," + base64.b64encode(PNG).decode()
+    response = client.post(
+        "/api/v1/articles/",
+        headers=seller_headers,
+        json={"title": "Camera", "price": 80.0, "image_url": json.dumps([data_url, "https://cdn.example/a.jpg"])},
+    )
+    assert response.status_code == 200
+    images = json.loads(response.json()["image_url"])
+    assert images[0].startswith("/api/v1/images/")
+    assert images[1] == "https://cdn.example/a.jpg"
+    assert client.get(images[0]).content == PNG
+
+
+async def test_migrate_inline_images(db_session, seller_user: User, blob_store):
+    inline = "data:image/png;base64," + base64.b64encode(PNG * 100).decode()
+    db_session.add_all(
+        [
+            Article(title="Inline", price=1.0, seller_id=seller_user.id, image_url=json.dumps([inline, inline])),
+            Article(title="Bare", price=1.0, seller_id=seller_user.id, image_url=inline),
+            Article(title="Broken", price=1.0, seller_id=seller_user.id, image_url="data:text/plain,hello"),
+            Article(title="Plain", price=1.0, seller_id=seller_user.id, image_url='["/api/v1/images/x.png"]'),
+        ]
+    )
+    await db_session.commit()
+
+    stats = await migrate(engine, blob_store, batch_size=2)
+    assert stats["articles"] == 2
+    assert stats["images"] == 3
+    assert stats["failed"] == 1
+    assert stats["bytes_after"] < stats["bytes_before"]
+
+    db_session.expire_all()
+    articles = {a.title: a for a in (await db_session.execute(Article.__table__.select())).all()}
+    assert json.loads(articles["Inline"].image_url)[0].startswith("/api/v1/images/")
+    assert json.loads(articles["Bare"].image_url)[0].startswith("/api/v1/images/")
+    assert articles["Broken"].image_url == "data:text/plain,hello"
+    assert len(list(blob_store.root.rglob("*.png"))) == 1
+
+
+def test_image_variants_are_rendered_lazily(client: TestClient, blob_store):
+    key = blob_store.put(io.BytesIO(_png(1200, 600)), "png")
+
+    thumb = client.get(f"/api/v1/images/{key}/thumb")
+    assert thumb.status_code == 200
+    assert thumb.headers["content-type"] == "image/webp"
+    assert "immutable" in thumb.headers["cache-control"]
+    assert Image.open(io.BytesIO(thumb.content)).size == (320, 320)
+    assert blob_store.exists(variant_key(key, "thumb"))
+
+    medium = client.get(f"/api/v1/images/{key}/medium")
+    assert Image.open(io.BytesIO(medium.content)).size == (800, 400)
+
+    assert client.get(f"/api/v1/images/{key}/huge").status_code == 404
+
+
+def test_variant_of_unreadable_image_falls_back_to_original(client: TestClient, seller_headers: dict, monkeypatch):
+    url = _upload(client, seller_headers, PNG).json()["url"]
+    response = client.get(f"{url}/thumb", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"] == url
+
+    # The failure is remembered, so the original is not decoded again
+    renders = []
+    monkeypatch.setattr("app.services.thumbnails.render", lambda *args: renders.append(args))
+    assert client.get(f"{url}/thumb", follow_redirects=False).status_code == 307
+    assert renders == []
+
+
+def test_article_exposes_variant_urls(client: TestClient, seller_headers: dict):
+    url = _upload(client, seller_headers, _png(64, 64)).json()["url"]
+    response = client.post(
+        "/api/v1/articles/",
+        headers=seller_headers,
+        json={"title": "Lamp", "price": 20.0, "image_url": json.dumps([url, "https://cdn.example/a.jpg"])},
+    )
+    images = response.json()["images"]
+    assert images[0] == {"url": url, "variants": {"thumb": f"{url}/thumb", "medium": f"{url}/medium"}}
+    assert images[1] == {"url": "https://cdn.example/a.jpg", "variants": {}}
+
+
+async def test_migrate_inline_images_dry_run_writes_nothing(db_session, seller_user: User, blob_store):
+    inline = "data:image/png;base64," + base64.b64encode(PNG).decode()
+    db_session.add(Article(title="Inline", price=1.0, seller_id=seller_user.id, image_url=inline))
+    await db_session.commit()
+
+    stats = await migrate(engine, blob_store, dry_run=True)
+    assert (stats["articles"], stats["images"]) == (1, 1)
+    assert not blob_store.root.exists() or not any(blob_store.root.rglob("*.png"))
+    db_session.expire_all()
+    assert (await db_session.scalar(Article.__table__.select().with_only_columns(Article.image_url))) == inline
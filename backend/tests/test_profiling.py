@@ -0,0 +1,64 @@
+"""Tests for the opt-in request profiling middleware."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+@pytest.fixture()
+def profiling(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_MS", 1.0)
+    monkeypatch.setattr(settings, "PROFILING_OUTPUT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _server_timing(response) -> dict[str, float]:
+    entries = (part.strip().split(";dur=") for part in response.headers["server-timing"].split(","))
+    return {name: float(duration) for name, duration in entries}
+
+
+def test_admin_profile_on_authenticated_route(client: TestClient, admin_headers: dict, profiling):
+    """Admins asking for a profile get a segment breakdown and a flamegraph file."""
+    r = client.get("/api/v1/users/me", headers={**admin_headers, "X-Profile": "1"})
+    assert r.status_code == 200
+
+    timing = _server_timing(r)
+    assert set(timing) == {"db", "auth", "handler", "serialization", "total"}
+    assert timing["db"] > 0
+
+    profile_id = r.headers["x-profile-id"]
+    [summary_file] = profiling.glob(f"*{profile_id}.json")
+    summary = json.loads(summary_file.read_text())
+    assert summary["path"] == "/api/v1/users/me"
+    assert summary_file.with_suffix(".folded").exists()
+
+
+def test_admin_profile_on_public_route(client: TestClient, admin_headers: dict, profiling):
+    """Public routes resolve the admin from the bearer token."""
+    r = client.get("/api/v1/articles/", headers={**admin_headers, "X-Profile": "1"})
+    assert r.status_code == 200
+    assert "server-timing" in r.headers
+
+
+def test_profile_header_ignored_for_non_admins(client: TestClient, seller_headers: dict, profiling):
+    r = client.get("/api/v1/users/me", headers={**seller_headers, "X-Profile": "1"})
+    assert r.status_code == 200
+    assert "server-timing" not in r.headers
+    assert list(profiling.iterdir()) == []
+
+
+def test_sampled_requests_are_written_without_headers(client: TestClient, profiling, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    r = client.get("/api/v1/categories/")
+    assert "server-timing" not in r.headers
+    assert len(list(profiling.glob("*.folded"))) == 1
+
+
+def test_profiling_disabled_by_default(client: TestClient, admin_headers: dict):
+    r = client.get("/api/v1/users/me", headers={**admin_headers, "X-Profile": "1"})
+    assert "server-timing" not in r.headers
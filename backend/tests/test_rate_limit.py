@@ -0,0 +1,82 @@
+"""Tests for the token-bucket rate limiter and the rate-limited endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.rate_limit import InMemoryRateLimitBackend, Limit
+
+
+def test_parse_limit():
+    assert Limit.parse("10/minute") == Limit(rate=10 / 60, burst=10)
+    assert Limit.parse(" 2 / second ") == Limit(rate=2.0, burst=2)
+    for spec in ("10", "0/minute", "10/week", "ten/minute"):
+        with pytest.raises(ValueError):
+            Limit.parse(spec)
+
+
+async def test_bucket_refills_at_the_limit_rate(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.services.rate_limit.time.monotonic", lambda: now)
+    limiter = InMemoryRateLimitBackend()
+    limit = Limit.parse("2/second")
+
+    assert await limiter.hit("k", limit) == 0
+    assert await limiter.hit("k", limit) == 0
+    assert await limiter.hit("k", limit) == pytest.approx(0.5)
+    # Other keys have their own bucket
+    assert await limiter.hit("other", limit) == 0
+
+    now += 0.5
+    assert await limiter.hit("k", limit) == 0
+    assert await limiter.hit("k", limit) == pytest.approx(0.5)
+
+
+async def test_least_recently_used_buckets_are_evicted():
+    limiter = InMemoryRateLimitBackend(max_keys=2)
+    limit = Limit.parse("1/hour")
+    await limiter.hit("a", limit)
+    await limiter.hit("b", limit)
+    await limiter.hit("a", limit)
+    await limiter.hit("c", limit)
+    assert set(limiter._buckets) == {"a", "c"}
+
+
+def test_login_is_limited_per_ip(client: TestClient):
+    form = {"username": "nobody@test.com", "password": "wrong"}
+    codes = [client.post("/api/v1/auth/login/access-token", data=form).status_code for _ in range(11)]
+    assert codes == [400] * 10 + [429]
+
+    response = client.post("/api/v1/auth/login/access-token", data=form)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["retry-after"]) <= 6
+
+    metrics = client.get("/metrics").text
+    assert 'rate_limit_requests_total{limit="login",outcome="limited"}' in metrics
+
+
+def test_price_updates_are_limited_per_user(client: TestClient, seller_headers: dict, admin_headers: dict):
+    article = client.post("/api/v1/articles/", headers=seller_headers, json={"title": "Poster", "price": 100.0})
+    url = f"/api/v1/articles/{article.json()['id']}/price"
+    for _ in range(30):
+        assert client.put(url, headers=seller_headers, json={"price": 100.0}).status_code == 200
+    assert client.put(url, headers=seller_headers, json={"price": 100.0}).status_code == 429
+    # Another user still has a full bucket
+    assert client.put(url, headers=admin_headers, json={"price": 100.0}).status_code == 200
+
+
+def test_price_changes_through_the_article_update_share_the_limit(client: TestClient, seller_headers: dict):
+    article = client.post("/api/v1/articles/", headers=seller_headers, json={"title": "Poster", "price": 100.0})
+    url = f"/api/v1/articles/{article.json()['id']}"
+    for _ in range(30):
+        assert client.put(url, headers=seller_headers, json={"price": 100.0}).status_code == 200
+    assert client.put(url, headers=seller_headers, json={"price": 100.0}).status_code == 429
+    assert client.put(f"{url}/price", headers=seller_headers, json={"price": 100.0}).status_code == 429
+    # Updates that leave the price alone are not limited
+    assert client.put(url, headers=seller_headers, json={"title": "Framed poster"}).status_code == 200
+
+
+def test_rate_limits_can_be_disabled(client: TestClient, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.RATE_LIMIT_ENABLED", False)
+    form = {"username": "nobody@test.com", "password": "wrong"}
+    codes = {client.post("/api/v1/auth/login/access-token", data=form).status_code for _ in range(15)}
+    assert codes == {400}
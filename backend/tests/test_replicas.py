@@ -0,0 +1,94 @@
+"""Tests for read-replica routing, with a second in-memory SQLite database as the replica."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.replicas import Replica, replica_set
+from app.db.session import Base
+from app.models.category import Category
+from app.models.item import Article
+
+
+@pytest.fixture()
+async def replica(monkeypatch) -> Replica:
+    """A replica holding one category the primary does not have."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(Category.__table__.insert().values(name="Replica only"))
+    replica = Replica(engine)
+    monkeypatch.setattr(replica_set, "replicas", [replica])
+    monkeypatch.setattr(replica_set, "_recent_writers", {})
+    await replica_set.check_once()
+    yield replica
+    await engine.dispose()
+
+
+def _category_names(client: TestClient, headers: dict | None = None) -> list[str]:
+    return [category["name"] for category in client.get("/api/v1/categories/", headers=headers).json()]
+
+
+async def test_reads_go_to_a_fresh_replica(client: TestClient, replica: Replica):
+    assert replica.lag == 0.0
+    assert _category_names(client) == ["Replica only"]
+
+
+async def test_lagging_or_unreachable_replicas_fall_back_to_primary(client: TestClient, replica: Replica):
+    replica.lag = replica_set.max_lag + 1
+    assert _category_names(client) == []
+
+    await replica.engine.dispose()
+    unreachable = Replica(create_async_engine("sqlite+aiosqlite:////nonexistent/dir/replica.db"))
+    replica_set.replicas = [unreachable]
+    await replica_set.check_once()
+    assert unreachable.lag is None
+    assert _category_names(client) == []
+
+
+async def test_writers_read_their_writes_from_primary(
+    client: TestClient, replica: Replica, seller_headers: dict, buyer_headers: dict
+):
+    created = client.post("/api/v1/articles/", headers=seller_headers, json={"title": "Poster", "price": 10.0})
+    assert created.status_code == 200
+    url = f"/api/v1/articles/{created.json()['id']}"
+
+    # The seller just wrote, so their reads go to the primary; others still read the replica
+    assert client.get(url, headers=seller_headers).status_code == 200
+    assert client.get(url, headers=buyer_headers).status_code == 404
+    assert client.get(url).status_code == 404
+
+    # Once the window is over, the seller reads from the replica again
+    replica_set._recent_writers.clear()
+    assert client.get(url, headers=seller_headers).status_code == 404
+
+
+async def test_catalog_pages_render_on_the_replica(client: TestClient, replica: Replica):
+    async with replica.engine.begin() as conn:
+        await conn.execute(
+            Article.__table__.insert().values(title="Replica poster", price=10.0, seller_id=1, is_approved=True)
+        )
+    assert [article["title"] for article in client.get("/api/v1/articles/").json()["items"]] == ["Replica poster"]
+
+    replica.lag = replica_set.max_lag + 1
+    assert client.get("/api/v1/articles/", params={"limit": 5}).json()["items"] == []
+
+
+async def test_recent_writers_skip_catalog_pages_rendered_on_the_replica(
+    client: TestClient, replica: Replica, db_session, seller_user, seller_headers: dict
+):
+    async with replica.engine.begin() as conn:
+        await conn.execute(
+            Article.__table__.insert().values(title="Replica poster", price=10.0, seller_id=1, is_approved=True)
+        )
+    db_session.add(Article(title="Primary poster", price=10.0, seller_id=seller_user.id, is_approved=True))
+    await db_session.commit()
+    assert client.post("/api/v1/articles/", headers=seller_headers, json={"title": "New", "price": 5.0}).is_success
+
+    # Cached for everyone from the replica, but not served to the seller who just wrote
+    assert [article["title"] for article in client.get("/api/v1/articles/").json()["items"]] == ["Replica poster"]
+    page = client.get("/api/v1/articles/", headers=seller_headers).json()
+    assert [article["title"] for article in page["items"]] == ["Primary poster"]
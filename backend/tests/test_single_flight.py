@@ -0,0 +1,76 @@
+"""Tests for single-flight coalescing and its use by the catalog listing."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_for_a_key_share_one_execution():
+    flights = SingleFlight("test")
+    calls = []
+    release = asyncio.Event()
+
+    async def work(key):
+        calls.append(key)
+        await release.wait()
+        return f"result-{key}"
+
+    waiters = [asyncio.ensure_future(flights.do(key, lambda key=key: work(key))) for key in ("a", "a", "a", "b")]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["result-a", "result-a", "result-a", "result-b"]
+    assert calls == ["a", "b"]
+
+    # Once the flight landed, the next call runs the work again
+    assert await flights.do("a", lambda: work("a")) == "result-a"
+    assert calls == ["a", "b", "a"]
+
+
+async def test_errors_reach_every_waiter_and_clear_the_key():
+    flights = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flights.do("k", fail), flights.do("k", fail), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flights._flights == {}
+
+
+async def test_a_cancelled_waiter_does_not_cancel_the_others():
+    flights = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return 1
+
+    first = asyncio.ensure_future(flights.do("k", work))
+    second = asyncio.ensure_future(flights.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+def test_catalog_filters_are_normalized(client: TestClient, seller_headers: dict, admin_headers: dict):
+    article = client.post("/api/v1/articles/", headers=seller_headers, json={"title": "Vintage Poster", "price": 10.0})
+    client.post(
+        "/api/v1/articles/admin/moderate",
+        headers=admin_headers,
+        json={"action": "approve", "article_ids": [article.json()["id"]]},
+    )
+
+    upper = client.get("/api/v1/articles/", params={"search": "VINTAGE", "category_id": 0})
+    lower = client.get("/api/v1/articles/", params={"search": "vintage"})
+    assert upper.json() == lower.json()
+    assert upper.json()["total"] == 1
+
+    metrics = client.get("/metrics").text
+    assert 'single_flight_requests_total{group="catalog",outcome="executed"}' in metrics
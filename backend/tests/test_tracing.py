@@ -0,0 +1,87 @@
+"""Tests for request tracing and trace context propagation."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.tracing import FileSpanExporter, SpanExporter, parse_traceparent
+
+PARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.spans: list[dict] = []
+
+    def export(self, spans: list[dict]) -> None:
+        self.spans.extend(spans)
+
+
+@pytest.fixture()
+def exporter(monkeypatch) -> ListExporter:
+    exporter = ListExporter()
+    tracing.register_exporter("test", lambda: exporter)
+    monkeypatch.setattr("app.core.config.settings.TRACING_ENABLED", True)
+    monkeypatch.setattr("app.core.config.settings.TRACING_EXPORTER", "test")
+    tracing.get_exporter.cache_clear()
+    yield exporter
+    tracing.flush()
+    tracing.get_exporter.cache_clear()
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(PARENT) == ("0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331", True)
+    assert parse_traceparent(PARENT[:-2] + "00")[2] is False
+    for value in (None, "", "garbage", "00-" + "0" * 32 + "-b7ad6b7169203331-01", "01-" + PARENT[3:] + "-extra"):
+        assert parse_traceparent(value) is None
+
+
+def test_price_update_is_traced_down_to_the_database(client: TestClient, exporter: ListExporter, seller_headers: dict):
+    article = client.post("/api/v1/articles/", headers=seller_headers, json={"title": "Poster", "price": 100.0})
+    exporter.spans.clear()
+    response = client.put(
+        f"/api/v1/articles/{article.json()['id']}/price",
+        headers={**seller_headers, "traceparent": PARENT},
+        json={"price": 300.0},
+    )
+    # Flagged as suspicious
+    assert response.status_code == 400
+    tracing.flush()
+
+    spans = {span["name"]: span for span in exporter.spans}
+    server = spans["PUT /api/v1/articles/{article_id}/price"]
+    assert server["traceId"] == "0af7651916cd43dd8448eb211c80319c"
+    assert server["parentSpanId"] == "b7ad6b7169203331"
+    assert server["attributes"]["http.response.status_code"] == 400
+    assert server["status"] == "ok"
+    assert response.headers["traceresponse"] == f"00-{server['traceId']}-{server['spanId']}-01"
+
+    assert spans["get_current_user"]["parentSpanId"] == server["spanId"]
+    fraud = spans["fraud.check_price_change"]
+    assert fraud["parentSpanId"] == server["spanId"]
+    assert fraud["attributes"]["fraud.suspicious"] is True
+    queries = [span for span in exporter.spans if span["name"] == "db.query"]
+    assert any(span["parentSpanId"] == fraud["spanId"] for span in queries)
+    assert {span["traceId"] for span in exporter.spans} == {server["traceId"]}
+
+
+def test_login_traces_bcrypt_and_honours_unsampled_callers(client: TestClient, exporter: ListExporter, seller_user):
+    form = {"username": seller_user.email, "password": "password"}
+    client.post("/api/v1/auth/login/access-token", data=form)
+    tracing.flush()
+    assert "bcrypt.verify" in {span["name"] for span in exporter.spans}
+
+    exporter.spans.clear()
+    response = client.post("/api/v1/auth/login/access-token", data=form, headers={"traceparent": PARENT[:-2] + "00"})
+    tracing.flush()
+    assert exporter.spans == []
+    assert "traceresponse" not in response.headers
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    FileSpanExporter(str(path)).export([{"name": "a"}, {"name": "b"}])
+    FileSpanExporter(str(path)).export([{"name": "c"}])
+    assert [json.loads(line)["name"] for line in path.read_text().splitlines()] == ["a", "b", "c"]
@@ -0,0 +1,7 @@
+"""
+In-process benchmark harness shared by the backend and chat-service test suites.
+
+Each suite loads `benchmarking.plugin` from its tests/conftest.py, which adds
+the --benchmark options, skips tests marked `benchmark` unless --benchmark is
+given, and provides the `benchmark_session` and `bench` fixtures.
+"""
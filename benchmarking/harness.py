@@ -0,0 +1,117 @@
+"""
+Minimal in-process benchmark harness.
+
+Times an async callable over a number of rounds, reports ops/sec and latency
+percentiles, and compares the median against a stored baseline JSON file.
+"""
+
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass
+class BenchmarkStats:
+    name: str
+    rounds: int
+    ops_per_sec: float
+    mean_ms: float
+    min_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    # Size of the payload under test, for benchmarks comparing response formats
+    response_bytes: int | None = None
+
+    @classmethod
+    def from_samples(cls, name: str, samples: list[float]) -> "BenchmarkStats":
+        ordered = sorted(samples)
+
+        def pct(p: float) -> float:
+            return ordered[min(int(p * len(ordered)), len(ordered) - 1)] * 1000
+
+        return cls(
+            name=name,
+            rounds=len(samples),
+            ops_per_sec=len(samples) / sum(samples) if sum(samples) else 0.0,
+            mean_ms=statistics.fmean(samples) * 1000,
+            min_ms=ordered[0] * 1000,
+            p50_ms=pct(0.50),
+            p95_ms=pct(0.95),
+            p99_ms=pct(0.99),
+            max_ms=ordered[-1] * 1000,
+        )
+
+
+class BenchmarkSession:
+    """Collects results for a test session and checks them against a baseline."""
+
+    def __init__(self, rounds: int, baseline_path: str | None = None, tolerance: float = 0.25):
+        self.rounds = rounds
+        self.tolerance = tolerance
+        self.results: dict[str, BenchmarkStats] = {}
+        self.baseline: dict[str, dict] = {}
+        if baseline_path and Path(baseline_path).exists():
+            self.baseline = json.loads(Path(baseline_path).read_text())["benchmarks"]
+
+    async def run(
+        self,
+        name: str,
+        fn: Callable[[], Awaitable[object]],
+        rounds: int | None = None,
+        warmup: int = 5,
+        setup: Callable[[], object] | None = None,
+    ) -> BenchmarkStats:
+        """Run `fn` `rounds` times; `setup` runs before each round and is not timed."""
+        rounds = rounds or self.rounds
+        for _ in range(warmup):
+            if setup:
+                setup()
+            await fn()
+
+        samples = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - start)
+
+        stats = BenchmarkStats.from_samples(name, samples)
+        self.results[name] = stats
+        return stats
+
+    def record(self, stats: BenchmarkStats) -> None:
+        """Add stats measured outside `run` (e.g. against a live server) to the results."""
+        self.results[stats.name] = stats
+
+    def regression(self, stats: BenchmarkStats) -> str | None:
+        """Describe the regression if the median is slower than the baseline beyond the tolerance."""
+        previous = self.baseline.get(stats.name)
+        if not previous:
+            return None
+        limit = previous["p50_ms"] * (1 + self.tolerance)
+        if stats.p50_ms > limit:
+            return (
+                f"{stats.name}: p50 {stats.p50_ms:.3f}ms exceeds baseline {previous['p50_ms']:.3f}ms "
+                f"by more than {self.tolerance:.0%}"
+            )
+        return None
+
+    def save(self, path: str) -> None:
+        payload = {"benchmarks": {name: asdict(stats) for name, stats in sorted(self.results.items())}}
+        Path(path).write_text(json.dumps(payload, indent=2) + "\n")
+
+    def summary_lines(self) -> list[str]:
+        lines = [f"{'benchmark':<44} {'ops/s':>10} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)  bytes"]
+        for stats in self.results.values():
+            lines.append(
+                f"{stats.name:<44} {stats.ops_per_sec:>10.1f} {stats.mean_ms:>9.3f} "
+                f"{stats.p50_ms:>9.3f} {stats.p95_ms:>9.3f} {stats.p99_ms:>9.3f}"
+                + (f"  {stats.response_bytes:>10}" if stats.response_bytes is not None else "")
+            )
+        return lines
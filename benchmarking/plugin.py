@@ -0,0 +1,65 @@
+"""Pytest plugin: benchmark options, the `benchmark` marker and the harness fixtures."""
+
+import pytest
+
+from benchmarking.harness import BenchmarkSession
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark", action="store_true", help="Run the benchmark suite.")
+    group.addoption("--benchmark-rounds", type=int, default=200, help="Timed rounds per benchmark.")
+    group.addoption("--benchmark-scale", type=float, default=1.0, help="Multiplier for the seeded dataset size.")
+    group.addoption("--benchmark-json", help="Write results to this JSON file (usable as a baseline).")
+    group.addoption("--benchmark-compare", help="Fail benchmarks whose median regressed against this JSON baseline.")
+    group.addoption("--benchmark-tolerance", type=float, default=0.25, help="Allowed median regression ratio.")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: performance benchmark, only run with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    session = getattr(config, "_benchmark_session", None)
+    if session is None or not session.results:
+        return
+    terminalreporter.section("benchmarks")
+    for line in session.summary_lines():
+        terminalreporter.write_line(line)
+    if config.getoption("--benchmark-json"):
+        session.save(config.getoption("--benchmark-json"))
+        terminalreporter.write_line(f"results written to {config.getoption('--benchmark-json')}")
+
+
+@pytest.fixture(scope="session")
+def benchmark_session(pytestconfig) -> BenchmarkSession:
+    session = BenchmarkSession(
+        rounds=pytestconfig.getoption("--benchmark-rounds"),
+        baseline_path=pytestconfig.getoption("--benchmark-compare"),
+        tolerance=pytestconfig.getoption("--benchmark-tolerance"),
+    )
+    pytestconfig._benchmark_session = session
+    return session
+
+
+@pytest.fixture()
+def bench(benchmark_session: BenchmarkSession):
+    """Run a benchmark and fail the test if it regressed against the baseline."""
+
+    async def run(name, fn, **kwargs):
+        stats = await benchmark_session.run(name, fn, **kwargs)
+        regression = benchmark_session.regression(stats)
+        if regression:
+            pytest.fail(regression)
+        return stats
+
+    return run
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app import models, schemas
+from app.core import profiling, tracing
 from app.core.config import settings
 from app.db.session import get_db
 
@@ -17,23 +18,25 @@ reusable_oauth2 = OAuth2PasswordBearer(
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> models.User:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    with profiling.segment("auth"), tracing.span("get_current_user"):
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            token_data = schemas.TokenPayload(**payload)
+        except (JWTError, ValidationError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            ) from e
+        result = await db.execute(
+            select(models.User).where(models.User.id == int(token_data.sub))
         )
-        token_data = schemas.TokenPayload(**payload)
-    except (JWTError, ValidationError) as e:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        ) from e
-    result = await db.execute(
-        select(models.User).where(models.User.id == int(token_data.sub))
-    )
-    user = result.scalars().first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+        user = result.scalars().first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        tracing.set_attribute("enduser.id", user.id)
+        return user
 
 
 def get_current_active_user(
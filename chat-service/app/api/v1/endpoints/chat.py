@@ -1,6 +1,18 @@
+import asyncio
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -10,12 +22,26 @@ from jose import jwt
 
 from app import models, schemas
 from app.api import deps
+from app.core import tracing
 from app.core.config import settings
+from app.core.profiling import ProfiledRoute
+from app.core.responses import PydanticJSONResponse
+from app.db.replicas import get_read_db
 from app.db.session import get_db
+from app.services import search
+from app.services.attachments import (
+    AttachmentStore,
+    AttachmentTooLarge,
+    get_attachment_store,
+    sniff_image_type,
+    verify_signature,
+)
+from app.services.category_counts import adjust_counts
+from app.services.read_state import mark_read, record_message, unread_total
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 class ConnectionManager:
@@ -39,8 +65,14 @@ class ConnectionManager:
 
     async def broadcast_message(self, message: str, conv_id: int):
         if conv_id in self.active_connections:
-            for connection in self.active_connections[conv_id]:
-                await connection.send_text(message)
+            connections = self.active_connections[conv_id]
+            attributes = {
+                "conversation.id": conv_id,
+                "websocket.recipients": len(connections),
+            }
+            with tracing.span("chat.broadcast", **attributes):
+                for connection in connections:
+                    await connection.send_text(message)
 
 
 manager = ConnectionManager()
@@ -88,39 +120,84 @@ async def create_or_get_conversation(
     )
     db.add(conversation)
     await db.commit()
-    await db.refresh(conversation)
+    await db.refresh(conversation, ["messages"])
     return conversation
 
 
-@router.get("/conversations", response_model=list[schemas.Conversation])
+@router.get("/conversations", response_model=list[schemas.ConversationSummary])
 async def list_conversations(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
+    """
+    The user's inbox, latest activity first: conversation rows only, with their
+    unread counters; messages come with each conversation (GET /conversations/{id}).
+    """
     query = (
         select(models.Conversation)
         .where(
             (models.Conversation.buyer_id == current_user.id)
             | (models.Conversation.seller_id == current_user.id)
         )
-        .options(selectinload(models.Conversation.messages))
+        .order_by(
+            models.Conversation.last_message_at.desc(), models.Conversation.id.desc()
+        )
     )
 
     result = await db.execute(query)
-    return result.scalars().all()
+    return PydanticJSONResponse.validate(
+        list[schemas.ConversationSummary], result.scalars().all()
+    )
+
+
+@router.get("/unread", response_model=schemas.UnreadCount)
+async def count_unread(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Unread messages across the user's conversations, for the inbox badge."""
+    return {"unread": await unread_total(db, current_user.id)}
+
+
+@router.get("/search", response_model=schemas.MessageSearchResults)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    before_id: int | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Full-text search over the messages of the user's conversations, newest first.
+    Pages with `before_id` set to the previous page's `next_cursor`.
+    Archived messages (closed conversations, idle for MESSAGE_ARCHIVE_AFTER_DAYS)
+    are not searched.
+    """
+    items, next_cursor = await search.search_messages(
+        db, current_user.id, q, limit=limit, before_id=before_id
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/conversations/{conversation_id}", response_model=schemas.Conversation)
 async def get_conversation(
     conversation_id: int,
-    db: AsyncSession = Depends(get_db),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
+    """
+    A conversation with its messages. Messages moved to the archive (closed
+    conversations, idle for MESSAGE_ARCHIVE_AFTER_DAYS) come first, and only
+    with `include_archived`.
+    """
     query = (
         select(models.Conversation)
         .where(models.Conversation.id == conversation_id)
         .options(selectinload(models.Conversation.messages))
     )
+    if include_archived:
+        query = query.options(selectinload(models.Conversation.archived_messages))
 
     result = await db.execute(query)
     conversation = result.scalar_one_or_none()
@@ -134,7 +211,7 @@ async def get_conversation(
     ):
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    return conversation
+    return PydanticJSONResponse.validate(schemas.Conversation, conversation)
 
 
 @router.websocket("/conversations/{conversation_id}/ws")
@@ -214,6 +291,8 @@ async def create_message(
         )
 
     db.add(message)
+    await db.flush()
+    await record_message(db, conversation, message)
     await db.commit()
     await db.refresh(message)
 
@@ -223,6 +302,141 @@ async def create_message(
     return message
 
 
+@router.post(
+    "/conversations/{conversation_id}/read", response_model=schemas.ReadReceipt
+)
+async def mark_conversation_read(
+    conversation_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Mark the conversation as read by the current user; the other participant
+    gets a read receipt over the WebSocket."""
+    conversation = await db.get(models.Conversation, conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    if (
+        conversation.buyer_id != current_user.id
+        and conversation.seller_id != current_user.id
+    ):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    receipt = schemas.ReadReceipt(
+        conversation_id=conversation.id,
+        user_id=current_user.id,
+        last_read_id=await mark_read(db, conversation, current_user.id),
+    )
+    await manager.broadcast_message(receipt.model_dump_json(), conversation.id)
+    return receipt
+
+
+@router.post(
+    "/conversations/{conversation_id}/attachments", response_model=schemas.Message
+)
+async def create_attachment_message(
+    conversation_id: int,
+    file: UploadFile = File(...),
+    content: str = Form(""),
+    db: AsyncSession = Depends(get_db),
+    store: AttachmentStore = Depends(get_attachment_store),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Post a message with a file attached, sent as multipart/form-data.
+    The file is streamed to the attachment store; the message only carries
+    a reference, so it stays small when stored, listed and broadcast.
+    Request bodies over the size limit are cut off before they reach the
+    endpoint (see app.core.body_limit).
+    """
+
+    conversation = await db.get(models.Conversation, conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    if (
+        conversation.buyer_id != current_user.id
+        and conversation.seller_id != current_user.id
+    ):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    article = await db.get(models.Article, conversation.article_id)
+    if article and article.is_sold:
+        raise HTTPException(
+            status_code=403, detail="Item already sold. Chat is disabled."
+        )
+
+    try:
+        key, size = await asyncio.to_thread(
+            store.save, file.file, settings.ATTACHMENT_MAX_BYTES
+        )
+    except AttachmentTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+
+    message = models.Message(
+        conversation_id=conversation.id,
+        sender_id=current_user.id,
+        content=content,
+        attachment_key=key,
+        attachment_name=file.filename,
+        attachment_type=file.content_type or "application/octet-stream",
+        attachment_size=size,
+    )
+    db.add(message)
+    await db.flush()
+    await record_message(db, conversation, message)
+    await db.commit()
+    await db.refresh(message)
+
+    msg_schema = schemas.Message.model_validate(message)
+    await manager.broadcast_message(msg_schema.model_dump_json(), conversation.id)
+
+    return msg_schema
+
+
+@router.get("/attachments/{key}")
+async def download_attachment(
+    key: str,
+    expires: int,
+    signature: str,
+    db: AsyncSession = Depends(get_db),
+    store: AttachmentStore = Depends(get_attachment_store),
+) -> Any:
+    """
+    Download an attachment through the signed URL given in `attachment_url`.
+    Supports range requests (resumed downloads, media seeking).
+    """
+    if not verify_signature(key, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired link")
+
+    message = None
+    for model in (models.Message, models.ArchivedMessage):
+        result = await db.execute(select(model).where(model.attachment_key == key))
+        message = result.scalars().first()
+        if message:
+            break
+    path = store.path(key)
+    if not message or not path.is_file():
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    # Inline only for raster images, by content: the declared type comes from
+    # the uploader, and an inline SVG or HTML file would run script on our origin
+    image_type = sniff_image_type(await asyncio.to_thread(store.read_header, key))
+    headers = {
+        "Cache-Control": "private, max-age=3600",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if image_type:
+        headers["Content-Security-Policy"] = "sandbox"
+    return FileResponse(
+        path,
+        media_type=image_type or message.attachment_type,
+        filename=message.attachment_name or "attachment",
+        content_disposition_type="inline" if image_type else "attachment",
+        headers=headers,
+    )
+
+
 @router.post(
     "/conversations/{conversation_id}/checkout",
     response_model=schemas.PaymentSimulation,
@@ -255,7 +469,12 @@ async def mock_checkout(
         ),
     )
     db.add(system_msg)
+    await db.flush()
+    # Sent on the seller's behalf, but it is news for them: unread on their side
+    await record_message(db, conversation, system_msg, author_id=current_user.id)
 
+    if article.is_approved:
+        await adjust_counts(db, {article.category_id: -1})
     article.is_sold = True
     db.add(article)
     await db.commit()
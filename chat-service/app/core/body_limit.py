@@ -0,0 +1,54 @@
+"""
+Request body size limits.
+
+Multipart uploads are parsed, and their files spooled to disk, before the
+endpoint runs, so a limit checked in the endpoint comes too late to protect
+memory or disk. `BodySizeLimitMiddleware` enforces it as the body arrives: a
+declared Content-Length over the limit is rejected with 413 before anything is
+read, and a body that turns out larger (chunked, or lying about its length)
+stops being read at the limit, which also ends in a 413.
+"""
+
+import re
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_bytes: int, path_pattern: str):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_pattern = re.compile(path_pattern)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.path_pattern.fullmatch(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit():
+            if int(content_length) > self.max_bytes:
+                response = JSONResponse(
+                    {"detail": "Request body too large"}, status_code=413
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised into the body parser, which lets HTTPException through
+                    raise HTTPException(
+                        status_code=413, detail="Request body too large"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
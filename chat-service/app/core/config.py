@@ -12,11 +12,70 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "app"
     SQLALCHEMY_DATABASE_URI: str | None = None
 
+    # Read replicas, comma-separated URIs (see app.db.replicas)
+    REPLICA_DATABASE_URIS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+
     # Security
     SECRET_KEY: str = "YOUR_SECRET_KEY_HERE_CHANGE_IN_PRODUCTION"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Attachments (see app.services.attachments)
+    # Shared by every chat replica: docker-compose and k8s/chat.yml mount a volume here
+    ATTACHMENT_STORE_PATH: str = "attachments"
+    ATTACHMENT_MAX_BYTES: int = 25 * 1024 * 1024
+    ATTACHMENT_URL_TTL_SECONDS: int = 3600
+
+    # Message archive (see app.services.archive)
+    MESSAGE_ARCHIVE_ENABLED: bool = True
+    # Conversations of sold articles, idle this long, move to the archive
+    MESSAGE_ARCHIVE_AFTER_DAYS: int = 90
+    MESSAGE_ARCHIVE_BATCH_SIZE: int = 1000
+    MESSAGE_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+
+    # Server (see app.serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8001
+    # Live chat broadcasts go through an in-process connection manager, so all
+    # WebSockets of a conversation must share a worker: keep a single one.
+    SERVER_WORKERS: int = 1
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    SERVER_BACKLOG: int = 2048
+    # Longer than the ingress proxy's upstream idle timeout (Traefik: 90s), so
+    # the proxy never reuses a connection the server is closing
+    SERVER_KEEPALIVE_SECONDS: int = 95
+
+    # Response compression (see app.core.compression)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    # Brotli quality above ~5 costs far more CPU than it saves on dynamic responses
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Health probes (see app.core.health)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MIN_POOL_HEADROOM: int = 1
+
+    # Request profiling (see app.core.profiling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+    # Tracing (see app.core.tracing)
+    TRACING_ENABLED: bool = False
+    # Share of new traces recorded; requests continuing a trace follow the caller
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_SERVICE_NAME: str = "chat-service"
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE: str = "traces/spans.jsonl"
+
     @property
     def database_url(self) -> str:
         if self.SQLALCHEMY_DATABASE_URI:
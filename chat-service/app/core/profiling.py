@@ -0,0 +1,260 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when profiling is enabled and either it carries the
+profiling header from an admin (checked before profiling starts), or it is
+picked by the sampling rate. While it runs, a background thread samples the
+event loop thread's stack; the samples are written in folded-stack format (one
+`frame;frame;frame count` line per stack, as consumed by flamegraph.pl /
+speedscope) next to a JSON summary, off the event loop.
+
+The event loop thread runs every request of the worker, so the samples also
+catch whatever other requests run concurrently with the profiled one: read
+flamegraphs from a busy worker with that in mind, or profile at low load. The
+segment breakdown below is exact per request.
+
+Each profiled request's time is also broken down into segments:
+- db: time spent in cursor execution (recorded by the engine event hooks)
+- auth: token validation and user lookup, excluding its DB time
+- handler: endpoint body, excluding its DB time
+- serialization: from the endpoint's return to the response start (validation + JSON)
+Admins requesting a profile get the breakdown back in a `Server-Timing` header.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar(
+    "current_profile", default=None
+)
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    segments: dict[str, float] = field(
+        default_factory=lambda: {"db": 0.0, "auth": 0.0, "handler": 0.0}
+    )
+    handler_end: float | None = None
+
+    def server_timing(self, response_start: float) -> str:
+        timings = dict(self.segments)
+        if self.handler_end is not None:
+            timings["serialization"] = response_start - self.handler_end
+        timings["total"] = response_start - self.started
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()
+        )
+
+
+def record_db_time(seconds: float) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.segments["db"] += seconds
+
+
+@contextmanager
+def segment(name: str):
+    """Attribute the enclosed time to `name`, minus the DB time spent inside it."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    db_before = profile.segments["db"]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (profile.segments["db"] - db_before)
+        profile.segments[name] = profile.segments.get(name, 0.0) + max(elapsed, 0.0)
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that times the endpoint body for the `handler` segment."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            super().__init__(path, endpoint, **kwargs)
+            return
+
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kw):
+            try:
+                with segment("handler"):
+                    return await endpoint(*args, **kw)
+            finally:
+                profile = _current_profile.get()
+                if profile is not None:
+                    profile.handler_end = time.perf_counter()
+
+        super().__init__(path, timed_endpoint, **kwargs)
+
+
+class StackSampler:
+    """
+    Periodically sample one thread's Python stack from a background thread.
+    The whole thread is sampled, not one task: concurrent requests on the event
+    loop show up too.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+def _bearer_token(scope) -> str | None:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" and token else None
+    return None
+
+
+async def _is_admin(scope) -> bool:
+    """Resolve the bearer token to its user, as `get_current_user` does."""
+    token = _bearer_token(scope)
+    if not token:
+        return False
+    from fastapi import HTTPException
+
+    from app.api.deps import get_current_user
+    from app.db.session import get_db
+
+    # Honour dependency overrides so the lookup uses the same database as the routes
+    sessions = scope["app"].dependency_overrides.get(get_db, get_db)()
+    try:
+        user = await get_current_user(db=await anext(sessions), token=token)
+    except HTTPException:
+        return False
+    finally:
+        await sessions.aclose()
+    return user.role == "admin"
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware, so the profile context is shared with the endpoint
+    and its dependencies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        header = settings.PROFILING_HEADER.lower().encode()
+        requested = any(
+            name == header and value not in (b"", b"0")
+            for name, value in scope.get("headers", [])
+        )
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE  # noqa: S311 — sampling, not security
+        # Authorized up front, so the lookup is neither repeated nor part of the profile
+        admin = requested and await _is_admin(scope)
+        if not (admin or sampled):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        sampler = StackSampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000
+        )
+        sampler.start()
+        profile_id = uuid.uuid4().hex[:12]
+        state = {"timing": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["timing"] = profile.server_timing(time.perf_counter())
+                if admin:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", state["timing"].encode()))
+                    headers.append((b"x-profile-id", profile_id.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            # Stopping joins the sampler thread, so it happens off the loop too
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, scope, profile_id, profile, sampler, state["timing"]
+            )
+
+    @staticmethod
+    def _write(
+        scope,
+        profile_id: str,
+        profile: RequestProfile,
+        sampler: StackSampler,
+        timing: str | None,
+    ) -> None:
+        stacks = sampler.stop()
+        output_dir = Path(settings.PROFILING_OUTPUT_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        base = output_dir / f"{int(time.time())}-{scope['method']}-{slug}-{profile_id}"
+        base.with_suffix(".folded").write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+        )
+        summary = {
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "server_timing": timing,
+            "segments_ms": {
+                name: round(seconds * 1000, 3)
+                for name, seconds in profile.segments.items()
+            },
+            "samples": sum(stacks.values()),
+        }
+        base.with_suffix(".json").write_text(json.dumps(summary, indent=2))
+        logger.info("Request profile written: %s", summary)
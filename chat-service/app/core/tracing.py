@@ -0,0 +1,337 @@
+"""
+Request tracing.
+
+Spans follow the OpenTelemetry data model and propagate with W3C Trace
+Context: a `traceparent` header continues the caller's trace (browsers cannot
+set WebSocket headers, so a `traceparent` query parameter works for those
+too), and every response returns its server span in a `traceresponse` header.
+Within a process the current span lives in a context variable, so spans nest
+across middleware, dependencies and database hooks without being passed
+around.
+
+`TracingMiddleware` opens a server span per HTTP request and WebSocket
+connection, `span()` opens child spans (dependencies, bcrypt, fraud checks)
+and the engine's cursor hooks open one per SQL statement (see
+app.db.session). New traces are sampled at TRACING_SAMPLE_RATE and callers'
+sampling decisions are honoured; unsampled requests create no spans.
+
+Finished spans go to a background thread that hands them in batches to the
+exporter named by TRACING_EXPORTER, so requests never wait on I/O. The
+built-in "file" exporter appends one JSON span per line to TRACING_FILE, as
+a stand-in for a collector. Other exporters implement `SpanExporter` and are
+registered with `register_exporter`.
+"""
+
+import json
+import logging
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SPANS_DROPPED = Counter(
+    "tracing_spans_dropped_total",
+    "Finished spans dropped because the export queue was full",
+)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    parent_id: str | None = None
+    # "server", "client" or "internal", as in OpenTelemetry
+    kind: str = "internal"
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    error: bool = False
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def end(self, error: BaseException | None = None) -> None:
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = True
+            self.attributes["exception.type"] = type(error).__name__
+            self.attributes["exception.message"] = str(error)
+        _export_queue.submit(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "resource": {"service.name": settings.TRACING_SERVICE_NAME},
+        }
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """(trace id, parent span id, sampled) from a `traceparent` value.
+
+    None if absent or malformed.
+    """
+    match = _TRACEPARENT.match(value.strip().lower()) if value else None
+    if match is None or match[1] == "0" * 32 or match[2] == "0" * 16:
+        return None
+    return match[1], match[2], bool(int(match[3], 16) & 1)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Set an attribute on the current span, if the request is traced."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
+
+
+def start_span(name: str, kind: str = "internal", **attributes: Any) -> Span | None:
+    """A child of the current span, not made current; the caller ends it.
+
+    None if the request is not traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(
+        name,
+        parent.trace_id,
+        parent_id=parent.span_id,
+        kind=kind,
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span | None]:
+    """Trace the enclosed block as a child of the current span."""
+    child = start_span(name, kind, **attributes)
+    if child is None:
+        yield None
+        return
+    token = _current_span.set(child)
+    error = None
+    try:
+        yield child
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end(error)
+
+
+def _server_span(scope: Scope) -> Span | None:
+    traceparent = Headers(scope=scope).get("traceparent")
+    if traceparent is None and scope["type"] == "websocket":
+        traceparent = next(
+            iter(
+                parse_qs(scope.get("query_string", b"").decode("latin-1")).get(
+                    "traceparent", []
+                )
+            ),
+            None,
+        )
+    incoming = parse_traceparent(traceparent)
+    if incoming is not None:
+        trace_id, parent_id, sampled = incoming
+        if not sampled:
+            return None
+    elif random.random() < settings.TRACING_SAMPLE_RATE:  # noqa: S311 — sampling, not security
+        trace_id, parent_id = secrets.token_hex(16), None
+    else:
+        return None
+    method = scope.get("method", "WS")
+    return Span(
+        method,
+        trace_id,
+        parent_id=parent_id,
+        kind="server",
+        attributes={"http.request.method": method, "url.path": scope["path"]},
+    )
+
+
+def _route_template(scope: Scope) -> str | None:
+    """The matched path with placeholders for its parameters; None if unrouted.
+
+    e.g. /conversations/{conversation_id}/messages
+    """
+    if "endpoint" not in scope:
+        return None
+    placeholders = {
+        str(value): f"{{{name}}}"
+        for name, value in scope.get("path_params", {}).items()
+    }
+    return "/".join(
+        placeholders.get(segment, segment) for segment in scope["path"].split("/")
+    )
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware, so the server span is current in endpoints."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        server_span = None
+        if scope["type"] in ("http", "websocket") and settings.TRACING_ENABLED:
+            server_span = _server_span(scope)
+        if server_span is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                server_span.attributes["http.response.status_code"] = message["status"]
+                server_span.error = message["status"] >= 500
+                headers = [
+                    *message.get("headers", []),
+                    (b"traceresponse", server_span.traceparent.encode()),
+                ]
+                message = {**message, "headers": headers}
+            elif message["type"] == "websocket.close":
+                server_span.attributes["websocket.close_code"] = message.get(
+                    "code", 1000
+                )
+            await send(message)
+
+        token = _current_span.set(server_span)
+        error = None
+        try:
+            await self.app(scope, receive, send_with_trace)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            # Name by route template rather than path, so one endpoint's spans group
+            route = _route_template(scope)
+            method = server_span.attributes["http.request.method"]
+            server_span.name = f"{method} {route}" if route else method
+            if route:
+                server_span.attributes["http.route"] = route
+            server_span.end(error)
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[dict]) -> None:
+        """Send a batch of finished spans. Runs on the export thread: may block."""
+
+
+class FileSpanExporter(SpanExporter):
+    """One JSON span per line, appended to a file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, spans: list[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.writelines(
+                json.dumps(span, separators=(",", ":"), default=str) + "\n"
+                for span in spans
+            )
+
+
+_EXPORTERS: dict[str, Callable[[], SpanExporter]] = {
+    "file": lambda: FileSpanExporter(settings.TRACING_FILE),
+}
+
+
+def register_exporter(name: str, factory: Callable[[], SpanExporter]) -> None:
+    _EXPORTERS[name] = factory
+
+
+@lru_cache
+def get_exporter() -> SpanExporter:
+    try:
+        factory = _EXPORTERS[settings.TRACING_EXPORTER]
+    except KeyError:
+        raise RuntimeError(
+            f"Unknown TRACING_EXPORTER: {settings.TRACING_EXPORTER!r}"
+        ) from None
+    return factory()
+
+
+class _ExportQueue:
+    """Finished spans, exported in batches by a daemon thread started on demand."""
+
+    def __init__(self, max_size: int = 10_000, batch_size: int = 512):
+        self.batch_size = batch_size
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=max_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, span: Span) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="span-exporter", daemon=True
+                    )
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            SPANS_DROPPED.inc()
+
+    def flush(self) -> None:
+        """Wait until every span submitted so far is exported."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                get_exporter().export([span.to_dict() for span in batch])
+            except Exception:
+                logger.exception("Exporting %d spans failed", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_export_queue = _ExportQueue()
+flush = _export_queue.flush
@@ -0,0 +1,212 @@
+"""
+Read replicas.
+
+Read-only endpoints take their session from `get_read_db`, which picks one of
+the REPLICA_DATABASE_URIS engines round-robin, and falls back to the primary
+session (`get_db`) when:
+- no replica is configured, or every replica lags more than
+  REPLICA_MAX_LAG_SECONDS (lag is measured in the background every
+  REPLICA_LAG_CHECK_INTERVAL_SECONDS; an unreachable replica counts as lagging);
+- the requesting user made a write less than READ_YOUR_WRITES_SECONDS ago,
+  so they always see their own changes.
+
+Writers are tracked per worker process by `ReadYourWritesMiddleware`, from
+the bearer token of successful non-GET requests. With several workers a
+user's next read may land on another worker; REPLICA_MAX_LAG_SECONDS bounds
+how stale that read can be.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+
+from fastapi import Depends, Request
+from jose import JWTError, jwt
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.session import get_db, instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# Replay delay of a streaming replica; 0 when it has replayed everything it received,
+# so an idle primary does not look like lag
+_POSTGRES_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def requester_id(headers: Headers) -> int | None:
+    """User id from the request's bearer token (no DB lookup), or None."""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return int(
+            jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])[
+                "sub"
+            ]
+        )
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        # Seconds behind the primary at the last check; None if unchecked or unreachable
+        self.lag: float | None = None
+
+    async def check_lag(self, timeout: float) -> float | None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as conn:
+                    if self.engine.dialect.name == "postgresql":
+                        self.lag = float(await conn.scalar(_POSTGRES_LAG) or 0.0)
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        self.lag = 0.0
+        except Exception as e:
+            if self.lag is not None:
+                logger.warning(
+                    "Replica %s unreachable: %s", self.engine.url.render_as_string(), e
+                )
+            self.lag = None
+        return self.lag
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag: float,
+        read_your_writes: float,
+        interval: float,
+    ):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.read_your_writes = read_your_writes
+        self.interval = interval
+        self._next = itertools.count()
+        # user id -> monotonic time until which their reads go to the primary
+        self._recent_writers: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def mark_write(self, user_id: int) -> None:
+        now = time.monotonic()
+        self._recent_writers[user_id] = now + self.read_your_writes
+        if len(self._recent_writers) > 10_000:
+            self._recent_writers = {
+                user: until
+                for user, until in self._recent_writers.items()
+                if until > now
+            }
+
+    def choose(self, user_id: int | None) -> Replica | None:
+        """A replica to read from, or None to read from the primary."""
+        if (
+            user_id is not None
+            and self._recent_writers.get(user_id, 0.0) > time.monotonic()
+        ):
+            return None
+        healthy = [
+            r for r in self.replicas if r.lag is not None and r.lag <= self.max_lag
+        ]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check_once(self) -> None:
+        await asyncio.gather(
+            *(replica.check_lag(timeout=self.interval) for replica in self.replicas)
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_once()
+
+    async def start(self) -> None:
+        """Measure lag once, so replicas serve reads right away, then keep measuring."""
+        if not self.replicas:
+            return
+        await self.check_once()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-lag")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _create_replica(uri: str) -> Replica:
+    engine = create_async_engine(uri)
+    instrument_engine(engine)
+    return Replica(engine)
+
+
+replica_set = ReplicaSet(
+    [
+        _create_replica(uri.strip())
+        for uri in settings.REPLICA_DATABASE_URIS.split(",")
+        if uri.strip()
+    ],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    read_your_writes=settings.READ_YOUR_WRITES_SECONDS,
+    interval=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+
+
+async def get_read_db(
+    request: Request, primary: AsyncSession = Depends(get_db)
+) -> AsyncIterator[AsyncSession]:
+    """Session for read-only endpoints: a fresh enough replica, else the primary."""
+    replica = (
+        replica_set.choose(requester_id(request.headers))
+        if replica_set.replicas
+        else None
+    )
+    if replica is None:
+        yield primary
+        return
+    async with replica.session() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Route a user's reads to the primary for a while after each of their writes."""
+
+    def __init__(self, app: ASGIApp, replicas: ReplicaSet = replica_set):
+        self.app = app
+        self.replicas = replicas
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or not self.replicas.replicas
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_mark(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                user_id = requester_id(Headers(scope=scope))
+                if user_id is not None:
+                    self.replicas.mark_write(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_and_mark)
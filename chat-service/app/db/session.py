@@ -5,6 +5,7 @@ from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.core import profiling, tracing
 from app.core.config import settings
 
 engine = create_async_engine(settings.database_url, echo=True)
@@ -16,16 +17,49 @@ DB_QUERY_DURATION = Histogram(
 )
 
 
-@event.listens_for(engine.sync_engine, "before_cursor_execute")
 def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    # Statement text only: parameters may hold message contents
+    conn.info.setdefault("query_span", []).append(
+        tracing.start_span(
+            "db.query",
+            kind="client",
+            **{"db.system": conn.dialect.name, "db.statement": statement},
+        )
+    )
 
 
-@event.listens_for(engine.sync_engine, "after_cursor_execute")
 def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     start_time = conn.info["query_start_time"].pop(-1)
     duration = time.perf_counter() - start_time
     DB_QUERY_DURATION.observe(duration)
+    profiling.record_db_time(duration)
+    span = conn.info["query_span"].pop(-1)
+    if span is not None:
+        span.end()
+
+
+def handle_error(context):
+    """Drop the failed statement's timing, so the next statement does not pick it up."""
+    conn = context.connection
+    if conn is None or not conn.info.get("query_start_time"):
+        return
+    conn.info["query_start_time"].pop(-1)
+    span = conn.info["query_span"].pop(-1)
+    if span is not None:
+        span.end(context.original_exception)
+
+
+def instrument_engine(async_engine) -> None:
+    """Attach the query hooks (Prometheus, request profiling, tracing) to an engine."""
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    event.listen(async_engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(async_engine.sync_engine, "handle_error", handle_error)
+
+
+instrument_engine(engine)
 
 
 async def get_db():
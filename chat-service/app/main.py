@@ -3,14 +3,85 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
+from sqlalchemy import Index, inspect, text
+from sqlalchemy.schema import CreateIndex
 
+from app import models
 from app.api.v1.router import api_router
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.db.session import Base, engine
+from app.core.health import HealthMonitor
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import TracingMiddleware
+from app.db.replicas import ReadYourWritesMiddleware, replica_set
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.services.archive import MessageArchiver
 
 logger = logging.getLogger(__name__)
 
+health_monitor = HealthMonitor(
+    engine,
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_DB_TIMEOUT_SECONDS,
+)
+message_archiver = MessageArchiver(
+    AsyncSessionLocal,
+    after_days=settings.MESSAGE_ARCHIVE_AFTER_DAYS,
+    batch_size=settings.MESSAGE_ARCHIVE_BATCH_SIZE,
+    interval=settings.MESSAGE_ARCHIVE_INTERVAL_SECONDS,
+)
+
+# (table, column) -> type of the column, added to databases created before it
+_MIGRATIONS = {
+    ("messages", "file_url"): "TEXT",
+    ("articles", "is_sold"): "BOOLEAN DEFAULT FALSE",
+    ("messages", "attachment_key"): "VARCHAR(32)",
+    ("messages", "attachment_name"): "VARCHAR",
+    ("messages", "attachment_type"): "VARCHAR",
+    ("messages", "attachment_size"): "INTEGER",
+    ("conversations", "last_message_at"): "TIMESTAMP",
+    ("conversations", "buyer_unread"): "INTEGER NOT NULL DEFAULT 0",
+    ("conversations", "seller_unread"): "INTEGER NOT NULL DEFAULT 0",
+    ("conversations", "buyer_last_read_id"): "INTEGER",
+    ("conversations", "seller_last_read_id"): "INTEGER",
+}
+
+
+async def _create_indexes(indexes: list[Index]) -> None:
+    """
+    Create the indexes missing from existing tables (create_all only indexes
+    new tables). On Postgres they are built CONCURRENTLY, outside a
+    transaction, so the table stays writable while a new index builds.
+    """
+    if engine.dialect.name != "postgresql":
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+        return
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for index in indexes:
+            # An interrupted concurrent build leaves an invalid index behind,
+            # which IF NOT EXISTS would keep
+            invalid = await conn.scalar(
+                text(
+                    "SELECT NOT indisvalid FROM pg_index"
+                    " WHERE indexrelid = to_regclass(:name)"
+                ),
+                {"name": index.name},
+            )
+            if invalid:
+                await conn.exec_driver_sql(
+                    f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'
+                )
+            ddl = CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect)
+            await conn.exec_driver_sql(
+                str(ddl).replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+            )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -28,23 +99,57 @@ async def lifespan(app: FastAPI):
             else:
                 raise
 
-    # Run lightweight migration for file_url column
-    from sqlalchemy import text
-
+    # Add the columns missing from tables created before them (create_all only
+    # creates new tables). ALTER TABLE locks the table even when the column
+    # exists, so it only runs for missing columns.
     async with engine.begin() as conn:
         try:
-            await conn.execute(
-                text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS file_url TEXT;")
+            missing = await conn.run_sync(
+                lambda sync_conn: [
+                    (table, column)
+                    for table, column in _MIGRATIONS
+                    if column
+                    not in {c["name"] for c in inspect(sync_conn).get_columns(table)}
+                ]
             )
-            await conn.execute(
-                text(
-                    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS is_sold BOOLEAN DEFAULT FALSE;"
+            for table, column in missing:
+                column_type = _MIGRATIONS[table, column]
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type};"
+                    )
                 )
+            if ("conversations", "last_message_at") in missing:
+                # Existing conversations start with their latest activity
+                await conn.execute(
+                    text(
+                        "UPDATE conversations SET last_message_at = COALESCE("
+                        "(SELECT MAX(created_at) FROM messages"
+                        " WHERE messages.conversation_id = conversations.id),"
+                        " created_at);"
+                    )
+                )
+            logger.info(
+                "Migration: columns ensured on messages, articles and conversations."
             )
-            logger.info("Migration: columns ensured on messages and articles tables.")
         except Exception as e:
             logger.warning(f"Migration warning (non-fatal): {e}")
+
+    try:
+        await _create_indexes(
+            [*models.Conversation.__table__.indexes, *models.Message.__table__.indexes]
+        )
+    except Exception as e:
+        logger.warning(f"Index creation warning (non-fatal): {e}")
+
+    await health_monitor.start()
+    await replica_set.start()
+    if settings.MESSAGE_ARCHIVE_ENABLED:
+        await message_archiver.start()
     yield
+    await message_archiver.stop()
+    await replica_set.stop()
+    await health_monitor.stop()
 
 
 app = FastAPI(
@@ -55,10 +160,32 @@ app = FastAPI(
 
 
 @app.get("/health")
+@app.get("/health/live", include_in_schema=False)
 async def health_check():
+    """Liveness probe: the process is serving requests. No I/O."""
     return {"status": "ok"}
 
 
+@app.get("/health/ready", include_in_schema=False)
+async def readiness():
+    """Readiness probe: last background database check and pool headroom."""
+    ready, body = health_monitor.readiness()
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+# Innermost, so profiles only cover the application itself
+app.add_middleware(ProfilingMiddleware)
+
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Attachments are capped while their body arrives, before it is parsed and spooled;
+# the margin leaves room for the multipart framing and the message text
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.ATTACHMENT_MAX_BYTES + 64 * 1024,
+    path_pattern=rf"{settings.API_V1_STR}/chat/conversations/\d+/attachments",
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -74,6 +201,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Instrumentator().instrument(app).expose(app)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Outermost, so server spans cover the whole request, compression included
+app.add_middleware(TracingMiddleware)
+
+# Probes would otherwise dominate the request metrics
+instrumentator = Instrumentator(excluded_handlers=["/metrics", "/health.*"])
+instrumentator.instrument(app).expose(app)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,14 +1,20 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    event,
+    func,
+    inspect,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -20,6 +26,7 @@ class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
+    role = Column(String, default="buyer")
     is_active = Column(Boolean, default=True)
 
 
@@ -30,7 +37,17 @@ class Article(Base):
     price = Column(Float, nullable=False)
     shipping_cost = Column(Float, default=0.0)
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    is_approved = Column(Boolean, default=False)
     is_sold = Column(Boolean, default=False)
+    category_id = Column(Integer, nullable=True)
+
+
+class CategoryCount(Base):
+    """Live listings per category, maintained with the backend."""
+
+    __tablename__ = "category_counts"
+    category_id = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
 
 
 class Conversation(Base):
@@ -41,6 +58,13 @@ class Conversation(Base):
     buyer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Inbox state, updated with every message (see app.services.read_state)
+    last_message_at = Column(DateTime, default=datetime.utcnow)
+    buyer_unread = Column(Integer, nullable=False, default=0, server_default="0")
+    seller_unread = Column(Integer, nullable=False, default=0, server_default="0")
+    # Last message each participant has read, for read receipts
+    buyer_last_read_id = Column(Integer, nullable=True)
+    seller_last_read_id = Column(Integer, nullable=True)
 
     article = relationship("Article")
     buyer = relationship("User", foreign_keys=[buyer_id])
@@ -48,17 +72,112 @@ class Conversation(Base):
     messages = relationship(
         "Message", back_populates="conversation", cascade="all, delete-orphan"
     )
+    # Messages moved out of `messages` by app.services.archive
+    archived_messages = relationship(
+        "ArchivedMessage", order_by="ArchivedMessage.id", viewonly=True
+    )
+
+    @property
+    def history(self) -> list:
+        """Archived messages, if they were loaded, then live messages."""
+        if "archived_messages" in inspect(self).unloaded:
+            return list(self.messages)
+        return [*self.archived_messages, *self.messages]
+
+
+# Inboxes: a participant's conversations by latest activity
+Index(
+    "ix_conversations_buyer_activity",
+    Conversation.buyer_id,
+    Conversation.last_message_at,
+)
+Index(
+    "ix_conversations_seller_activity",
+    Conversation.seller_id,
+    Conversation.last_message_at,
+)
 
 
 class Message(Base):
     __tablename__ = "messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
+    conversation_id = Column(
+        Integer, ForeignKey("conversations.id"), nullable=False, index=True
+    )
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
     file_url = Column(Text, nullable=True)
+    # Streamed attachment: key in the attachment store plus its metadata
+    attachment_key = Column(String(32), nullable=True, index=True)
+    attachment_name = Column(String, nullable=True)
+    attachment_type = Column(String, nullable=True)
+    attachment_size = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     conversation = relationship("Conversation", back_populates="messages")
     sender = relationship("User", foreign_keys=[sender_id])
+
+
+class ArchivedMessage(Base):
+    """Cold storage for messages of closed conversations, ids kept."""
+
+    __tablename__ = "messages_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    conversation_id = Column(
+        Integer, ForeignKey("conversations.id"), nullable=False, index=True
+    )
+    sender_id = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    file_url = Column(Text, nullable=True)
+    attachment_key = Column(String(32), nullable=True, index=True)
+    attachment_name = Column(String, nullable=True)
+    attachment_type = Column(String, nullable=True)
+    attachment_size = Column(Integer, nullable=True)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Full-text index on message content (see app.services.search).
+# Postgres: GIN over the tsvector, the query must use the same expression.
+TEXT_SEARCH_CONFIG = text("'simple'::regconfig")
+message_document = func.to_tsvector(TEXT_SEARCH_CONFIG, Message.content)
+Index("ix_messages_content_fts", message_document, postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+
+# SQLite: an FTS5 table indexing `messages`, kept in sync by triggers
+SQLITE_FTS_TABLE = "messages_fts"
+for statement in (
+    (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} "
+        "USING fts5(content, content='messages', content_rowid='id')"
+    ),
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+    (
+        "CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages "
+        f"BEGIN INSERT INTO {SQLITE_FTS_TABLE}(rowid, content) "
+        "VALUES (new.id, new.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages "
+        f"BEGIN INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, content) "
+        "VALUES ('delete', old.id, old.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF content "
+        f"ON messages BEGIN INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, "
+        "content) VALUES ('delete', old.id, old.content); "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, content) "
+        "VALUES (new.id, new.content); END"
+    ),
+):
+    event.listen(
+        Message.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Message.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
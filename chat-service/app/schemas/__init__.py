@@ -1,21 +1,53 @@
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import AliasChoices, BaseModel, Field, computed_field, field_validator
+
+from app.services.attachments import signed_url
 
 
 class TokenPayload(BaseModel):
     sub: str | None = None
 
 
-class MessageCreate(BaseModel):
+# Longest link accepted in a message's file_url
+FILE_URL_MAX_LENGTH = 2048
+
+
+class MessageBase(BaseModel):
     content: str | None = ""
     file_url: str | None = None
 
 
-class Message(MessageCreate):
+class MessageCreate(MessageBase):
+    # A link only: files are uploaded to /conversations/{id}/attachments
+    file_url: str | None = Field(default=None, max_length=FILE_URL_MAX_LENGTH)
+
+    @field_validator("file_url")
+    @classmethod
+    def reject_inline_files(cls, value: str | None) -> str | None:
+        if value is not None and value.lstrip().lower().startswith("data:"):
+            raise ValueError(
+                "inline files are not accepted, upload them as attachments"
+            )
+        return value
+
+
+class Message(MessageBase):
     id: int
     conversation_id: int
     sender_id: int
     created_at: datetime
+    attachment_key: str | None = Field(default=None, exclude=True)
+    attachment_name: str | None = None
+    attachment_type: str | None = None
+    attachment_size: int | None = None
+
+    @computed_field
+    @property
+    def attachment_url(self) -> str | None:
+        """Signed, short-lived download URL for the attachment."""
+        return signed_url(self.attachment_key) if self.attachment_key else None
 
     class Config:
         from_attributes = True
@@ -25,18 +57,62 @@ class ConversationCreate(BaseModel):
     article_id: int
 
 
-class Conversation(BaseModel):
+class ConversationSummary(BaseModel):
+    """An inbox entry: the conversation row, without its messages."""
+
     id: int
     article_id: int
     buyer_id: int
     seller_id: int
     created_at: datetime
-    messages: list[Message] = []
+    last_message_at: datetime | None = None
+    buyer_unread: int = 0
+    seller_unread: int = 0
+    buyer_last_read_id: int | None = None
+    seller_last_read_id: int | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class Conversation(ConversationSummary):
+    # Live messages, after the archived ones when loaded (the model's `history`)
+    messages: list[Message] = Field(
+        default=[], validation_alias=AliasChoices("history", "messages")
+    )
 
     class Config:
         from_attributes = True
 
 
+class ReadReceipt(BaseModel):
+    """Broadcast to the conversation when a participant reads it."""
+
+    type: Literal["read"] = "read"
+    conversation_id: int
+    user_id: int
+    last_read_id: int | None = None
+
+
+class UnreadCount(BaseModel):
+    unread: int
+
+
+class MessageSearchHit(BaseModel):
+    id: int
+    conversation_id: int
+    sender_id: int
+    created_at: datetime
+    # HTML-escaped excerpt, matched terms wrapped in <mark>
+    snippet: str
+
+
+class MessageSearchResults(BaseModel):
+    items: list[MessageSearchHit]
+    # Pass as `before_id` to get the next page; None on the last page
+    next_cursor: int | None = None
+
+
 class PaymentSimulation(BaseModel):
     amount: float
     success: bool
@@ -0,0 +1,74 @@
+"""
+Production entry point: `python -m app.serve`.
+
+Runs the chat service under uvicorn with uvloop and httptools when installed
+(they are part of uvicorn[standard]), with keep-alive and the listen backlog
+from settings. SERVER_WORKERS defaults to 1: live broadcasts only reach
+WebSockets connected to the same process, so more workers need a shared
+pub/sub first.
+"""
+
+import importlib.util
+import logging
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _pick(setting: str, preferred: str, module: str) -> str:
+    """Resolve "auto" to the fast implementation when its module is installed."""
+    if setting != "auto":
+        return setting
+    return preferred if importlib.util.find_spec(module) else "auto"
+
+
+def _prepare_metrics_dir() -> None:
+    """Point prometheus_client at an empty directory shared by the workers."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        # Stale files from a previous run would be summed into the new metrics
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    else:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    workers = max(settings.SERVER_WORKERS, 1)
+    if workers > 1:
+        logger.warning(
+            "Live chat broadcasts do not cross workers (SERVER_WORKERS=%d)", workers
+        )
+    if workers > 1 or "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        _prepare_metrics_dir()
+    loop = _pick(settings.SERVER_LOOP, "uvloop", "uvloop")
+    http = _pick(settings.SERVER_HTTP, "httptools", "httptools")
+    logger.info(
+        "Starting %d worker(s) on %s:%d (loop=%s, http=%s)",
+        workers,
+        settings.SERVER_HOST,
+        settings.SERVER_PORT,
+        loop,
+        http,
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    main()
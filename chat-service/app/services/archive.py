@@ -0,0 +1,138 @@
+"""
+Message archive.
+
+Messages of closed conversations (article sold or gone) without activity for
+MESSAGE_ARCHIVE_AFTER_DAYS move from `messages` to `messages_archive`, so the
+hot table only holds live conversations and stays small. Each batch copies
+up to MESSAGE_ARCHIVE_BATCH_SIZE messages and deletes them in one
+transaction, keeping their ids. Only a conversation's own page reads the
+archive back, when asked with `include_archived` (see `Conversation.history`);
+the inbox and full-text search only cover live messages (see
+app.services.search).
+
+`MessageArchiver` runs the batches every MESSAGE_ARCHIVE_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from prometheus_client import Counter
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_ARCHIVED = Counter(
+    "messages_archived_total", "Messages moved to the archive table"
+)
+
+_COLUMNS = (
+    "id",
+    "conversation_id",
+    "sender_id",
+    "content",
+    "file_url",
+    "attachment_key",
+    "attachment_name",
+    "attachment_type",
+    "attachment_size",
+    "created_at",
+)
+
+
+async def archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    """Move one batch of archivable messages, and commit. Returns how many moved."""
+    Message, Conversation, Article = (
+        models.Message,
+        models.Conversation,
+        models.Article,
+    )
+    ids = (
+        await db.scalars(
+            select(Message.id)
+            .join(Conversation, Conversation.id == Message.conversation_id)
+            .outerjoin(Article, Article.id == Conversation.article_id)
+            .where(
+                Conversation.last_message_at < cutoff,
+                or_(Article.id.is_(None), Article.is_sold.is_(True)),
+            )
+            .order_by(Message.id)
+            .limit(batch_size)
+            # Concurrent archivers (one per replica) take disjoint batches
+            .with_for_update(of=Message, skip_locked=True)
+        )
+    ).all()
+    if not ids:
+        return 0
+    columns = [getattr(Message, name) for name in _COLUMNS]
+    await db.execute(
+        insert(models.ArchivedMessage).from_select(
+            list(_COLUMNS), select(*columns).where(Message.id.in_(ids))
+        )
+    )
+    await db.execute(
+        delete(Message)
+        .where(Message.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return len(ids)
+
+
+class MessageArchiver:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        after_days: int,
+        batch_size: int,
+        interval: float,
+    ):
+        self.session_factory = session_factory
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def archive_once(self) -> int:
+        """Archive everything due, batch by batch. Returns how many messages moved."""
+        now = datetime.now(UTC).replace(tzinfo=None)
+        cutoff = now - timedelta(days=self.after_days)
+        moved = 0
+        try:
+            while True:
+                async with self.session_factory() as db:
+                    batch = await archive_batch(db, cutoff, self.batch_size)
+                moved += batch
+                MESSAGES_ARCHIVED.inc(batch)
+                if batch < self.batch_size:
+                    break
+                # Let requests through between batches
+                await asyncio.sleep(0)
+        except Exception:
+            logger.exception("Message archival failed")
+        if moved:
+            logger.info("Archived %d messages", moved)
+        return moved
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.archive_once()
+
+    async def start(self) -> None:
+        """Archive periodically, starting one interval after startup."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="message-archiver")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,118 @@
+"""
+Disk storage for chat attachments.
+
+Attachments are streamed to disk under a random key and messages only keep
+that key plus the file's name, type and size. Downloads go through
+short-lived signed URLs, so browsers can fetch them directly (links, <img>,
+range requests) without sending the bearer token. Only raster images whose
+content is a known format are served inline; everything else, SVG included,
+downloads as a file.
+"""
+
+import hashlib
+import hmac
+import math
+import os
+import tempfile
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.config import settings
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Magic bytes -> media type of the images served inline; the declared type is
+# not trusted
+_IMAGE_SIGNATURES: list[tuple[bytes, str]] = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+class AttachmentStore:
+    """Attachments as files under `root`, sharded by the key's first two characters."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        if len(key) != 32 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid attachment key: {key!r}")
+        return self.root / key[:2] / key
+
+    def save(self, source: BinaryIO, max_bytes: int) -> tuple[str, int]:
+        """Copy `source` to the store in chunks; returns (key, size). Blocking."""
+        key = uuid.uuid4().hex
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := source.read(_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise AttachmentTooLarge(
+                            f"Attachment exceeds {max_bytes} bytes"
+                        )
+                    tmp.write(chunk)
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return key, size
+
+    def read_header(self, key: str, size: int = 12) -> bytes:
+        """The first `size` bytes of an attachment. Blocking."""
+        with self.path(key).open("rb") as f:
+            return f.read(size)
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+
+def sniff_image_type(header: bytes) -> str | None:
+    """Media type of a raster image served inline, from its first bytes, or None."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, media_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return media_type
+    return None
+
+
+@lru_cache
+def get_attachment_store() -> AttachmentStore:
+    """The configured attachment store. Also usable as a FastAPI dependency."""
+    return AttachmentStore(settings.ATTACHMENT_STORE_PATH)
+
+
+def _signature(key: str, expires: int) -> str:
+    message = f"{key}:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def signed_url(key: str) -> str:
+    """
+    Download URL for an attachment. Expiry is rounded up to the next TTL window
+    so a message keeps the same URL (and stays browser-cacheable) for a while.
+    """
+    ttl = settings.ATTACHMENT_URL_TTL_SECONDS
+    expires = (math.floor(time.time() / ttl) + 2) * ttl
+    query = f"expires={expires}&signature={_signature(key, expires)}"
+    return f"{settings.API_V1_STR}/chat/attachments/{key}?{query}"
+
+
+def verify_signature(key: str, expires: int, signature: str) -> bool:
+    return expires >= time.time() and hmac.compare_digest(
+        _signature(key, expires), signature
+    )
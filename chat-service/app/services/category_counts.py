@@ -0,0 +1,36 @@
+"""
+Live-listing counts per category, shared with the backend.
+
+A checkout sells an article, which takes it out of the catalog: the count of
+its category is decremented in the same transaction. The backend owns the
+rest of the bookkeeping and periodically reconciles the counts.
+"""
+
+from collections.abc import Mapping
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CategoryCount
+
+UNCATEGORIZED = 0
+
+# INSERT ... ON CONFLICT, per dialect
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def adjust_counts(db: AsyncSession, deltas: Mapping[int | None, int]) -> None:
+    """Add `deltas` (category id -> change in live listings). The caller commits."""
+    for category_id, delta in deltas.items():
+        if not delta:
+            continue
+        key = category_id or UNCATEGORIZED
+        upsert = _UPSERTS[db.bind.dialect.name](CategoryCount).values(
+            category_id=key, count=max(delta, 0)
+        )
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[CategoryCount.category_id],
+                set_={"count": CategoryCount.count + delta},
+            )
+        )
@@ -0,0 +1,98 @@
+"""
+Read state of conversations.
+
+Each conversation carries the time of its last message and, per participant,
+an unread counter and the id of the last message they read. They are updated
+in the transaction that adds a message, with relative updates so concurrent
+messages are all counted, which makes the inbox (sorted by activity, with
+unread badges) a single indexed query on `conversations`.
+"""
+
+from sqlalchemy import func, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+
+def _role(conversation: models.Conversation, user_id: int) -> str:
+    return "buyer" if user_id == conversation.buyer_id else "seller"
+
+
+def _other(role: str) -> str:
+    return "seller" if role == "buyer" else "buyer"
+
+
+async def record_message(
+    db: AsyncSession,
+    conversation: models.Conversation,
+    message: models.Message,
+    author_id: int | None = None,
+) -> None:
+    """
+    Count a flushed `message` as unread for the recipient; the author has read
+    the conversation up to it. `author_id` is the participant who caused the
+    message, when it is not its sender (e.g. checkout notices). The caller commits.
+    """
+    Conversation = models.Conversation
+    author = _role(conversation, author_id or message.sender_id)
+    recipient = _other(author)
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation.id)
+        .values(
+            {
+                Conversation.last_message_at: message.created_at,
+                getattr(Conversation, f"{recipient}_unread"): (
+                    getattr(Conversation, f"{recipient}_unread") + 1
+                ),
+                getattr(Conversation, f"{author}_unread"): 0,
+                getattr(Conversation, f"{author}_last_read_id"): message.id,
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def mark_read(
+    db: AsyncSession, conversation: models.Conversation, user_id: int
+) -> int | None:
+    """Mark the whole conversation as read by `user_id`, and commit.
+    Returns the id of the last message read."""
+    Conversation = models.Conversation
+    role = _role(conversation, user_id)
+    # Archived conversations have no live message left
+    message_ids = union_all(
+        *(
+            select(model.id).where(model.conversation_id == conversation.id)
+            for model in (models.Message, models.ArchivedMessage)
+        )
+    ).subquery()
+    last_id = select(func.max(message_ids.c.id)).scalar_subquery()
+    last_read_column = getattr(Conversation, f"{role}_last_read_id")
+    result = await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation.id)
+        .values(
+            {
+                getattr(Conversation, f"{role}_unread"): 0,
+                last_read_column: func.coalesce(last_id, last_read_column),
+            }
+        )
+        .returning(last_read_column)
+        .execution_options(synchronize_session=False)
+    )
+    last_read_id = result.scalar_one()
+    await db.commit()
+    return last_read_id
+
+
+async def unread_total(db: AsyncSession, user_id: int) -> int:
+    """Unread messages across all of a user's conversations."""
+    Conversation = models.Conversation
+    buyer = select(func.coalesce(func.sum(Conversation.buyer_unread), 0)).where(
+        Conversation.buyer_id == user_id
+    )
+    seller = select(func.coalesce(func.sum(Conversation.seller_unread), 0)).where(
+        Conversation.seller_id == user_id
+    )
+    return await db.scalar(select(buyer.scalar_subquery() + seller.scalar_subquery()))
@@ -0,0 +1,99 @@
+"""
+Full-text search over a user's messages.
+
+Postgres matches `websearch_to_tsquery` against the GIN-indexed tsvector of
+the content and cuts snippets with `ts_headline`; SQLite (development, tests)
+uses the FTS5 table kept in sync with `messages` and its `snippet()`. Both
+only consider the conversations the user takes part in, and page newest
+first by message id (`before_id` is the keyset cursor). Only live messages
+are indexed: messages moved to `messages_archive` (see app.services.archive)
+are not searched.
+
+Snippets are HTML-escaped, with the matched terms wrapped in <mark>.
+"""
+
+import html
+import re
+
+from sqlalchemy import column, func, literal_column, select, table, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+# Highlight delimiters asked from the database, replaced after escaping
+_START, _STOP = "\x02", "\x03"
+SNIPPET_WORDS = 16
+_HEADLINE_OPTIONS = (
+    f"StartSel={_START}, StopSel={_STOP}, MaxWords={SNIPPET_WORDS}, "
+    'MinWords=5, MaxFragments=2, FragmentDelimiter=" … "'
+)
+_WORD = re.compile(r"\w+")
+
+
+def _fts5_query(query: str) -> str:
+    """Every word of `query` as a quoted FTS5 string, so user input is never syntax."""
+    return " ".join(f'"{word}"' for word in _WORD.findall(query))
+
+
+def _render_snippet(snippet: str) -> str:
+    return html.escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+async def search_messages(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    limit: int,
+    before_id: int | None = None,
+) -> tuple[list[dict], int | None]:
+    """Matching messages, newest first, and the cursor of the next page."""
+    Message, Conversation = models.Message, models.Conversation
+    conversations = union(
+        select(Conversation.id).where(Conversation.buyer_id == user_id),
+        select(Conversation.id).where(Conversation.seller_id == user_id),
+    )
+    columns = (
+        Message.id,
+        Message.conversation_id,
+        Message.sender_id,
+        Message.created_at,
+    )
+
+    if db.bind.dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery(models.TEXT_SEARCH_CONFIG, query)
+        stmt = select(
+            *columns,
+            func.ts_headline(
+                models.TEXT_SEARCH_CONFIG, Message.content, tsquery, _HEADLINE_OPTIONS
+            ).label("snippet"),
+        ).where(models.message_document.op("@@")(tsquery))
+        key = Message.id
+    else:
+        terms = _fts5_query(query)
+        if not terms:
+            return [], None
+        fts = table(models.SQLITE_FTS_TABLE, column("rowid"))
+        # FTS5 functions and MATCH take the table itself as their first operand
+        fts_table = literal_column(models.SQLITE_FTS_TABLE)
+        stmt = (
+            select(
+                *columns,
+                func.snippet(fts_table, 0, _START, _STOP, " … ", SNIPPET_WORDS).label(
+                    "snippet"
+                ),
+            )
+            .select_from(fts)
+            .join(Message, Message.id == fts.c.rowid)
+            .where(fts_table.op("MATCH")(terms))
+        )
+        # Same value as the message id, but lets FTS5 return matches in order and
+        # stop at the page limit instead of sorting them all
+        key = fts.c.rowid
+
+    stmt = stmt.where(Message.conversation_id.in_(conversations))
+    if before_id is not None:
+        stmt = stmt.where(key < before_id)
+    rows = (await db.execute(stmt.order_by(key.desc()).limit(limit + 1))).mappings()
+    hits = [{**row, "snippet": _render_snippet(row["snippet"])} for row in rows]
+    next_cursor = hits[limit - 1]["id"] if len(hits) > limit else None
+    return hits[:limit], next_cursor
@@ -0,0 +1,82 @@
+from datetime import UTC, datetime
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from app import models
+from app.db.session import Base
+from app.main import app
+from tests.conftest import _token_for, engine
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_db(pytestconfig) -> dict:
+    """
+    Seed one buyer with many conversations (the inbox hot path) plus
+    filler conversations from other users, once per module.
+    """
+    scale = pytestconfig.getoption("--benchmark-scale")
+    conversations = int(200 * scale)
+    messages_per_conversation = 20
+    now = datetime.now(UTC).replace(tzinfo=None)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            models.User.__table__.insert(),
+            [
+                {"id": uid, "email": f"user{uid}@bench.test", "is_active": True}
+                for uid in range(1, conversations + 3)
+            ],
+        )
+        await conn.execute(
+            models.Article.__table__.insert(),
+            [
+                {"id": aid, "title": f"Article {aid}", "price": 10.0, "seller_id": 1}
+                for aid in range(1, conversations + 1)
+            ],
+        )
+        # Half the conversations belong to the benchmark buyer (user 2)
+        await conn.execute(
+            models.Conversation.__table__.insert(),
+            [
+                {
+                    "id": cid,
+                    "article_id": cid,
+                    "buyer_id": 2 if cid % 2 else cid + 2,
+                    "seller_id": 1,
+                    "created_at": now,
+                }
+                for cid in range(1, conversations + 1)
+            ],
+        )
+        await conn.execute(
+            models.Message.__table__.insert(),
+            [
+                {
+                    "conversation_id": cid,
+                    "sender_id": 1 if n % 2 else 2,
+                    "content": f"Message {n} about article {cid}",
+                    "created_at": now,
+                }
+                for cid in range(1, conversations + 1)
+                for n in range(messages_per_conversation)
+            ],
+        )
+
+    yield {
+        "buyer_headers": {"Authorization": f"Bearer {_token_for(2)}"},
+        "conversation_id": 1,
+    }
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture()
+async def api_client():
+    """In-process client going through the full ASGI stack (middleware included)."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
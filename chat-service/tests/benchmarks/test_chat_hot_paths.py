@@ -0,0 +1,43 @@
+"""
+Benchmarks for the chat service hot paths, driven in-process against a seeded database.
+
+Run with: pytest tests/benchmarks --benchmark [--benchmark-json out.json] [--benchmark-compare baseline.json]
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.asyncio]
+
+
+async def test_create_message(bench, seeded_db, api_client):
+    url = f"/api/v1/chat/conversations/{seeded_db['conversation_id']}/messages"
+
+    async def call():
+        r = await api_client.post(
+            url,
+            headers=seeded_db["buyer_headers"],
+            json={"content": "Still available?"},
+        )
+        assert r.status_code == 200
+
+    await bench("create_message", call)
+
+
+async def test_list_conversations(bench, seeded_db, api_client):
+    async def call():
+        r = await api_client.get(
+            "/api/v1/chat/conversations", headers=seeded_db["buyer_headers"]
+        )
+        assert r.status_code == 200
+
+    await bench("list_conversations", call)
+
+
+async def test_get_conversation(bench, seeded_db, api_client):
+    url = f"/api/v1/chat/conversations/{seeded_db['conversation_id']}"
+
+    async def call():
+        r = await api_client.get(url, headers=seeded_db["buyer_headers"])
+        assert r.status_code == 200
+
+    await bench("get_conversation", call)
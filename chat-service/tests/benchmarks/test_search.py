@@ -0,0 +1,127 @@
+"""
+Benchmark of message search over millions of synthetic messages.
+
+Compares the full-text search endpoint with the ILIKE scan it replaces. On
+SQLite (the default test database) the index is the FTS5 table; point
+SQLALCHEMY_DATABASE_URI at Postgres to measure the GIN index instead.
+
+Run with: pytest tests/benchmarks/test_search.py --benchmark [--benchmark-scale 0.1]
+"""
+
+import random
+from datetime import UTC, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app import models
+from app.db.session import Base
+from tests.conftest import TestingSessionLocal, _token_for, engine
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.asyncio(loop_scope="module")]
+
+# Words making up the synthetic messages; the last ones are progressively rarer
+VOCABULARY = [
+    "hello", "still", "available", "price", "shipping", "tomorrow", "pickup",
+    "condition", "thanks", "offer", "deal", "photo", "size", "color", "paid",
+    "bike", "lamp", "chair", "camera", "vinyl", "jacket", "poster", "table",
+]  # fmt: skip
+RARE_WORD = "tandem"
+BATCH = 50_000
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def search_db(pytestconfig) -> dict:
+    """1M messages (times --benchmark-scale) in 10k conversations, half of user 2."""
+    scale = pytestconfig.getoption("--benchmark-scale")
+    messages = int(1_000_000 * scale)
+    conversations = max(int(10_000 * scale), 10)
+    rng = random.Random(0)  # noqa: S311 — reproducible test data, not security
+    now = datetime.now(UTC).replace(tzinfo=None)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            models.User.__table__.insert(),
+            [{"id": uid, "email": f"user{uid}@bench.test"} for uid in range(1, 4)],
+        )
+        await conn.execute(
+            models.Article.__table__.insert(),
+            [
+                {"id": aid, "title": f"Article {aid}", "price": 10.0, "seller_id": 1}
+                for aid in range(1, conversations + 1)
+            ],
+        )
+        await conn.execute(
+            models.Conversation.__table__.insert(),
+            [
+                {
+                    "id": cid,
+                    "article_id": cid,
+                    "buyer_id": 2 if cid % 2 else 3,
+                    "seller_id": 1,
+                    "created_at": now,
+                }
+                for cid in range(1, conversations + 1)
+            ],
+        )
+        for start in range(0, messages, BATCH):
+            rows = []
+            for n in range(start, min(start + BATCH, messages)):
+                words = rng.choices(VOCABULARY, k=8)
+                conversation_id = rng.randint(1, conversations)
+                if n % 10_000 == 0:
+                    # In one of user 2's conversations, so every scale has hits
+                    words[rng.randrange(8)] = RARE_WORD
+                    conversation_id |= 1
+                rows.append(
+                    {
+                        "conversation_id": conversation_id,
+                        "sender_id": 1 if n % 2 else 2,
+                        "content": " ".join(words),
+                        "created_at": now,
+                    }
+                )
+            await conn.execute(models.Message.__table__.insert(), rows)
+
+    yield {"buyer_headers": {"Authorization": f"Bearer {_token_for(2)}"}}
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.mark.parametrize("term", [RARE_WORD, "camera vinyl"])
+async def test_search_messages(bench, search_db, api_client, term):
+    async def call():
+        r = await api_client.get(
+            "/api/v1/chat/search",
+            params={"q": term},
+            headers=search_db["buyer_headers"],
+        )
+        assert r.status_code == 200
+        assert r.json()["items"]
+
+    await bench(f"search_messages[{term}]", call)
+
+
+@pytest.mark.parametrize("term", [RARE_WORD])
+async def test_search_messages_ilike(bench, search_db, term):
+    """The ILIKE scan over the user's conversations, for comparison."""
+    Message, Conversation = models.Message, models.Conversation
+
+    async def call():
+        async with TestingSessionLocal() as db:
+            result = await db.execute(
+                select(Message.id, Message.content)
+                .join(Conversation)
+                .where(
+                    (Conversation.buyer_id == 2) | (Conversation.seller_id == 2),
+                    Message.content.ilike(f"%{term}%"),
+                )
+                .order_by(Message.id.desc())
+                .limit(20)
+            )
+            assert result.all()
+
+    await bench(f"search_messages_ilike[{term}]", call, rounds=10, warmup=1)
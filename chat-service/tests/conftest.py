@@ -0,0 +1,136 @@
+import os
+
+# Override database URL BEFORE any app imports so the app module
+# never tries to create an asyncpg engine.
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite+aiosqlite:///:memory:"
+
+from datetime import UTC, datetime, timedelta  # noqa: E402
+
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.session import Base, get_db, instrument_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.attachments import (  # noqa: E402
+    AttachmentStore,
+    get_attachment_store,
+)
+
+# ---------------------------------------------------------------------------
+# In-memory SQLite database for tests
+# ---------------------------------------------------------------------------
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+instrument_engine(engine)
+# Mirror the application's session factory (expire_on_commit=False)
+TestingSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+async def override_get_db():
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+app.dependency_overrides[get_db] = override_get_db
+
+# ---------------------------------------------------------------------------
+# Users, conversations and clients
+# ---------------------------------------------------------------------------
+BUYER_ID, SELLER_ID, OTHER_BUYER_ID = 1, 2, 3
+# The buyer's and the other buyer's conversations about the seller's article
+CONVERSATION_ID, OTHER_CONVERSATION_ID = 1, 2
+
+
+def _token_for(user_id: int) -> str:
+    expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
+    return jwt.encode(
+        {"exp": expire, "sub": str(user_id)},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+
+def auth_headers(user_id: int) -> dict[str, str]:
+    return {"Authorization": f"Bearer {_token_for(user_id)}"}
+
+
+@pytest_asyncio.fixture()
+async def conversations() -> None:
+    """A fresh schema with a seller, two buyers and one conversation each."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            models.User.__table__.insert(),
+            [
+                {"id": BUYER_ID, "email": "buyer@example.com", "role": "buyer"},
+                {"id": SELLER_ID, "email": "seller@example.com", "role": "seller"},
+                {"id": OTHER_BUYER_ID, "email": "other@example.com", "role": "buyer"},
+            ],
+        )
+        await conn.execute(
+            models.Article.__table__.insert(),
+            [{"id": 1, "title": "Lamp", "price": 20.0, "seller_id": SELLER_ID}],
+        )
+        await conn.execute(
+            models.Conversation.__table__.insert(),
+            [
+                {
+                    "id": CONVERSATION_ID,
+                    "article_id": 1,
+                    "buyer_id": BUYER_ID,
+                    "seller_id": SELLER_ID,
+                },
+                {
+                    "id": OTHER_CONVERSATION_ID,
+                    "article_id": 1,
+                    "buyer_id": OTHER_BUYER_ID,
+                    "seller_id": SELLER_ID,
+                },
+            ],
+        )
+
+
+@pytest_asyncio.fixture()
+async def client(conversations) -> AsyncClient:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
+
+
+@pytest.fixture()
+def store(tmp_path) -> AttachmentStore:
+    """An empty attachment store in a temporary directory."""
+    store = AttachmentStore(tmp_path)
+    app.dependency_overrides[get_attachment_store] = lambda: store
+    yield store
+    del app.dependency_overrides[get_attachment_store]
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks (tests/benchmarks) — skipped unless --benchmark is given. The options,
+# marker and harness fixtures are shared with the other service, see /benchmarking
+# ---------------------------------------------------------------------------
+
+pytest_plugins = ["benchmarking.plugin"]
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import models
+from app.services.archive import MessageArchiver
+from app.services.read_state import mark_read
+from tests.conftest import (
+    BUYER_ID,
+    CONVERSATION_ID,
+    OTHER_CONVERSATION_ID,
+    SELLER_ID,
+    TestingSessionLocal,
+    auth_headers,
+    engine,
+)
+
+pytestmark = pytest.mark.asyncio
+
+IDLE = datetime(2024, 1, 1)
+
+
+@pytest.fixture()
+def archiver() -> MessageArchiver:
+    return MessageArchiver(
+        TestingSessionLocal, after_days=30, batch_size=2, interval=60
+    )
+
+
+async def _seed_messages(conversation_id: int, count: int, **values) -> list[int]:
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            models.Message.__table__.insert().returning(models.Message.id),
+            [
+                {
+                    "conversation_id": conversation_id,
+                    "sender_id": BUYER_ID,
+                    "content": f"message {i}",
+                    "created_at": IDLE,
+                    **values,
+                }
+                for i in range(count)
+            ],
+        )
+        return sorted(result.scalars())
+
+
+async def _close(conversation_id: int, sold: bool = True) -> None:
+    """Sell the article and let the conversation go idle."""
+    async with engine.begin() as conn:
+        await conn.execute(update(models.Article).values(is_sold=sold))
+        await conn.execute(
+            update(models.Conversation)
+            .where(models.Conversation.id == conversation_id)
+            .values(last_message_at=IDLE)
+        )
+
+
+async def _count(model) -> int:
+    async with TestingSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+async def test_archiver_moves_idle_closed_conversations(conversations, archiver):
+    ids = await _seed_messages(CONVERSATION_ID, 5)
+    await _seed_messages(OTHER_CONVERSATION_ID, 3)
+    await _close(CONVERSATION_ID)
+
+    # Three batches of two; the other conversation had recent activity
+    assert await archiver.archive_once() == 5
+    assert await archiver.archive_once() == 0
+    async with TestingSessionLocal() as db:
+        archived = (await db.scalars(select(models.ArchivedMessage))).all()
+    assert [message.id for message in archived] == ids
+    assert {message.conversation_id for message in archived} == {CONVERSATION_ID}
+    assert archived[0].content == "message 0"
+    assert await _count(models.Message) == 3
+
+
+async def test_archiver_keeps_unsold_articles(conversations, archiver):
+    await _seed_messages(CONVERSATION_ID, 2)
+    await _close(CONVERSATION_ID, sold=False)
+
+    assert await archiver.archive_once() == 0
+    assert await _count(models.ArchivedMessage) == 0
+
+
+async def test_history_includes_archived_messages(client, archiver):
+    archived = await _seed_messages(CONVERSATION_ID, 2)
+    await _close(CONVERSATION_ID)
+    await archiver.archive_once()
+    live = await _seed_messages(CONVERSATION_ID, 1)
+    url = f"/api/v1/chat/conversations/{CONVERSATION_ID}"
+
+    response = await client.get(
+        url, params={"include_archived": True}, headers=auth_headers(BUYER_ID)
+    )
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()["messages"]] == archived + live
+
+    # Only asked for: by default (and in the inbox) the archive is not read
+    response = await client.get(url, headers=auth_headers(BUYER_ID))
+    assert [m["id"] for m in response.json()["messages"]] == live
+
+
+async def test_mark_read_of_archived_conversation(conversations, archiver):
+    ids = await _seed_messages(CONVERSATION_ID, 3)
+    await _close(CONVERSATION_ID)
+    await archiver.archive_once()
+
+    async with TestingSessionLocal() as db:
+        conversation = await db.get(models.Conversation, CONVERSATION_ID)
+        assert conversation.seller_last_read_id is None
+        assert await mark_read(db, conversation, SELLER_ID) == ids[-1]
+
+
+async def test_archived_attachment_downloads(client, archiver, store):
+    key = "ab" * 16
+    store.path(key).parent.mkdir(parents=True)
+    store.path(key).write_bytes(b"invoice")
+    await _seed_messages(
+        CONVERSATION_ID,
+        1,
+        attachment_key=key,
+        attachment_name="invoice.txt",
+        attachment_type="text/plain",
+        attachment_size=7,
+    )
+    await _close(CONVERSATION_ID)
+    assert await archiver.archive_once() == 1
+
+    response = await client.get(
+        f"/api/v1/chat/conversations/{CONVERSATION_ID}",
+        params={"include_archived": True},
+        headers=auth_headers(BUYER_ID),
+    )
+    [message] = response.json()["messages"]
+    download = await client.get(message["attachment_url"])
+    assert download.status_code == 200
+    assert download.content == b"invoice"
@@ -0,0 +1,109 @@
+import pytest
+
+from app.core.config import settings
+from tests.conftest import BUYER_ID, CONVERSATION_ID, auth_headers
+
+pytestmark = pytest.mark.asyncio
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+
+
+async def _download(client, name: str, content: bytes, content_type: str):
+    response = await client.post(
+        f"/api/v1/chat/conversations/{CONVERSATION_ID}/attachments",
+        files={"file": (name, content, content_type)},
+        headers=auth_headers(BUYER_ID),
+    )
+    assert response.status_code == 200, response.text
+    return await client.get(response.json()["attachment_url"])
+
+
+async def test_raster_image_is_served_inline_in_a_sandbox(client, store):
+    response = await _download(client, "photo.png", PNG, "image/png")
+
+    assert response.status_code == 200
+    assert response.content == PNG
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["content-disposition"].startswith("inline")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["content-security-policy"] == "sandbox"
+
+
+@pytest.mark.parametrize(
+    ("name", "content", "content_type"),
+    [
+        ("drawing.svg", SVG, "image/svg+xml"),
+        ("page.png", b"<html><script>alert(1)</script></html>", "image/png"),
+        ("notes.txt", b"hello", "text/plain"),
+    ],
+)
+async def test_other_files_download_as_attachments(
+    client, store, name, content, content_type
+):
+    response = await _download(client, name, content, content_type)
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "content-security-policy" not in response.headers
+
+
+async def test_image_type_comes_from_the_content(client, store):
+    response = await _download(client, "photo", PNG, "application/octet-stream")
+
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["content-disposition"].startswith("inline")
+
+
+@pytest.mark.parametrize(
+    "file_url",
+    [
+        "data:image/png;base64,iVBORw0KGgo=",
+        " DATA:text/plain,hello",
+        "https://x/" + "a" * 2048,
+    ],
+)
+async def test_messages_only_carry_file_links(client, file_url):
+    response = await client.post(
+        f"/api/v1/chat/conversations/{CONVERSATION_ID}/messages",
+        json={"content": "see file", "file_url": file_url},
+        headers=auth_headers(BUYER_ID),
+    )
+    assert response.status_code == 422
+
+
+async def test_oversized_attachments_are_cut_off_before_parsing(client, store):
+    url = f"/api/v1/chat/conversations/{CONVERSATION_ID}/attachments"
+    boundary = "limit-test"
+    chunk = b"a" * (1024 * 1024)
+    chunks = settings.ATTACHMENT_MAX_BYTES // len(chunk) + 2
+    sent = 0
+
+    async def body():
+        nonlocal sent
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+            f'filename="big.bin"\r\nContent-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+        for _ in range(chunks):
+            sent += 1
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    headers = {
+        **auth_headers(BUYER_ID),
+        "content-type": f"multipart/form-data; boundary={boundary}",
+    }
+    # Declared too large: rejected before anything is read
+    declared = await client.post(
+        url,
+        content=b"",
+        headers={**headers, "content-length": str(chunks * len(chunk))},
+    )
+    assert declared.status_code == 413
+    # Streamed without a length: reading stops at the limit
+    streamed = await client.post(url, content=body(), headers=headers)
+    assert streamed.status_code == 413
+    assert sent < chunks
+    assert not any(store.root.rglob("*"))
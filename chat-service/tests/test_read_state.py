@@ -0,0 +1,160 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app import models
+from app.api.v1.endpoints.chat import manager
+from app.services.read_state import mark_read, record_message, unread_total
+from tests.conftest import (
+    BUYER_ID,
+    CONVERSATION_ID,
+    OTHER_BUYER_ID,
+    OTHER_CONVERSATION_ID,
+    SELLER_ID,
+    TestingSessionLocal,
+    auth_headers,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Socket:
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+
+async def _send(client, user_id: int, conversation_id: int, content: str) -> int:
+    response = await client.post(
+        f"/api/v1/chat/conversations/{conversation_id}/messages",
+        json={"content": content},
+        headers=auth_headers(user_id),
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+async def _unread(client, user_id: int) -> int:
+    response = await client.get("/api/v1/chat/unread", headers=auth_headers(user_id))
+    assert response.status_code == 200, response.text
+    return response.json()["unread"]
+
+
+async def test_record_message_counts_relative_to_the_database(conversations):
+    async with TestingSessionLocal() as db:
+        # Both writers hold the same stale snapshot of the conversation
+        conversation = await db.get(models.Conversation, CONVERSATION_ID)
+        for content in ("first", "second"):
+            message = models.Message(
+                conversation_id=CONVERSATION_ID,
+                sender_id=BUYER_ID,
+                content=content,
+                created_at=datetime(2024, 1, 1),
+            )
+            db.add(message)
+            await db.flush()
+            await record_message(db, conversation, message)
+        await db.commit()
+
+        await db.refresh(conversation)
+        assert conversation.seller_unread == 2
+        assert conversation.buyer_unread == 0
+        assert conversation.buyer_last_read_id == message.id
+        assert conversation.last_message_at == datetime(2024, 1, 1)
+
+
+async def test_author_id_reads_on_behalf_of_another_sender(conversations):
+    async with TestingSessionLocal() as db:
+        conversation = await db.get(models.Conversation, CONVERSATION_ID)
+        # e.g. a checkout notice sent by the system for the buyer
+        message = models.Message(
+            conversation_id=CONVERSATION_ID, sender_id=0, content="sold"
+        )
+        db.add(message)
+        await db.flush()
+        await record_message(db, conversation, message, author_id=BUYER_ID)
+        await db.commit()
+
+        await db.refresh(conversation)
+        assert (conversation.buyer_unread, conversation.seller_unread) == (0, 1)
+
+
+async def test_unread_counts_across_conversations(client):
+    await _send(client, BUYER_ID, CONVERSATION_ID, "hello")
+    await _send(client, BUYER_ID, CONVERSATION_ID, "still there?")
+    await _send(client, OTHER_BUYER_ID, OTHER_CONVERSATION_ID, "hi")
+    assert await _unread(client, SELLER_ID) == 3
+
+    # Replying reads the conversation
+    await _send(client, SELLER_ID, CONVERSATION_ID, "yes")
+    assert await _unread(client, SELLER_ID) == 1
+    assert await _unread(client, BUYER_ID) == 1
+    async with TestingSessionLocal() as db:
+        assert await unread_total(db, OTHER_BUYER_ID) == 0
+
+
+async def test_inbox_lists_conversation_rows_by_latest_activity(client):
+    await _send(client, OTHER_BUYER_ID, OTHER_CONVERSATION_ID, "hi")
+    await _send(client, BUYER_ID, CONVERSATION_ID, "hello")
+
+    response = await client.get(
+        "/api/v1/chat/conversations", headers=auth_headers(SELLER_ID)
+    )
+    assert response.status_code == 200
+    inbox = response.json()
+    assert [c["id"] for c in inbox] == [CONVERSATION_ID, OTHER_CONVERSATION_ID]
+    assert [c["seller_unread"] for c in inbox] == [1, 1]
+    # Messages are read per conversation, not for the whole inbox
+    assert all("messages" not in c for c in inbox)
+
+
+async def test_mark_read_resets_the_counter(client):
+    await _send(client, BUYER_ID, CONVERSATION_ID, "hello")
+    last = await _send(client, BUYER_ID, CONVERSATION_ID, "still there?")
+
+    async with TestingSessionLocal() as db:
+        conversation = await db.get(models.Conversation, CONVERSATION_ID)
+        assert await mark_read(db, conversation, SELLER_ID) == last
+        await db.refresh(conversation)
+        assert conversation.seller_unread == 0
+        assert conversation.seller_last_read_id == last
+
+
+async def test_read_endpoint_broadcasts_a_receipt(client):
+    last = await _send(client, BUYER_ID, CONVERSATION_ID, "hello")
+    socket = _Socket()
+    manager.active_connections[CONVERSATION_ID] = [socket]
+    try:
+        response = await client.post(
+            f"/api/v1/chat/conversations/{CONVERSATION_ID}/read",
+            headers=auth_headers(SELLER_ID),
+        )
+    finally:
+        del manager.active_connections[CONVERSATION_ID]
+
+    receipt = {
+        "type": "read",
+        "conversation_id": CONVERSATION_ID,
+        "user_id": SELLER_ID,
+        "last_read_id": last,
+    }
+    assert response.status_code == 200
+    assert response.json() == receipt
+    assert socket.sent == [receipt]
+    assert await _unread(client, SELLER_ID) == 0
+
+
+async def test_read_endpoint_requires_a_participant(client):
+    response = await client.post(
+        f"/api/v1/chat/conversations/{OTHER_CONVERSATION_ID}/read",
+        headers=auth_headers(BUYER_ID),
+    )
+    assert response.status_code == 403
+
+    response = await client.post(
+        "/api/v1/chat/conversations/999/read", headers=auth_headers(BUYER_ID)
+    )
+    assert response.status_code == 404
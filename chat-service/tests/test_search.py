@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import delete, update
+
+from app import models
+from app.services.search import search_messages
+from tests.conftest import (
+    BUYER_ID,
+    CONVERSATION_ID,
+    OTHER_BUYER_ID,
+    OTHER_CONVERSATION_ID,
+    SELLER_ID,
+    TestingSessionLocal,
+    auth_headers,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _send(client, user_id: int, conversation_id: int, content: str) -> int:
+    response = await client.post(
+        f"/api/v1/chat/conversations/{conversation_id}/messages",
+        json={"content": content},
+        headers=auth_headers(user_id),
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+async def _search(client, user_id: int, **params) -> dict:
+    response = await client.get(
+        "/api/v1/chat/search", params=params, headers=auth_headers(user_id)
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_search_only_matches_own_conversations(client):
+    own = await _send(client, BUYER_ID, CONVERSATION_ID, "is the lamp still available")
+    other = await _send(
+        client, OTHER_BUYER_ID, OTHER_CONVERSATION_ID, "is the lamp still available"
+    )
+
+    assert [
+        hit["id"] for hit in (await _search(client, BUYER_ID, q="lamp"))["items"]
+    ] == [own]
+    assert [
+        hit["id"] for hit in (await _search(client, OTHER_BUYER_ID, q="lamp"))["items"]
+    ] == [other]
+    # The seller takes part in both
+    assert [
+        hit["id"] for hit in (await _search(client, SELLER_ID, q="lamp"))["items"]
+    ] == [other, own]
+
+
+async def test_search_pages_newest_first(client):
+    ids = [
+        await _send(client, BUYER_ID, CONVERSATION_ID, f"offer number {i}")
+        for i in range(5)
+    ]
+
+    first = await _search(client, BUYER_ID, q="offer", limit=2)
+    assert [hit["id"] for hit in first["items"]] == [ids[4], ids[3]]
+    assert first["next_cursor"] == ids[3]
+
+    second = await _search(
+        client, BUYER_ID, q="offer", limit=2, before_id=first["next_cursor"]
+    )
+    assert [hit["id"] for hit in second["items"]] == [ids[2], ids[1]]
+
+    last = await _search(
+        client, BUYER_ID, q="offer", limit=2, before_id=second["next_cursor"]
+    )
+    assert [hit["id"] for hit in last["items"]] == [ids[0]]
+    assert last["next_cursor"] is None
+
+
+async def test_search_escapes_snippets(client):
+    await _send(client, BUYER_ID, CONVERSATION_ID, "<b>lamp</b> & <script>x</script>")
+
+    [hit] = (await _search(client, BUYER_ID, q="lamp"))["items"]
+    assert "<mark>lamp</mark>" in hit["snippet"]
+    assert "<script>" not in hit["snippet"]
+    assert "&lt;script&gt;" in hit["snippet"]
+    assert "&amp;" in hit["snippet"]
+
+
+@pytest.mark.parametrize(
+    "query", ['"lamp', "NEAR(lamp", "lamp OR", "lamp AND NOT", "*", "lamp:"]
+)
+async def test_search_treats_query_syntax_as_words(client, query):
+    # Holds every word of the queries, so each must match as plain words
+    message = await _send(
+        client, BUYER_ID, CONVERSATION_ID, "lamp near me, or not and for sale"
+    )
+
+    items = (await _search(client, BUYER_ID, q=query))["items"]
+    assert [hit["id"] for hit in items] == ([message] if "lamp" in query else [])
+
+
+async def test_search_follows_message_updates_and_deletes(client):
+    message = await _send(client, BUYER_ID, CONVERSATION_ID, "original wording")
+
+    async with TestingSessionLocal() as db:
+        await db.execute(
+            update(models.Message)
+            .where(models.Message.id == message)
+            .values(content="edited wording")
+        )
+        await db.commit()
+        assert await search_messages(db, BUYER_ID, "original", limit=10) == ([], None)
+        hits, _ = await search_messages(db, BUYER_ID, "edited", limit=10)
+        assert [hit["id"] for hit in hits] == [message]
+
+        await db.execute(delete(models.Message).where(models.Message.id == message))
+        await db.commit()
+        assert await search_messages(db, BUYER_ID, "wording", limit=10) == ([], None)
@@ -0,0 +1,85 @@
+"""Tests for request tracing in the chat service."""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1.endpoints.chat import manager
+from app.core import tracing
+from app.core.tracing import SpanExporter
+from app.main import app
+from tests.conftest import BUYER_ID, CONVERSATION_ID, auth_headers
+
+TRACE_ID, PARENT_ID = "0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331"
+PARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.spans: list[dict] = []
+
+    def export(self, spans: list[dict]) -> None:
+        self.spans.extend(spans)
+
+
+class _Socket:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+
+@pytest.fixture()
+def exporter(monkeypatch) -> ListExporter:
+    exporter = ListExporter()
+    tracing.register_exporter("test", lambda: exporter)
+    monkeypatch.setattr("app.core.config.settings.TRACING_ENABLED", True)
+    monkeypatch.setattr("app.core.config.settings.TRACING_EXPORTER", "test")
+    tracing.get_exporter.cache_clear()
+    yield exporter
+    tracing.flush()
+    tracing.get_exporter.cache_clear()
+
+
+def test_websocket_continues_trace_from_query_parameter(exporter: ListExporter):
+    url = f"/api/v1/chat/conversations/{CONVERSATION_ID}/ws"
+    with pytest.raises(WebSocketDisconnect):
+        with TestClient(app).websocket_connect(
+            f"{url}?token=invalid&traceparent={PARENT}"
+        ):
+            pass
+    tracing.flush()
+
+    [server] = [span for span in exporter.spans if span["kind"] == "server"]
+    assert server["name"] == "WS /api/v1/chat/conversations/{conversation_id}/ws"
+    assert server["traceId"] == TRACE_ID
+    assert server["parentSpanId"] == PARENT_ID
+    assert server["attributes"]["websocket.close_code"] == 1008
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_traced_under_the_request(client, exporter):
+    socket = _Socket()
+    manager.active_connections[CONVERSATION_ID] = [socket, _Socket()]
+    try:
+        response = await client.post(
+            f"/api/v1/chat/conversations/{CONVERSATION_ID}/messages",
+            json={"content": "hello"},
+            headers={**auth_headers(BUYER_ID), "traceparent": PARENT},
+        )
+    finally:
+        del manager.active_connections[CONVERSATION_ID]
+    assert response.status_code == 200
+    assert len(socket.sent) == 1
+    tracing.flush()
+
+    spans = {span["name"]: span for span in exporter.spans}
+    server = spans["POST /api/v1/chat/conversations/{conversation_id}/messages"]
+    broadcast = spans["chat.broadcast"]
+    assert broadcast["traceId"] == TRACE_ID
+    assert broadcast["parentSpanId"] == server["spanId"]
+    assert broadcast["attributes"] == {
+        "conversation.id": CONVERSATION_ID,
+        "websocket.recipients": 2,
+    }
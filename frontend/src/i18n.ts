@@ -22,6 +22,12 @@ const resources = {
             "home.load_more": "Load More",
             "home.no_items": "No items found",
             "home.explore_more": "Explore More",
+            "home.min_price": "Min price",
+            "home.max_price": "Max price",
+            "home.sort_default": "Sort",
+            "home.sort_newest": "Newest",
+            "home.sort_price_asc": "Price: low to high",
+            "home.sort_price_desc": "Price: high to low",
 
             // Item Card
             "item.shipping": "Shipping",
@@ -64,6 +70,12 @@ const resources = {
             "home.load_more": "Voir Plus",
             "home.no_items": "Aucun objet trouvé",
             "home.explore_more": "Explorer Davantage",
+            "home.min_price": "Prix min",
+            "home.max_price": "Prix max",
+            "home.sort_default": "Trier",
+            "home.sort_newest": "Plus récents",
+            "home.sort_price_asc": "Prix croissant",
+            "home.sort_price_desc": "Prix décroissant",
 
             // Item Card
             "item.shipping": "Livraison",
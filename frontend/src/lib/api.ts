@@ -29,5 +29,32 @@ const chatApi = axios.create({
     });
 });
 
+// Images are stored as API-relative references ("/api/v1/images/<hash>.jpg");
+// older articles may still hold absolute URLs or inline data URLs.
+const API_PREFIX = "/api/v1";
+
+// Stored images also have resized WebP variants, e.g. "thumb" for grid tiles.
+export type ImageVariant = "thumb" | "medium";
+
+export const resolveImageUrl = (ref: string, variant?: ImageVariant): string =>
+    ref.startsWith(`${API_PREFIX}/images/`)
+        ? API_BASE_URL +
+          ref.slice(API_PREFIX.length) +
+          (variant ? `/${variant}` : "")
+        : ref;
+
+// Chat attachment links are signed paths on the chat service.
+export const resolveChatUrl = (path: string): string =>
+    path.startsWith(`${API_PREFIX}/`)
+        ? CHAT_BASE_URL + path.slice(API_PREFIX.length)
+        : path;
+
+export const uploadImage = async (file: File): Promise<string> => {
+    const form = new FormData();
+    form.append("file", file);
+    const res = await api.post("/images/", form);
+    return res.data.url;
+};
+
 export { chatApi };
 export default api;
@@ -1,6 +1,6 @@
 import { useState, useRef, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
-import api from "../lib/api";
+import api, { resolveImageUrl, uploadImage } from "../lib/api";
 import { Button } from "../components/ui/button";
 import { Input } from "../components/ui/input";
 import { Textarea } from "../components/ui/textarea";
@@ -42,8 +42,8 @@ export const AddArticlePage = () => {
             .catch(() => {});
     }, []);
 
-    const addImage = (dataUrl: string) => {
-        setImages((prev) => [...prev, dataUrl]);
+    const addImage = (ref: string) => {
+        setImages((prev) => [...prev, ref]);
     };
 
     const removeImage = (index: number) => {
@@ -54,12 +54,9 @@ export const AddArticlePage = () => {
         if (!files) return;
         Array.from(files).forEach((file) => {
             if (!file.type.startsWith("image/")) return;
-            const reader = new FileReader();
-            reader.onload = (e) => {
-                const dataUrl = e.target?.result as string;
-                addImage(dataUrl);
-            };
-            reader.readAsDataURL(file);
+            uploadImage(file)
+                .then(addImage)
+                .catch(() => setError("Failed to upload image."));
         });
     };
 
@@ -217,7 +214,7 @@ export const AddArticlePage = () => {
                                             }`}
                                         >
                                             <img
-                                                src={img}
+                                                src={resolveImageUrl(img)}
                                                 alt={`Upload ${index + 1}`}
                                                 className="w-full h-full object-cover pointer-events-none"
                                             />
@@ -1,5 +1,5 @@
 import { useEffect, useState, useCallback } from "react";
-import api from "../lib/api";
+import api, { resolveImageUrl } from "../lib/api";
 import { Button } from "../components/ui/button";
 import { Input } from "../components/ui/input";
 import {
@@ -49,12 +49,12 @@ const getFirstImage = (url: string | null): string | null => {
     try {
         if (url.startsWith("[")) {
             const arr = JSON.parse(url);
-            return arr.length > 0 ? arr[0] : null;
+            return arr.length > 0 ? resolveImageUrl(arr[0], "thumb") : null;
         }
     } catch {
         // fallback
     }
-    return url;
+    return resolveImageUrl(url, "thumb");
 };
 
 export const AdminPage = () => {
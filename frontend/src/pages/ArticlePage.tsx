@@ -1,7 +1,7 @@
 import { useEffect, useState } from "react";
 import { useParams, Link, useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
-import api, { chatApi } from "../lib/api";
+import api, { chatApi, resolveImageUrl } from "../lib/api";
 import { MessageSquare, Pencil } from "lucide-react";
 import { Button } from "../components/ui/button";
 import { Card, CardContent } from "../components/ui/card";
@@ -142,12 +142,12 @@ export const ArticlePage = () => {
         if (!url) return [];
         try {
             if (url.startsWith("[")) {
-                return JSON.parse(url);
+                return JSON.parse(url).map(resolveImageUrl);
             }
         } catch {
             // fallback
         }
-        return [url];
+        return [resolveImageUrl(url)];
     };
 
     const images = getImages(article.image_url);
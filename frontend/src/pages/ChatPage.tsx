@@ -1,6 +1,11 @@
 import { useEffect, useState, useRef } from "react";
 import { Link, useNavigate, useParams } from "react-router-dom";
-import api, { chatApi, CHAT_BASE_URL } from "../lib/api";
+import api, {
+    chatApi,
+    CHAT_BASE_URL,
+    resolveChatUrl,
+    resolveImageUrl,
+} from "../lib/api";
 import { useAuth } from "../context/AuthContext";
 import { Button } from "../components/ui/button";
 import { Input } from "../components/ui/input";
@@ -11,48 +16,58 @@ interface Message {
     content: string;
     sender_id: number;
     file_url?: string | null;
+    attachment_url?: string | null;
+    attachment_name?: string | null;
+    attachment_type?: string | null;
+    attachment_size?: number | null;
     created_at: string;
 }
 
-interface Conversation {
+// Inbox entry (`GET /chat/conversations`): the conversation without its messages
+interface ConversationSummary {
     id: number;
     article_id: number;
     buyer_id: number;
     seller_id: number;
     created_at: string;
-    messages: Message[];
+    last_message_at: string | null;
+    buyer_unread: number;
+    seller_unread: number;
+    buyer_last_read_id: number | null;
+    seller_last_read_id: number | null;
     article_is_sold?: boolean;
 }
 
+interface Conversation extends ConversationSummary {
+    messages: Message[];
+}
+
+// Read receipt broadcast when a participant reads the conversation
+interface ReadReceipt {
+    type: "read";
+    conversation_id: number;
+    user_id: number;
+    last_read_id: number | null;
+}
+
+// Article summary from the backend's batch lookup (`GET /articles/batch`)
 interface ExternalArticle {
     id: number;
     title: string;
     price: number;
     shipping_cost: number;
-    image_url: string | null;
-    is_approved: boolean;
+    thumbnail: string | null;
     is_sold: boolean;
 }
 
-const getFirstImage = (url: string | null): string | null => {
-    if (!url) return null;
-    try {
-        if (url.startsWith("[")) {
-            const arr = JSON.parse(url);
-            return arr.length > 0 ? arr[0] : null;
-        }
-    } catch {
-        // fallback
-    }
-    return url;
-};
-
 export const ChatPage = () => {
     const { user } = useAuth();
     const { id: routeId } = useParams();
     const navigate = useNavigate();
 
-    const [conversations, setConversations] = useState<Conversation[]>([]);
+    const [conversations, setConversations] = useState<
+        ConversationSummary[]
+    >([]);
     const [activeConv, setActiveConv] = useState<Conversation | null>(null);
     const [articleData, setArticleData] = useState<
         Record<number, ExternalArticle>
@@ -60,31 +75,39 @@ export const ChatPage = () => {
     const [newMessage, setNewMessage] = useState("");
     const [loading, setLoading] = useState(true);
     const [buying, setBuying] = useState(false);
-    const [fileUrl, setFileUrl] = useState<string | null>(null);
+    const [file, setFile] = useState<File | null>(null);
+    const [filePreview, setFilePreview] = useState<string | null>(null);
     const fileInputRef = useRef<HTMLInputElement>(null);
     const messagesEndRef = useRef<HTMLDivElement>(null);
 
     const loadConversations = async () => {
         try {
-            const res = await chatApi.get<Conversation[]>(
+            const res = await chatApi.get<ConversationSummary[]>(
                 "/chat/conversations",
             );
             setConversations(res.data);
 
-            // Fetch article data for these conversations to show titles/images
+            // Fetch the missing articles' titles/images in one batch lookup
             const articlesMap: Record<number, ExternalArticle> = {
                 ...articleData,
             };
-            for (const conv of res.data) {
-                if (!articlesMap[conv.article_id]) {
-                    try {
-                        const aRes = await api.get<ExternalArticle>(
-                            `/articles/${conv.article_id}`,
-                        );
-                        articlesMap[conv.article_id] = aRes.data;
-                    } catch {
-                        // article might be sold or deleted
+            const missing = [
+                ...new Set(res.data.map((conv) => conv.article_id)),
+            ].filter((id) => !articlesMap[id]);
+            for (let i = 0; i < missing.length; i += 100) {
+                const params = new URLSearchParams();
+                missing
+                    .slice(i, i + 100)
+                    .forEach((id) => params.append("ids", String(id)));
+                try {
+                    const aRes = await api.get<ExternalArticle[]>(
+                        `/articles/batch?${params.toString()}`,
+                    );
+                    for (const article of aRes.data) {
+                        articlesMap[article.id] = article;
                     }
+                } catch {
+                    // titles fall back to the article id
                 }
             }
             setArticleData(articlesMap);
@@ -94,7 +117,12 @@ export const ChatPage = () => {
                     (c) => c.id.toString() === routeId,
                 );
                 if (target) {
-                    setActiveConv(target);
+                    // Messages, archived ones included, are loaded for the open conversation only
+                    const conv = await chatApi.get<Conversation>(
+                        `/chat/conversations/${target.id}`,
+                        { params: { include_archived: true } },
+                    );
+                    setActiveConv(conv.data);
                 } else if (res.data.length > 0) {
                     navigate(`/chat/${res.data[0].id}`);
                 }
@@ -113,6 +141,22 @@ export const ChatPage = () => {
         // eslint-disable-next-line react-hooks/exhaustive-deps
     }, [routeId]);
 
+    // Opening a conversation reads it: clear its badge and send a receipt
+    const markRead = (conv: Conversation) => {
+        const role = user?.id === conv.buyer_id ? "buyer" : "seller";
+        setConversations((convs) =>
+            convs.map((c) =>
+                c.id === conv.id ? { ...c, [`${role}_unread`]: 0 } : c,
+            ),
+        );
+        chatApi.post(`/chat/conversations/${conv.id}/read`).catch(() => {});
+    };
+
+    useEffect(() => {
+        if (activeConv && user) markRead(activeConv);
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [activeConv?.id, user]);
+
     useEffect(() => {
         // scroll to bottom on new messages
         messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -133,23 +177,43 @@ export const ChatPage = () => {
             try {
                 const data = JSON.parse(event.data);
 
+                if (data.type === "read") {
+                    const receipt = data as ReadReceipt;
+                    setActiveConv((prev) => {
+                        if (!prev || prev.id !== receipt.conversation_id)
+                            return prev;
+                        const role =
+                            receipt.user_id === prev.buyer_id
+                                ? "buyer"
+                                : "seller";
+                        return {
+                            ...prev,
+                            [`${role}_last_read_id`]: receipt.last_read_id,
+                        };
+                    });
+                    return;
+                }
+                // The conversation is open, so the other side's messages are read
+                if (data.sender_id !== user?.id)
+                    chatApi
+                        .post(`/chat/conversations/${convId}/read`)
+                        .catch(() => {});
+
                 setActiveConv((prev) => {
                     if (!prev || prev.id !== convId) return prev;
                     // Detect duplicates from our own immediate POST returns
                     if (prev.messages.some((m) => m.id === data.id))
                         return prev;
 
-                    const updated = {
-                        ...prev,
-                        messages: [...prev.messages, data],
-                    };
-
-                    // Recursively map global conversations tree UI block
                     setConversations((convi) =>
-                        convi.map((c) => (c.id === updated.id ? updated : c)),
+                        convi.map((c) =>
+                            c.id === convId
+                                ? { ...c, last_message_at: data.created_at }
+                                : c,
+                        ),
                     );
 
-                    return updated;
+                    return { ...prev, messages: [...prev.messages, data] };
                 });
             } catch (err) {
                 console.error("Socket error", err);
@@ -161,28 +225,38 @@ export const ChatPage = () => {
 
     const handleSend = async (e: React.FormEvent) => {
         e.preventDefault();
-        if ((!newMessage.trim() && !fileUrl) || !activeConv) return;
+        if ((!newMessage.trim() && !file) || !activeConv) return;
 
         try {
-            const res = await chatApi.post<Message>(
-                `/chat/conversations/${activeConv.id}/messages`,
-                {
-                    content: newMessage,
-                    file_url: fileUrl,
-                },
-            );
-            const updated = {
+            let res;
+            if (file) {
+                // Attachments are streamed as multipart, not inlined in the message
+                const form = new FormData();
+                form.append("file", file);
+                form.append("content", newMessage);
+                res = await chatApi.post<Message>(
+                    `/chat/conversations/${activeConv.id}/attachments`,
+                    form,
+                );
+            } else {
+                res = await chatApi.post<Message>(
+                    `/chat/conversations/${activeConv.id}/messages`,
+                    { content: newMessage },
+                );
+            }
+            setActiveConv({
                 ...activeConv,
                 messages: [...activeConv.messages, res.data],
-            };
-            setActiveConv(updated);
+            });
             setConversations(
                 conversations.map((c) =>
-                    c.id === activeConv.id ? updated : c,
+                    c.id === activeConv.id
+                        ? { ...c, last_message_at: res.data.created_at }
+                        : c,
                 ),
             );
             setNewMessage("");
-            setFileUrl(null);
+            clearFile();
             if (fileInputRef.current) fileInputRef.current.value = "";
         } catch {
             console.error("Failed to send message");
@@ -190,14 +264,23 @@ export const ChatPage = () => {
     };
 
     const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
-        const file = e.target.files?.[0];
-        if (!file) return;
+        const selected = e.target.files?.[0];
+        if (!selected) return;
+
+        if (filePreview) URL.revokeObjectURL(filePreview);
+        setFile(selected);
+        setFilePreview(
+            selected.type.startsWith("image/")
+                ? URL.createObjectURL(selected)
+                : null,
+        );
+    };
 
-        const reader = new FileReader();
-        reader.onload = (evt) => {
-            setFileUrl(evt.target?.result as string);
-        };
-        reader.readAsDataURL(file);
+    const clearFile = () => {
+        if (filePreview) URL.revokeObjectURL(filePreview);
+        setFile(null);
+        setFilePreview(null);
+        if (fileInputRef.current) fileInputRef.current.value = "";
     };
 
     const handleCheckout = async () => {
@@ -246,6 +329,10 @@ export const ChatPage = () => {
                         {conversations.map((conv) => {
                             const article = articleData[conv.article_id];
                             const isActive = activeConv?.id === conv.id;
+                            const unread =
+                                user?.id === conv.buyer_id
+                                    ? conv.buyer_unread
+                                    : conv.seller_unread;
 
                             return (
                                 <Link
@@ -255,14 +342,11 @@ export const ChatPage = () => {
                                 >
                                     <div className="flex items-center gap-3">
                                         <div className="w-10 h-10 rounded-md bg-muted overflow-hidden flex-shrink-0">
-                                            {article &&
-                                            getFirstImage(article.image_url) ? (
+                                            {article?.thumbnail ? (
                                                 <img
-                                                    src={
-                                                        getFirstImage(
-                                                            article.image_url,
-                                                        )!
-                                                    }
+                                                    src={resolveImageUrl(
+                                                        article.thumbnail,
+                                                    )}
                                                     alt=""
                                                     className="w-full h-full object-cover"
                                                 />
@@ -279,14 +363,18 @@ export const ChatPage = () => {
                                                     : `Article #${conv.article_id}`}
                                             </p>
                                             <p className="text-xs text-muted-foreground truncate">
-                                                {conv.messages.length > 0
-                                                    ? conv.messages[
-                                                          conv.messages.length -
-                                                              1
-                                                      ].content
+                                                {conv.last_message_at
+                                                    ? new Date(
+                                                          conv.last_message_at,
+                                                      ).toLocaleString()
                                                     : "Say hi!"}
                                             </p>
                                         </div>
+                                        {unread > 0 && !isActive && (
+                                            <span className="min-w-5 h-5 px-1.5 rounded-full bg-primary text-primary-foreground text-xs font-semibold flex items-center justify-center">
+                                                {unread}
+                                            </span>
+                                        )}
                                     </div>
                                 </Link>
                             );
@@ -374,6 +462,38 @@ export const ChatPage = () => {
                                                           : "bg-muted text-foreground rounded-tl-sm shadow-sm"
                                                 }`}
                                             >
+                                                {msg.attachment_url && (
+                                                    <div className="mb-2">
+                                                        {msg.attachment_type?.startsWith(
+                                                            "image/",
+                                                        ) ? (
+                                                            <img
+                                                                src={resolveChatUrl(
+                                                                    msg.attachment_url,
+                                                                )}
+                                                                alt={
+                                                                    msg.attachment_name ||
+                                                                    "Attachment"
+                                                                }
+                                                                loading="lazy"
+                                                                className="max-w-full max-h-[300px] object-contain rounded-md"
+                                                            />
+                                                        ) : (
+                                                            <a
+                                                                href={resolveChatUrl(
+                                                                    msg.attachment_url,
+                                                                )}
+                                                                className="underline flex items-center gap-1 text-sm font-medium opacity-90 hover:opacity-100"
+                                                                target="_blank"
+                                                                rel="noreferrer"
+                                                            >
+                                                                <Paperclip className="w-3 h-3" />
+                                                                {msg.attachment_name ||
+                                                                    "Download Attachment"}
+                                                            </a>
+                                                        )}
+                                                    </div>
+                                                )}
                                                 {msg.file_url && (
                                                     <div className="mb-2">
                                                         {msg.file_url.startsWith(
@@ -426,16 +546,33 @@ export const ChatPage = () => {
                                     );
                                 })
                             )}
+                            {(() => {
+                                // Read receipt under our last message
+                                const mine = activeConv.messages.filter(
+                                    (m) => m.sender_id === user?.id,
+                                );
+                                const otherRead =
+                                    user?.id === activeConv.buyer_id
+                                        ? activeConv.seller_last_read_id
+                                        : activeConv.buyer_last_read_id;
+                                return mine.length > 0 &&
+                                    otherRead != null &&
+                                    otherRead >= mine[mine.length - 1].id ? (
+                                    <p className="text-[10px] text-muted-foreground text-right -mt-2">
+                                        Seen
+                                    </p>
+                                ) : null;
+                            })()}
                             <div ref={messagesEndRef} />
                         </div>
 
                         {/* Attachment Preview */}
-                        {fileUrl && (
+                        {file && (
                             <div className="px-4 py-2 bg-muted/20 border-t flex items-center gap-3">
                                 <div className="relative w-16 h-16 rounded-md overflow-hidden bg-muted border flex items-center justify-center shrink-0">
-                                    {fileUrl.startsWith("data:image/") ? (
+                                    {filePreview ? (
                                         <img
-                                            src={fileUrl}
+                                            src={filePreview}
                                             alt="Preview"
                                             className="w-full h-full object-cover"
                                         />
@@ -444,19 +581,13 @@ export const ChatPage = () => {
                                     )}
                                 </div>
                                 <div className="flex-1 text-sm text-muted-foreground truncate">
-                                    {fileUrl.startsWith("data:image/")
-                                        ? "Image attached"
-                                        : "File attached"}
+                                    {file.name}
                                 </div>
                                 <Button
                                     variant="ghost"
                                     size="icon"
                                     className="h-8 w-8 text-muted-foreground hover:text-destructive shrink-0"
-                                    onClick={() => {
-                                        setFileUrl(null);
-                                        if (fileInputRef.current)
-                                            fileInputRef.current.value = "";
-                                    }}
+                                    onClick={clearFile}
                                 >
                                     <X className="w-4 h-4" />
                                 </Button>
@@ -501,7 +632,7 @@ export const ChatPage = () => {
                                 />
                                 <Button
                                     type="submit"
-                                    disabled={!newMessage.trim() && !fileUrl}
+                                    disabled={!newMessage.trim() && !file}
                                     className="shadow-sm shrink-0"
                                 >
                                     <Send className="w-4 h-4" />
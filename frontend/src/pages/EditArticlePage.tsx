@@ -1,6 +1,6 @@
 import { useState, useRef, useEffect } from "react";
 import { useNavigate, useParams } from "react-router-dom";
-import api from "../lib/api";
+import api, { resolveImageUrl, uploadImage } from "../lib/api";
 import { Button } from "../components/ui/button";
 import { Input } from "../components/ui/input";
 import { Textarea } from "../components/ui/textarea";
@@ -71,8 +71,8 @@ export const EditArticlePage = () => {
         }
     }, [articleId]);
 
-    const addImage = (dataUrl: string) => {
-        setImages((prev) => [...prev, dataUrl]);
+    const addImage = (ref: string) => {
+        setImages((prev) => [...prev, ref]);
     };
 
     const removeImage = (index: number) => {
@@ -83,12 +83,9 @@ export const EditArticlePage = () => {
         if (!files) return;
         Array.from(files).forEach((file) => {
             if (!file.type.startsWith("image/")) return;
-            const reader = new FileReader();
-            reader.onload = (e) => {
-                const dataUrl = e.target?.result as string;
-                addImage(dataUrl);
-            };
-            reader.readAsDataURL(file);
+            uploadImage(file)
+                .then(addImage)
+                .catch(() => setError("Failed to upload image."));
         });
     };
 
@@ -237,7 +234,7 @@ export const EditArticlePage = () => {
                                             }`}
                                         >
                                             <img
-                                                src={img}
+                                                src={resolveImageUrl(img)}
                                                 alt={`Upload ${index + 1}`}
                                                 className="w-full h-full object-cover pointer-events-none"
                                             />
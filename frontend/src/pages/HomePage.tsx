@@ -1,20 +1,20 @@
 import { useEffect, useState, useCallback, useRef } from "react";
 import { Link } from "react-router-dom";
 import { useTranslation } from "react-i18next";
-import api from "../lib/api";
+import api, { resolveImageUrl } from "../lib/api";
 import { Card, CardContent } from "../components/ui/card";
 import { Button } from "../components/ui/button";
 import { Input } from "../components/ui/input";
 import { FormError } from "../components/ui/form-error";
 
+// Compact catalog entry returned by `GET /articles/?fields=summary`
 interface Item {
     id: number;
     title: string;
-    description: string;
+    excerpt: string | null;
     price: number;
-    image_url: string;
+    thumbnail: string | null;
     seller_id: number;
-    is_approved: boolean;
     category_id?: number;
     shipping_cost?: number;
 }
@@ -23,30 +23,23 @@ interface Category {
     id: number;
     name: string;
     description: string | null;
+    listing_count: number;
 }
 
-const getFirstImage = (url: string | null): string | null => {
-    if (!url) return null;
-    try {
-        if (url.startsWith("[")) {
-            const arr = JSON.parse(url);
-            return arr.length > 0 ? arr[0] : null;
-        }
-    } catch {
-        // fallback
-    }
-    return url;
-};
-
 export const HomePage = () => {
     const { t } = useTranslation();
     const [items, setItems] = useState<Item[]>([]);
     const [categories, setCategories] = useState<Category[]>([]);
+    const [listingTotal, setListingTotal] = useState<number | null>(null);
     const [selectedCategory, setSelectedCategory] = useState<number | null>(
         null,
     );
     const [searchQuery, setSearchQuery] = useState("");
     const [debouncedSearch, setDebouncedSearch] = useState("");
+    const [sort, setSort] = useState("");
+    const [minPrice, setMinPrice] = useState("");
+    const [maxPrice, setMaxPrice] = useState("");
+    const [debouncedPrices, setDebouncedPrices] = useState(["", ""]);
     const [page, setPage] = useState(1);
     const [totalItems, setTotalItems] = useState(0);
     const limit = 12;
@@ -57,19 +50,23 @@ export const HomePage = () => {
 
     // Fetch categories once
     useEffect(() => {
-        api.get("/categories/")
-            .then((res) => setCategories(res.data))
+        api.get("/categories/", { params: { with_counts: true } })
+            .then((res) => {
+                setCategories(res.data.items);
+                setListingTotal(res.data.total);
+            })
             .catch(() => {});
     }, []);
 
-    // Debounce search input (300ms)
+    // Debounce search and price inputs (300ms)
     useEffect(() => {
         const timer = setTimeout(() => {
             setDebouncedSearch(searchQuery);
+            setDebouncedPrices([minPrice, maxPrice]);
             setPage(1);
         }, 300);
         return () => clearTimeout(timer);
-    }, [searchQuery]);
+    }, [searchQuery, minPrice, maxPrice]);
 
     // Fetch articles when filters change
     const fetchArticles = useCallback(() => {
@@ -81,9 +78,14 @@ export const HomePage = () => {
             params.set("category_id", String(selectedCategory));
         if (debouncedSearch.trim())
             params.set("search", debouncedSearch.trim());
+        const [min, max] = debouncedPrices;
+        if (min) params.set("min_price", min);
+        if (max) params.set("max_price", max);
+        if (sort) params.set("sort", sort);
 
         params.set("skip", String((page - 1) * limit));
         params.set("limit", String(limit));
+        params.set("fields", "summary");
 
         const qs = params.toString() ? `?${params.toString()}` : "";
 
@@ -109,7 +111,7 @@ export const HomePage = () => {
                 setLoading(false);
                 setLoadingMore(false);
             });
-    }, [selectedCategory, debouncedSearch, page]);
+    }, [selectedCategory, debouncedSearch, debouncedPrices, sort, page]);
 
     useEffect(() => {
         fetchArticles();
@@ -178,6 +180,37 @@ export const HomePage = () => {
                             className="pl-10 transition-all-smooth focus:ring-2 focus:ring-primary/40"
                         />
                     </div>
+                    <div className="flex gap-2">
+                        <Input
+                            type="number"
+                            min="0"
+                            value={minPrice}
+                            onChange={(e) => setMinPrice(e.target.value)}
+                            placeholder={t("home.min_price")}
+                            className="w-28 transition-all-smooth focus:ring-2 focus:ring-primary/40"
+                        />
+                        <Input
+                            type="number"
+                            min="0"
+                            value={maxPrice}
+                            onChange={(e) => setMaxPrice(e.target.value)}
+                            placeholder={t("home.max_price")}
+                            className="w-28 transition-all-smooth focus:ring-2 focus:ring-primary/40"
+                        />
+                        <select
+                            value={sort}
+                            onChange={(e) => {
+                                setSort(e.target.value);
+                                setPage(1);
+                            }}
+                            className="flex h-10 rounded-md border border-input bg-background px-3 py-2 text-sm ring-offset-background focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-ring focus-visible:ring-offset-2 transition-all-smooth"
+                        >
+                            <option value="">{t("home.sort_default")}</option>
+                            <option value="newest">{t("home.sort_newest")}</option>
+                            <option value="price">{t("home.sort_price_asc")}</option>
+                            <option value="-price">{t("home.sort_price_desc")}</option>
+                        </select>
+                    </div>
                 </div>
 
                 {/* Category Pills */}
@@ -197,6 +230,7 @@ export const HomePage = () => {
                             className="transition-all-smooth hover:scale-105"
                         >
                             {t("home.all_categories")}
+                            {listingTotal !== null && ` (${listingTotal})`}
                         </Button>
                         {categories.map((cat) => (
                             <Button
@@ -213,7 +247,7 @@ export const HomePage = () => {
                                 }}
                                 className="transition-all-smooth hover:scale-105"
                             >
-                                {cat.name}
+                                {cat.name} ({cat.listing_count})
                             </Button>
                         ))}
                     </div>
@@ -294,13 +328,11 @@ export const HomePage = () => {
                                         className={`flex flex-col h-full card-hover overflow-hidden border-border/50 cursor-pointer animate-fade-in-up stagger-${Math.min(i + 1, 8)}`}
                                     >
                                         <div className="aspect-video w-full bg-muted overflow-hidden relative group">
-                                            {getFirstImage(item.image_url) ? (
+                                            {item.thumbnail ? (
                                                 <img
-                                                    src={
-                                                        getFirstImage(
-                                                            item.image_url,
-                                                        )!
-                                                    }
+                                                    src={resolveImageUrl(
+                                                        item.thumbnail,
+                                                    )}
                                                     alt={item.title}
                                                     className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-700 ease-out"
                                                 />
@@ -340,7 +372,7 @@ export const HomePage = () => {
                                                 {item.title}
                                             </h3>
                                             <p className="text-sm text-muted-foreground flex-1 line-clamp-3 leading-relaxed">
-                                                {item.description ||
+                                                {item.excerpt ||
                                                     "No description provided."}
                                             </p>
                                         </CardContent>
@@ -1,7 +1,7 @@
 import { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
-import api from "../lib/api";
+import api, { resolveImageUrl } from "../lib/api";
 import { Button } from "../components/ui/button";
 import {
     Card,
@@ -27,12 +27,12 @@ const getFirstImage = (url: string | null): string | null => {
     try {
         if (url.startsWith("[")) {
             const arr = JSON.parse(url);
-            return arr.length > 0 ? arr[0] : null;
+            return arr.length > 0 ? resolveImageUrl(arr[0], "thumb") : null;
         }
     } catch {
         // fallback
     }
-    return url;
+    return resolveImageUrl(url, "thumb");
 };
 
 export const ProfilePage = () => {
@@ -0,0 +1,460 @@
+"""
+Async load generator for the Collector API and the chat service.
+
+Mirrors the JMeter plan (`jmeter/collector-load-test.jmx`) with asyncio virtual
+users, and adds a chat scenario that keeps many WebSockets open and measures
+message fan-out. Results are reported as JSON (throughput, latency histograms,
+error rates) so the tool can run headless on any Linux box with Python 3.11+.
+
+Usage:
+    python loadtest/collector_load.py --base-url http://localhost:8000 \\
+        --chat-url http://localhost:8001 --scenarios tg1,tg2,tg3,chat --output results.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import statistics
+import sys
+import time
+import uuid
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import httpx
+import websockets
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+@dataclass
+class SamplerStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        self.latencies_ms.append(latency_ms)
+        if not ok:
+            self.errors += 1
+
+    def report(self, duration_s: float) -> dict:
+        count = len(self.latencies_ms)
+        ordered = sorted(self.latencies_ms)
+
+        def pct(p: float) -> float | None:
+            return round(ordered[min(int(p * count), count - 1)], 3) if count else None
+
+        # Cumulative buckets, Prometheus style
+        histogram = {f"le_{bound}ms": bisect_right(ordered, bound) for bound in HISTOGRAM_BUCKETS_MS}
+        histogram["le_inf"] = count
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / duration_s, 2) if duration_s else 0.0,
+            "mean_ms": round(statistics.fmean(ordered), 3) if count else None,
+            "min_ms": round(ordered[0], 3) if count else None,
+            "p50_ms": pct(0.50),
+            "p90_ms": pct(0.90),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1], 3) if count else None,
+            "histogram": histogram,
+        }
+
+
+class Recorder:
+    """Latency and error bookkeeping for one scenario, keyed by sampler name."""
+
+    def __init__(self):
+        self.samplers: dict[str, SamplerStats] = {}
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, name: str, latency_ms: float, ok: bool) -> None:
+        self.samplers.setdefault(name, SamplerStats()).record(latency_ms, ok)
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        name: str,
+        method: str,
+        url: str,
+        expected: tuple[int, ...] = (200,),
+        **kwargs,
+    ) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.record(name, (time.perf_counter() - start) * 1000, ok=False)
+            return None
+        self.record(name, (time.perf_counter() - start) * 1000, ok=response.status_code in expected)
+        return response
+
+    def report(self) -> dict:
+        duration = (self.finished or time.perf_counter()) - self.started
+        samplers = {name: stats.report(duration) for name, stats in sorted(self.samplers.items())}
+        requests = sum(s["count"] for s in samplers.values())
+        errors = sum(s["errors"] for s in samplers.values())
+        return {
+            "duration_s": round(duration, 3),
+            "requests": requests,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "throughput_rps": round(requests / duration, 2) if duration else 0.0,
+            "samplers": samplers,
+        }
+
+
+async def run_thread_group(
+    users: int, ramp_up_s: float, loops: int, body: Callable[[int, int], Awaitable[None]]
+) -> None:
+    """JMeter-style thread group: `users` virtual users started over `ramp_up_s`, each running `loops` iterations."""
+
+    async def virtual_user(n: int) -> None:
+        await asyncio.sleep(ramp_up_s * n / max(users, 1))
+        for loop in range(loops):
+            await body(n, loop)
+
+    await asyncio.gather(*(virtual_user(n) for n in range(users)))
+
+
+@dataclass
+class Context:
+    base: str
+    api: str
+    chat_api: str
+    seller_token: str | None = None
+    admin_token: str | None = None
+    category_id: int | None = None
+
+    @staticmethod
+    def auth(token: str | None) -> dict:
+        return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+async def login(client: httpx.AsyncClient, api: str, email: str, password: str) -> str | None:
+    r = await client.post(f"{api}/auth/login/access-token", data={"username": email, "password": password})
+    return r.json()["access_token"] if r.status_code == 200 else None
+
+
+async def setup(client: httpx.AsyncClient, ctx: Context, args: argparse.Namespace) -> None:
+    """Equivalent of the JMeter setUp thread group: seller account, tokens and a category."""
+    await client.post(
+        f"{ctx.api}/auth/register",
+        json={
+            "email": args.seller_email,
+            "password": args.seller_password,
+            "full_name": "Load Test Seller",
+            "role": "seller",
+        },
+    )
+    ctx.seller_token = await login(client, ctx.api, args.seller_email, args.seller_password)
+    ctx.admin_token = await login(client, ctx.api, args.admin_email, args.admin_password)
+    if ctx.admin_token:
+        await client.post(
+            f"{ctx.api}/categories/",
+            headers=ctx.auth(ctx.admin_token),
+            json={"name": "Load Test Category", "description": "Category created during load testing"},
+        )
+    categories = (await client.get(f"{ctx.api}/categories/")).json()
+    ctx.category_id = next((c["id"] for c in categories if c["name"] == "Load Test Category"), None)
+
+
+async def scenario_tg1(client: httpx.AsyncClient, ctx: Context, args: argparse.Namespace) -> dict:
+    """TG1 — Public Browsing."""
+    rec = Recorder()
+
+    async def body(n: int, loop: int) -> None:
+        await rec.request(client, "List Articles", "GET", f"{ctx.api}/articles/")
+        await rec.request(client, "List Articles (paginated)", "GET", f"{ctx.api}/articles/?skip=0&limit=10")
+        await rec.request(client, "Get Article by ID", "GET", f"{ctx.api}/articles/1", expected=(200, 404))
+        await rec.request(client, "List Categories", "GET", f"{ctx.api}/categories/")
+        await rec.request(client, "Health Check (Docs)", "GET", f"{ctx.base}/docs")
+
+    await run_thread_group(args.tg1_users, args.tg1_ramp, args.tg1_loops, body)
+    rec.finished = time.perf_counter()
+    return rec.report()
+
+
+async def scenario_tg2(client: httpx.AsyncClient, ctx: Context, args: argparse.Namespace) -> dict:
+    """TG2 — Authenticated CRUD: create → update → approve → profile → delete."""
+    rec = Recorder()
+    seller, admin = ctx.auth(ctx.seller_token), ctx.auth(ctx.admin_token)
+
+    async def body(n: int, loop: int) -> None:
+        r = await rec.request(
+            client,
+            "Create Article",
+            "POST",
+            f"{ctx.api}/articles/",
+            headers=seller,
+            json={
+                "title": f"Load Test Article {n}-{loop}",
+                "description": "Article created during load testing",
+                "price": 29.99,
+                "shipping_cost": 4.99,
+                "image_url": "https://placehold.co/400",
+                "category_id": ctx.category_id,
+            },
+        )
+        if r is None or r.status_code != 200:
+            return
+        article_url = f"{ctx.api}/articles/{r.json()['id']}"
+        await rec.request(
+            client,
+            "Update Article",
+            "PUT",
+            article_url,
+            headers=seller,
+            json={"title": f"Updated Load Test Article {n}-{loop}", "description": "Updated during load testing"},
+        )
+        await rec.request(client, "Approve Article (Admin)", "PUT", f"{article_url}/approve", headers=admin, json={})
+        await rec.request(client, "Get User Profile", "GET", f"{ctx.api}/users/me", headers=seller)
+        await rec.request(client, "Delete Article", "DELETE", article_url, headers=seller)
+
+    await run_thread_group(args.tg2_users, args.tg2_ramp, args.tg2_loops, body)
+    rec.finished = time.perf_counter()
+    return rec.report()
+
+
+async def scenario_tg3(client: httpx.AsyncClient, ctx: Context, args: argparse.Namespace) -> dict:
+    """TG3 — Auth Stress: register unique users then log them in."""
+    rec = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+
+    async def body(n: int, loop: int) -> None:
+        email = f"stress-{run_id}-{n}-{loop}@user.com"
+        await rec.request(
+            client,
+            "Register Random User",
+            "POST",
+            f"{ctx.api}/auth/register",
+            json={"email": email, "password": "StressTest123!", "full_name": f"Stress User {n}", "role": "buyer"},
+        )
+        await rec.request(
+            client,
+            "Login Registered User",
+            "POST",
+            f"{ctx.api}/auth/login/access-token",
+            data={"username": email, "password": "StressTest123!"},
+        )
+
+    await run_thread_group(args.tg3_users, args.tg3_ramp, args.tg3_loops, body)
+    rec.finished = time.perf_counter()
+    return rec.report()
+
+
+async def scenario_chat(client: httpx.AsyncClient, ctx: Context, args: argparse.Namespace) -> dict:
+    """
+    Chat: one article, `--chat-conversations` buyers each with a conversation,
+    `--chat-sockets` WebSockets spread across them, and every buyer posting
+    `--chat-messages` messages. Fan-out latency is measured from the POST to
+    the reception of the broadcast on each socket of the conversation.
+    """
+    rec = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    seller = ctx.auth(ctx.seller_token)
+    ws_base = ctx.chat_api.replace("http", "ws", 1)
+
+    resp = await rec.request(
+        client,
+        "Create Article",
+        "POST",
+        f"{ctx.api}/articles/",
+        headers=seller,
+        json={"title": f"Chat load test {run_id}", "price": 10.0},
+    )
+    if resp is None or resp.status_code != 200:
+        # Without the seller (see setup) or its article there is nothing to chat about
+        rec.finished = time.perf_counter()
+        return rec.report()
+    article_id = resp.json()["id"]
+
+    async def open_conversation(n: int) -> tuple[int, str] | None:
+        email, password = f"chat-{run_id}-{n}@user.com", "ChatTest123!"
+        await client.post(f"{ctx.api}/auth/register", json={"email": email, "password": password, "role": "buyer"})
+        token = await login(client, ctx.api, email, password)
+        if token is None:
+            return None
+        resp = await rec.request(
+            client,
+            "Create Conversation",
+            "POST",
+            f"{ctx.chat_api}/chat/conversations",
+            headers=ctx.auth(token),
+            json={"article_id": article_id},
+        )
+        return (resp.json()["id"], token) if resp is not None and resp.status_code == 200 else None
+
+    conversations = [c for c in await asyncio.gather(*map(open_conversation, range(args.chat_conversations))) if c]
+    if not conversations:
+        rec.finished = time.perf_counter()
+        return rec.report()
+
+    # message id -> perf_counter timestamp of the POST that created it
+    sent_at: dict[int, float] = {}
+    pending_posts: dict[tuple[int, str], float] = {}
+    sockets: list[tuple[int, object]] = []
+    deliveries = 0
+    closed_early = 0
+
+    async def connect(i: int) -> None:
+        conv_id, token = conversations[i % len(conversations)]
+        start = time.perf_counter()
+        try:
+            ws = await websockets.connect(f"{ws_base}/chat/conversations/{conv_id}/ws?token={token}")
+        except (OSError, websockets.WebSocketException):
+            rec.record("WebSocket Connect", (time.perf_counter() - start) * 1000, ok=False)
+            return
+        rec.record("WebSocket Connect", (time.perf_counter() - start) * 1000, ok=True)
+        sockets.append((conv_id, ws))
+
+    await asyncio.gather(*(connect(i) for i in range(args.chat_sockets)))
+
+    async def listen(ws) -> None:
+        nonlocal deliveries, closed_early
+        with contextlib.suppress(websockets.ConnectionClosed):
+            async for raw in ws:
+                received = time.perf_counter()
+                message = json.loads(raw)
+                start = sent_at.get(message["id"]) or pending_posts.get(
+                    (message["conversation_id"], message["content"])
+                )
+                if start is not None:
+                    deliveries += 1
+                    rec.record("Message Fan-out", (received - start) * 1000, ok=True)
+        # Listeners are cancelled at the end of the run, so getting here means the server closed the socket
+        closed_early += 1
+
+    listeners = [asyncio.create_task(listen(ws)) for _, ws in sockets]
+
+    async def talker(conv_id: int, token: str) -> None:
+        for m in range(args.chat_messages):
+            content = f"load test message {run_id}-{conv_id}-{m}"
+            start = time.perf_counter()
+            # The broadcast can arrive before the POST response, so also index by content
+            pending_posts[(conv_id, content)] = start
+            resp = await rec.request(
+                client,
+                "Post Message",
+                "POST",
+                f"{ctx.chat_api}/chat/conversations/{conv_id}/messages",
+                headers=ctx.auth(token),
+                json={"content": content},
+            )
+            if resp is not None and resp.status_code == 200:
+                sent_at[resp.json()["id"]] = start
+            await asyncio.sleep(args.chat_think_time)
+
+    await asyncio.gather(*(talker(conv_id, token) for conv_id, token in conversations))
+    await asyncio.sleep(args.chat_drain)
+    for task in listeners:
+        task.cancel()
+    for result in await asyncio.gather(*listeners, return_exceptions=True):
+        if isinstance(result, Exception):
+            print(f"warning: WebSocket listener failed: {result!r}", file=sys.stderr)
+    await asyncio.gather(*(ws.close() for _, ws in sockets), return_exceptions=True)
+    rec.finished = time.perf_counter()
+
+    sockets_per_conv: dict[int, int] = {}
+    for conv_id, _ in sockets:
+        sockets_per_conv[conv_id] = sockets_per_conv.get(conv_id, 0) + 1
+    expected = sum(sockets_per_conv.get(conv_id, 0) * args.chat_messages for conv_id, _ in conversations)
+    report = rec.report()
+    report["fanout"] = {
+        "open_sockets": len(sockets),
+        "closed_early": closed_early,
+        "expected_deliveries": expected,
+        "deliveries": deliveries,
+        "delivery_rate": round(deliveries / expected, 4) if expected else None,
+    }
+    return report
+
+
+SCENARIOS = {"tg1": scenario_tg1, "tg2": scenario_tg2, "tg3": scenario_tg3, "chat": scenario_chat}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Async load generator for the Collector API and chat service.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--chat-url", default="http://localhost:8001")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--scenarios", default="tg1,tg2,tg3,chat", help="Comma-separated: tg1, tg2, tg3, chat.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every scenario's user count.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--max-connections", type=int, default=500)
+    # Accounts (defaults match scripts/seed.py and the JMeter plan)
+    parser.add_argument("--admin-email", default="admin@celianhamon.fr")
+    parser.add_argument("--admin-password", default="password123")
+    parser.add_argument("--seller-email", default="seller-loadtest@celianhamon.fr")
+    parser.add_argument("--seller-password", default="LoadTest123!")
+    # Thread groups (defaults match the JMeter plan)
+    parser.add_argument("--tg1-users", type=int, default=50)
+    parser.add_argument("--tg1-ramp", type=float, default=10)
+    parser.add_argument("--tg1-loops", type=int, default=10)
+    parser.add_argument("--tg2-users", type=int, default=20)
+    parser.add_argument("--tg2-ramp", type=float, default=10)
+    parser.add_argument("--tg2-loops", type=int, default=5)
+    parser.add_argument("--tg3-users", type=int, default=30)
+    parser.add_argument("--tg3-ramp", type=float, default=5)
+    parser.add_argument("--tg3-loops", type=int, default=5)
+    # Chat scenario
+    parser.add_argument("--chat-conversations", type=int, default=20)
+    parser.add_argument("--chat-sockets", type=int, default=200, help="WebSockets spread over the conversations.")
+    parser.add_argument("--chat-messages", type=int, default=10, help="Messages posted per conversation.")
+    parser.add_argument("--chat-think-time", type=float, default=0.1, help="Pause between messages (s).")
+    parser.add_argument("--chat-drain", type=float, default=2.0, help="Wait for late broadcasts (s).")
+    args = parser.parse_args(argv)
+
+    for name in ("tg1_users", "tg2_users", "tg3_users", "chat_conversations", "chat_sockets"):
+        setattr(args, name, max(int(getattr(args, name) * args.scale), 1))
+    unknown = set(args.scenarios.split(",")) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+async def main(argv: list[str] | None = None) -> dict:
+    args = parse_args(argv)
+    ctx = Context(
+        base=args.base_url, api=f"{args.base_url}{args.api_prefix}", chat_api=f"{args.chat_url}{args.api_prefix}"
+    )
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+
+    report = {
+        "started_at": datetime.now(UTC).isoformat(),
+        "target": {"api": ctx.api, "chat": ctx.chat_api},
+        "scenarios": {},
+    }
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        await setup(client, ctx, args)
+        if not ctx.seller_token:
+            print("warning: seller login failed, authenticated scenarios will error", file=sys.stderr)
+        for name in args.scenarios.split(","):
+            print(f"running {name}...", file=sys.stderr)
+            report["scenarios"][name] = await SCENARIOS[name](client, ctx, args)
+            summary = report["scenarios"][name]
+            print(
+                f"  {summary['requests']} samples, {summary['throughput_rps']} req/s, "
+                f"error rate {summary['error_rate']:.2%}",
+                file=sys.stderr,
+            )
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())